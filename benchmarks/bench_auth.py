@@ -0,0 +1,59 @@
+"""
+Мікробенчмарк накладних витрат автентифікації на один запит.
+
+Порівнює повну перевірку JWT (HMAC + розбір JSON) з перевіркою через
+LRU-кеш `TokenVerifier` для кожного доступного бекенду.
+
+Запуск:
+    python -m benchmarks.bench_auth --requests 100000 --tokens 100
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.services.tokens import BACKENDS, TokenVerifier
+
+SECRET = "benchmark-secret"
+ALGORITHM = "HS256"
+
+
+def make_tokens(verifier: TokenVerifier, count: int) -> list[str]:
+    expire = datetime.now(timezone.utc) + timedelta(hours=1)
+    return [verifier.encode({"sub": f"user{i}", "exp": expire}) for i in range(count)]
+
+
+def run(verifier: TokenVerifier, tokens: list[str], requests: int) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        verifier.decode(tokens[i % len(tokens)])
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'cache':>6} {'us/request':>12} {'requests/s':>12}")
+    for name, backend_cls in BACKENDS.items():
+        try:
+            backend = backend_cls()
+        except RuntimeError as e:
+            print(f"{name:<8} skipped: {e}")
+            continue
+        for cache_size in (0, args.cache_size):
+            verifier = TokenVerifier(backend, SECRET, ALGORITHM, cache_size)
+            tokens = make_tokens(verifier, args.tokens)
+            elapsed = run(verifier, tokens, args.requests)
+            per_request = elapsed / args.requests * 1e6
+            print(
+                f"{name:<8} {cache_size:>6} {per_request:>12.2f} "
+                f"{args.requests / elapsed:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
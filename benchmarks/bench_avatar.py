@@ -0,0 +1,117 @@
+"""
+Пропускна здатність обробки аватарів.
+
+Генерує фото, схожі на знімки з камери (JPEG 12 Мп з шумом і градієнтом),
+скриншоти (PNG Full HD) і невеликі зображення, і вимірює:
+- розмір файлу до і після `resize_avatar` (WEBP `AVATAR_SIZE`x`AVATAR_SIZE`);
+- час обробки одного зображення в одному процесі, а для JPEG також без
+  декодування зі зменшенням (`Image.draft`) для порівняння;
+- пропускну здатність `AvatarProcessor` (зображень за секунду) з різною
+  кількістю процесів у пулі.
+
+Запуск:
+    python -m benchmarks.bench_avatar --images 32 --workers 1 2 4
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import time
+
+from fastapi import UploadFile
+from PIL import Image, ImageOps
+
+from src.conf.config import settings
+from src.services.upload_file import AvatarProcessor, resize_avatar
+
+SAMPLES = [
+    ("photo 4032x3024", (4032, 3024), "JPEG"),
+    ("screenshot 1920x1080", (1920, 1080), "PNG"),
+    ("small 640x480", (640, 480), "JPEG"),
+]
+
+
+def make_image(size, format: str) -> bytes:
+    width, height = size
+    # Градієнт з шумом стискається приблизно як справжнє фото
+    noise = Image.effect_noise((width, height), 40).convert("RGB")
+    gradient = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    image = Image.blend(noise, gradient, 0.6)
+    output = io.BytesIO()
+    image.save(output, format=format, quality=90)
+    return output.getvalue()
+
+
+def resize_without_draft(data: bytes, size: int, quality: int) -> bytes:
+    with Image.open(io.BytesIO(data)) as image:
+        avatar = ImageOps.fit(
+            image.convert("RGB"), (size, size), Image.Resampling.LANCZOS
+        )
+    output = io.BytesIO()
+    avatar.save(output, format="WEBP", quality=quality, method=4)
+    return output.getvalue()
+
+
+def timed(function, *args, rounds: int = 5) -> float:
+    durations = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        function(*args)
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations) * 1000
+
+
+async def throughput(data: bytes, images: int, workers: int) -> float:
+    processor = AvatarProcessor(
+        settings.AVATAR_SIZE,
+        len(data) + 1,
+        settings.AVATAR_MAX_PIXELS,
+        settings.AVATAR_QUALITY,
+        workers,
+    )
+
+    def upload() -> UploadFile:
+        return UploadFile(file=io.BytesIO(data), filename="avatar.jpg")
+
+    try:
+        # Прогрів: запуск процесів пулу не входить у вимірювання
+        await asyncio.gather(*(processor.process(upload()) for _ in range(workers)))
+        started = time.perf_counter()
+        await asyncio.gather(*(processor.process(upload()) for _ in range(images)))
+        return images / (time.perf_counter() - started)
+    finally:
+        processor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=32)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+    size, quality = settings.AVATAR_SIZE, settings.AVATAR_QUALITY
+
+    print(f"{'image':<22} {'input':>10} {'avatar':>8} {'ms':>8} {'no draft':>9}")
+    photo = None
+    for label, dimensions, format in SAMPLES:
+        data = make_image(dimensions, format)
+        photo = photo or data
+        avatar = resize_avatar(data, size, settings.AVATAR_MAX_PIXELS, quality)
+        elapsed = timed(resize_avatar, data, size, settings.AVATAR_MAX_PIXELS, quality)
+        naive = timed(resize_without_draft, data, size, quality)
+        print(
+            f"{label:<22} {len(data):>10} {len(avatar):>8} "
+            f"{elapsed:>8.1f} {naive:>9.1f}"
+        )
+
+    print()
+    for workers in sorted(set(args.workers)):
+        rate = asyncio.run(throughput(photo, args.images, workers))
+        print(f"photo, {workers} worker(s): {rate:6.1f} avatars/s")
+
+
+if __name__ == "__main__":
+    main()
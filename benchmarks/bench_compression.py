@@ -0,0 +1,144 @@
+"""
+Трафік і витрати CPU на стиснення відповідей API.
+
+Генерує реалістичні сторінки списку контактів (`ContactResponse` з
+`--pages` елементами) і для кожного доступного кодування та рівня
+стиснення виводить розмір відповіді, коефіцієнт стиснення і час CPU на
+одну відповідь. Brotli і Zstandard вимірюються лише тоді, коли встановлено
+пакети `brotli` і `zstandard`.
+
+Окремо вимірюється віддача /openapi.json застосунку через ASGI (без
+мережі): без стиснення і зі стисненням, збереженим у пам'яті
+`CompressionMiddleware`.
+
+Запуск:
+    python -m benchmarks.bench_compression --pages 10 100 1000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+
+from src.middleware.compression import available_encodings
+from src.schemas import ContactResponse
+
+NAMES = ["Olena", "Ivan", "Maria", "Taras", "Anna", "Petro", "Iryna", "Oleh"]
+SURNAMES = ["Shevchenko", "Koval", "Bondar", "Tkachenko", "Melnyk", "Boyko"]
+DOMAINS = ["gmail.com", "ukr.net", "example.com", "i.ua"]
+NOTES = [
+    None,
+    "Колега з відділу продажів",
+    "Зустрілися на конференції PyCon UA",
+    "Дзвонити після 18:00, у вихідні не турбувати",
+]
+# (кодування, рівень): рівні за замовчуванням і максимальні
+LEVELS = [("gzip", 1), ("gzip", 6), ("gzip", 9), ("br", 4), ("br", 11)]
+LEVELS += [("zstd", 3), ("zstd", 19)]
+
+
+def contact_page(size: int, rng: random.Random) -> bytes:
+    now = datetime(2026, 1, 1)
+    contacts = []
+    for n in range(size):
+        name, surname = rng.choice(NAMES), rng.choice(SURNAMES)
+        created_at = now - timedelta(seconds=rng.randrange(10**8))
+        contacts.append(
+            ContactResponse(
+                id=rng.randrange(1, 10**7),
+                name=name,
+                surname=surname,
+                email=f"{name.lower()}.{surname.lower()}{n}@{rng.choice(DOMAINS)}",
+                phone=f"+380{rng.randrange(500000000, 999999999)}",
+                birthday=date(1950, 1, 1) + timedelta(days=rng.randrange(20000)),
+                info=rng.choice(NOTES),
+                created_at=created_at,
+                updated_at=rng.choice([None, created_at + timedelta(days=3)]),
+            )
+        )
+    return TypeAdapter(List[ContactResponse]).dump_json(contacts)
+
+
+def encoder(encoding: str, level: int):
+    kwargs = {"gzip": "gzip_level", "br": "brotli_quality", "zstd": "zstd_level"}
+    return available_encodings(**{kwargs[encoding]: level}).get(encoding)
+
+
+def measure_codecs(pages: List[int], rounds: int) -> None:
+    rng = random.Random(42)
+    print(f"{'page':>6} {'codec':>8} {'bytes':>10} {'ratio':>7} {'cpu ms':>8}")
+    for size in pages:
+        body = contact_page(size, rng)
+        print(f"{size:>6} {'identity':>8} {len(body):>10} {1:>7.2f} {0:>8.3f}")
+        for encoding, level in LEVELS:
+            compress = encoder(encoding, level)
+            if compress is None:
+                continue
+            started = time.process_time()
+            for _ in range(rounds):
+                compressed = compress(body)
+            cpu_ms = (time.process_time() - started) / rounds * 1000
+            ratio = len(body) / len(compressed)
+            codec = f"{encoding}-{level}"
+            print(
+                f"{size:>6} {codec:>8} {len(compressed):>10} {ratio:>7.2f} {cpu_ms:>8.3f}"
+            )
+
+
+async def measure_openapi(requests: int) -> None:
+    from main import app
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    for accept in (b"identity", b"gzip, deflate, br, zstd"):
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": app.openapi_url,
+            "raw_path": app.openapi_url.encode(),
+            "root_path": "",
+            "scheme": "http",
+            "query_string": b"",
+            "headers": [(b"accept-encoding", accept)],
+            "client": ("127.0.0.1", 1234),
+            "server": ("127.0.0.1", 8000),
+            "http_version": "1.1",
+        }
+        size = 0
+
+        async def send(message):
+            nonlocal size
+            if message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+
+        await app(scope, receive, send)
+        started = time.perf_counter()
+        for _ in range(requests):
+            size = 0
+            await app(scope, receive, send)
+        per_request = (time.perf_counter() - started) / requests * 1e6
+        label = accept.decode().split(",")[0]
+        print(
+            f"openapi.json {label:>8}: {size:>7} bytes, {per_request:8.1f} us/request"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    measure_codecs(args.pages, args.rounds)
+    print()
+    asyncio.run(measure_openapi(args.requests))
+
+
+if __name__ == "__main__":
+    main()
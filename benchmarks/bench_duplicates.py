@@ -0,0 +1,150 @@
+"""
+Швидкість пошуку дублікатів контактів для одного користувача.
+
+Генерує `--contacts` синтетичних контактів, з яких частка `--duplicates`
+є зміненими копіями інших (інший регістр і крапки в email, +тег, переставлені
+ім'я та прізвище, описка в прізвищі, телефон в іншому форматі), записує їх
+у базу даних SQLite в пам'яті і вимірює `DuplicateScanner.scan`:
+завантаження контактів через `ContactRepository` і порівняння пар у блоках.
+Для порівняння оцінюється час перебору всіх пар (екстраполяція з вибірки
+`--sample` контактів) і повнота знайдених дублікатів.
+
+Запуск:
+    python -m benchmarks.bench_duplicates --contacts 100000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from itertools import combinations
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.conf.config import settings
+from src.database.models import Base, Contact, User
+from src.services.contacts import normalize_phone
+from src.services.duplicates import DuplicateScanner, _features, score_pair
+
+NAMES = ["Olena", "Ivan", "Maria", "Taras", "Anna", "Petro", "Iryna", "Oleh"]
+SURNAMES = [
+    "Shevchenko",
+    "Koval",
+    "Bondar",
+    "Tkachenko",
+    "Melnyk",
+    "Kravets",
+    "Boyko",
+    "Oliynyk",
+    "Lysenko",
+    "Moroz",
+]
+DOMAINS = ["gmail.com", "ukr.net", "example.com", "i.ua"]
+
+
+def generate(count: int, duplicate_share: float, rng: random.Random):
+    contacts = []
+    originals = int(count * (1 - duplicate_share))
+    for n in range(originals):
+        name, surname = rng.choice(NAMES), rng.choice(SURNAMES)
+        contacts.append(
+            {
+                "name": name,
+                "surname": surname,
+                "email": f"{name.lower()}.{surname.lower()}{n}@{rng.choice(DOMAINS)}",
+                "phone": f"+380{500000000 + n}",
+                "birthday": date(1950, 1, 1) + timedelta(days=rng.randrange(20000)),
+            }
+        )
+    pairs = []
+    copied = rng.sample(range(originals), count - originals)
+    for n, index in zip(range(originals, count), copied):
+        original = contacts[index]
+        copy = dict(original)
+        variant = rng.randrange(4)
+        if variant == 0:
+            local, domain = original["email"].split("@")
+            copy["email"] = f"{local.upper()}+old@{domain}"
+            copy["phone"] = f"+380{600000000 + n}"
+        elif variant == 1:
+            copy["name"], copy["surname"] = original["surname"], original["name"]
+            copy["email"] = f"other{n}@example.com"
+            copy["phone"] = f"+380 {original['phone'][4:]}"
+        elif variant == 2:
+            copy["surname"] = original["surname"] + "o"
+            copy["email"] = f"other{n}@example.com"
+            copy["phone"] = f"+380{600000000 + n}"
+        else:
+            digits = original["phone"][4:]
+            copy["phone"] = f"0{digits[:2]} {digits[2:5]}-{digits[5:]}"
+            copy["email"] = f"other{n}@example.com"
+        contacts.append(copy)
+        pairs.append((index + 1, n + 1))
+    for n, item in enumerate(contacts, start=1):
+        item.update(id=n, user_id=1, phone_normalized=normalize_phone(item["phone"]))
+    return contacts, pairs
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contacts", type=int, default=100_000)
+    parser.add_argument("--duplicates", type=float, default=0.05)
+    parser.add_argument("--sample", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    contacts, expected = generate(args.contacts, args.duplicates, rng)
+
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with maker() as session:
+        await session.execute(insert(User), [{"id": 1, "username": "bench"}])
+        for offset in range(0, len(contacts), 10_000):
+            await session.execute(insert(Contact), contacts[offset : offset + 10_000])
+        await session.commit()
+
+    @asynccontextmanager
+    async def session_factory():
+        async with maker() as session:
+            yield session
+
+    scanner = DuplicateScanner(
+        settings.DUPLICATES_MIN_SCORE,
+        settings.DUPLICATES_MAX_BLOCK_SIZE,
+        settings.DUPLICATES_REPORT_TTL,
+        session_factory=session_factory,
+    )
+    started = time.perf_counter()
+    report = await scanner.scan(User(id=1))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    found = {(p.first_id, p.second_id) for g in report.groups for p in g.pairs}
+    recall = sum(pair in found for pair in expected) / max(len(expected), 1)
+
+    sample = [_features(SimpleNamespace(**item)) for item in contacts[: args.sample]]
+    started = time.perf_counter()
+    for a, b in combinations(sample, 2):
+        score_pair(a, b)
+    per_pair = (time.perf_counter() - started) / (len(sample) * (len(sample) - 1) / 2)
+    all_pairs = per_pair * args.contacts * (args.contacts - 1) / 2
+
+    print(f"contacts          {report.contacts_scanned}")
+    print(f"compared pairs    {report.comparisons}")
+    print(f"duplicate groups  {len(report.groups)}")
+    print(f"duplicate pairs   {len(found)} ({len(expected)} generated)")
+    print(f"recall            {recall:.3f}")
+    print(f"blocked scan      {elapsed:.2f} s")
+    print(f"all pairs (est.)  {all_pairs:.0f} s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Бенчмарк завантаження рядків контактів: ORM-сутності проти проєкції колонок.
+
+Наповнює тимчасову базу SQLite (або `--db-url`) контактами одного
+користувача і вимірює кількість рядків за секунду для:
+- `select(Contact)` з фільтром `filter_by(user=user)` (як було раніше);
+- `select(Contact)` з фільтром за `user_id`;
+- `select(*Contact.__table__.columns)` (режим `DB_LEAN_READS`);
+з серіалізацією в `ContactResponse` і без неї.
+
+Запуск:
+    python -m benchmarks.bench_orm_rows --contacts 20000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.database.models import Base, Contact, User
+from src.schemas import ContactResponse
+
+
+async def seed(session, contacts: int) -> User:
+    user = User(username="bench", email="bench@example.com", hashed_password="x")
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    rows = [
+        {
+            "name": f"Name{i}",
+            "surname": f"Surname{i}",
+            "email": f"bench-{i}@example.com",
+            "phone": f"+380{i:09d}",
+            "birthday": date(1990, 1, 1),
+            "user_id": user.id,
+        }
+        for i in range(contacts)
+    ]
+    await session.execute(insert(Contact), rows)
+    await session.commit()
+    return user
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default="sqlite+aiosqlite://")
+    parser.add_argument("--contacts", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.db_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_maker() as session:
+        user = await seed(session, args.contacts)
+
+    variants = {
+        "orm filter_by(user)": (select(Contact).filter_by(user=user), True),
+        "orm user_id": (select(Contact).where(Contact.user_id == user.id), True),
+        "lean columns": (
+            select(*Contact.__table__.columns).where(Contact.user_id == user.id),
+            False,
+        ),
+    }
+
+    print(f"{'variant':<22} {'rows/s':>12} {'rows/s + pydantic':>20}")
+    for name, (stmt, entities) in variants.items():
+        rates = []
+        for serialize in (False, True):
+            best = float("inf")
+            for _ in range(args.repeat):
+                # Нова сесія на кожен прохід: порожня identity map, як у запиті
+                async with session_maker() as session:
+                    start = time.perf_counter()
+                    result = await session.execute(stmt)
+                    rows = result.scalars().all() if entities else result.all()
+                    if serialize:
+                        [ContactResponse.model_validate(row) for row in rows]
+                    best = min(best, time.perf_counter() - start)
+            rates.append(len(rows) / best)
+        print(f"{name:<22} {rates[0]:>12.0f} {rates[1]:>20.0f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""
+Бенчмарк пропускної здатності хешування паролів.
+
+Для кожної конфігурації (bcrypt з різною вартістю, Argon2id за наявності
+argon2-cffi) вимірює кількість хешів за секунду на одному ядрі та сумарно
+на всіх ядрах. Результат допомагає спланувати пропускну здатність входу:
+кожен `POST /api/auth/login` виконує одну перевірку пароля.
+
+З `--target-ms` також підбирає вартість bcrypt під поточне обладнання;
+її слід зберегти в `BCRYPT_ROUNDS`, щоб усі процеси застосунку
+використовували однакову вартість.
+
+Запуск:
+    python -m benchmarks.bench_password_hash --hashes 20
+    python -m benchmarks.bench_password_hash --target-ms 250
+"""
+
+import argparse
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib import hash as passlib_hash
+
+CONFIGS = [
+    ("bcrypt rounds=10", "bcrypt", {"rounds": 10}),
+    ("bcrypt rounds=11", "bcrypt", {"rounds": 11}),
+    ("bcrypt rounds=12", "bcrypt", {"rounds": 12}),
+    ("bcrypt rounds=13", "bcrypt", {"rounds": 13}),
+    (
+        "argon2id m=19MiB t=2 p=1",
+        "argon2",
+        {"type": "ID", "memory_cost": 19456, "rounds": 2, "parallelism": 1},
+    ),
+    (
+        "argon2id m=64MiB t=3 p=4",
+        "argon2",
+        {"type": "ID", "memory_cost": 65536, "rounds": 3, "parallelism": 4},
+    ),
+]
+
+
+def hash_many(scheme: str, options: dict, count: int) -> float:
+    warnings.simplefilter("ignore")
+    handler = getattr(passlib_hash, scheme).using(**options)
+    start = time.perf_counter()
+    for i in range(count):
+        handler.hash(f"password-{i}")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hashes", type=int, default=20, help="хешів на процес")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--target-ms", type=int, help="підібрати BCRYPT_ROUNDS під цей час хешування"
+    )
+    args = parser.parse_args()
+
+    if args.target_ms:
+        from src.services.auth import Hash
+
+        rounds = Hash.calibrate_bcrypt_rounds(args.target_ms)
+        print(f"BCRYPT_ROUNDS={rounds}  # target {args.target_ms} ms")
+        return
+
+    print(f"cores: {args.workers}")
+    print(f"{'config':<26} {'ms/hash':>8} {'hash/s/core':>12} {'hash/s total':>13}")
+    for label, scheme, options in CONFIGS:
+        if not getattr(passlib_hash, scheme).has_backend():
+            print(f"{label:<26} skipped: backend is not installed")
+            continue
+        elapsed = hash_many(scheme, options, args.hashes)
+        per_core = args.hashes / elapsed
+
+        with ProcessPoolExecutor(args.workers) as pool:
+            start = time.perf_counter()
+            list(
+                pool.map(
+                    hash_many,
+                    [scheme] * args.workers,
+                    [options] * args.workers,
+                    [args.hashes] * args.workers,
+                )
+            )
+            total = args.hashes * args.workers / (time.perf_counter() - start)
+
+        print(
+            f"{label:<26} {elapsed / args.hashes * 1000:>8.1f} "
+            f"{per_core:>12.1f} {total:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
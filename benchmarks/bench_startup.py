@@ -0,0 +1,111 @@
+"""
+Час холодного старту застосунку.
+
+У свіжих процесах Python (`--runs` разів) вимірює:
+- час імпорту `main` (разом з усіма модулями застосунку);
+- час до першої відповіді /openapi.json: зі схемою, що генерується при
+  першому запиті, і з попередньо згенерованою схемою (`OPENAPI_SCHEMA_PATH`).
+
+Окремо виводить модулі верхнього рівня, імпорт яких займає найбільше часу
+(за `python -X importtime`), і перевіряє, що fastapi_mail і cloudinary не
+імпортуються при старті.
+
+Запуск:
+    python -m benchmarks.bench_startup --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+FIRST_REQUEST = """
+import time
+started = time.perf_counter()
+import main
+from fastapi.testclient import TestClient
+imported = time.perf_counter()
+with TestClient(main.app) as client:
+    client.get("/openapi.json")
+print(imported - started, time.perf_counter() - imported)
+"""
+
+
+def run(code: str, env: dict) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return result.stdout
+
+
+def measure(runs: int, env: dict):
+    imports, first_requests = [], []
+    for _ in range(runs):
+        imported, first_request = map(float, run(FIRST_REQUEST, env).split())
+        imports.append(imported * 1000)
+        first_requests.append(first_request * 1000)
+    return statistics.median(imports), statistics.median(first_requests)
+
+
+def slowest_imports(env: dict, top: int):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        # Модулі верхнього рівня мають рівно два пробіли відступу
+        if len(parts) == 3 and parts[2].startswith("  ") and parts[2][3] != " ":
+            modules.append((int(parts[1]), parts[2].strip()))
+    return sorted(modules, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    env = dict(os.environ, OPENAPI_SCHEMA_PATH="")
+    loaded = run(
+        "import sys, main; "
+        "print('fastapi_mail' in sys.modules, 'cloudinary' in sys.modules)",
+        env,
+    ).split()
+    print(f"fastapi_mail imported at startup: {loaded[0]}")
+    print(f"cloudinary imported at startup:   {loaded[1]}")
+    print()
+
+    print("slowest top-level imports (cumulative):")
+    for elapsed, module in slowest_imports(env, args.top):
+        print(f"  {module:<30} {elapsed / 1000:8.1f} ms")
+    print()
+
+    import_ms, first_ms = measure(args.runs, env)
+    print(f"import main (median)              {import_ms:8.1f} ms")
+    print(f"first /openapi.json, generated    {first_ms:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "openapi.json"
+        run(
+            f"from main import app; from src.services.openapi import "
+            f"dump_openapi_schema; dump_openapi_schema(app, {str(path)!r})",
+            env,
+        )
+        _, prebuilt_ms = measure(args.runs, dict(env, OPENAPI_SCHEMA_PATH=str(path)))
+    print(f"first /openapi.json, prebuilt     {prebuilt_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
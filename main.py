@@ -1,23 +1,78 @@
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import JSONResponse
 from slowapi.errors import RateLimitExceeded
-from src.api import utils, contacts, auth, users
+from src.api import utils, contacts, auth, users, metrics, debug
+from src.conf.config import settings
+from src.middleware.compression import CompressionMiddleware
+from src.middleware.metrics import PrometheusMiddleware
+from src.middleware.profiling import ProfilingMiddleware
+from src.middleware.queries import QueryStatsMiddleware
+from src.services.auth import Hash
+from src.services.duplicates import duplicate_scanner
+from src.services.openapi import load_openapi_schema
+from src.services.profiler import start_continuous_profiler
+from src.services.purger import start_purger
+from src.services.upload_file import avatar_processor
 
 logger = logging.getLogger("rate_limiter")
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ініціалізація застосунку при старті.
+
+    Налаштовує хешування паролів, створює пул процесів обробки аватарів,
+    запускає безперервне профілювання, якщо задано `PROFILE_CONTINUOUS`, і
+    фонове остаточне видалення м'яко видалених записів (`PURGE_ENABLED`) і
+    завантажує попередньо згенеровану схему OpenAPI (`OPENAPI_SCHEMA_PATH`).
+    При зупинці скасовує незавершені пошуки дублікатів і зупиняє пул
+    процесів обробки аватарів.
+    """
+    Hash.configure()
+    avatar_processor.start()
+    load_openapi_schema(app, settings.OPENAPI_SCHEMA_PATH)
+    profiler = start_continuous_profiler()
+    purger = start_purger()
+    yield
+    await duplicate_scanner.stop()
+    avatar_processor.shutdown()
+    if purger is not None:
+        await purger.stop()
+    if profiler is not None:
+        profiler.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = ["http://localhost:*", "*"]
 
+# Стиснення — найближчий до застосунку шар: заголовки CORS додаються вже
+# поверх збережених стиснутих відповідей і залежать від конкретного запиту
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+        static_paths=(app.openapi_url,),
+    )
+# Профілювання всередині CORS: відповіді з профілем отримують заголовки CORS
+app.add_middleware(ProfilingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(PrometheusMiddleware)
 
 
 @app.exception_handler(RateLimitExceeded)
@@ -33,6 +88,8 @@ app.include_router(utils.router, prefix="/api")
 app.include_router(contacts.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
+app.include_router(debug.router, prefix="/api")
+app.include_router(metrics.router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -8,12 +8,14 @@ from sqlalchemy import pool
 from alembic import context
 
 from src.database.models import Base
-from src.conf.config import config as app_config
+from src.conf.config import settings
 
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
+# Міграції виконуються для тієї ж бази даних, що й застосунок
+config.set_main_option("sqlalchemy.url", settings.DB_URL)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -26,6 +28,15 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# Повнотекстовий пошук (колонка search_vector та її GIN-індекс) існує лише
+# в PostgreSQL і не описаний у моделях, тому autogenerate його не чіпає
+POSTGRES_ONLY_OBJECTS = {"search_vector", "ix_contacts_search"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return name not in POSTGRES_ONLY_OBJECTS
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +59,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -57,7 +69,11 @@ def run_migrations_offline() -> None:
 
 
 def run_migrations(connection: Connection):
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
@@ -0,0 +1,37 @@
+"""Add user contacts_count
+
+Revision ID: 3e9a71c5b2d8
+Revises: fb38030f6671
+Create Date: 2026-10-19 15:41:09.563214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e9a71c5b2d8'
+down_revision: Union[str, None] = 'fb38030f6671'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'users',
+        sa.Column('contacts_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    # Початкові значення лічильника; далі його підтримує ContactRepository
+    op.execute(
+        'UPDATE users SET contacts_count = ('
+        'SELECT count(*) FROM contacts '
+        'WHERE contacts.user_id = users.id AND contacts.deleted_at IS NULL)'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'contacts_count')
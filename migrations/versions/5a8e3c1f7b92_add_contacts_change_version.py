@@ -0,0 +1,34 @@
+"""Add contacts change_version
+
+Revision ID: 5a8e3c1f7b92
+Revises: d4b9e2a7c13f
+Create Date: 2026-10-19 21:14:06.552781
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a8e3c1f7b92'
+down_revision: Union[str, None] = 'd4b9e2a7c13f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Наявні рядки отримують версію 0: старі токени стрічки змін однаково
+    # відхиляються з 410, тож клієнти виконують повну синхронізацію
+    op.add_column('contacts', sa.Column('change_version', sa.Integer(), server_default='0', nullable=False))
+    op.drop_index('ix_contacts_user_changes', table_name='contacts')
+    op.create_index('ix_contacts_user_changes', 'contacts', ['user_id', 'change_version', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_user_changes', table_name='contacts')
+    op.create_index('ix_contacts_user_changes', 'contacts', ['user_id', 'updated_at', 'id'], unique=False)
+    op.drop_column('contacts', 'change_version')
@@ -0,0 +1,37 @@
+"""Add refresh token family
+
+Revision ID: 6b1d4e8f2a93
+Revises: 3e9a71c5b2d8
+Create Date: 2026-10-19 18:12:40.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b1d4e8f2a93'
+down_revision: Union[str, None] = '3e9a71c5b2d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'refresh_tokens', sa.Column('family_id', sa.String(length=32), nullable=True)
+    )
+    # Кожен наявний токен стає окремою сім'єю
+    op.execute("UPDATE refresh_tokens SET family_id = 'legacy-' || id")
+    op.alter_column('refresh_tokens', 'family_id', nullable=False)
+    op.create_index(
+        op.f('ix_refresh_tokens_family_id'), 'refresh_tokens', ['family_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refresh_tokens_family_id'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'family_id')
@@ -0,0 +1,31 @@
+"""Add user contacts_version
+
+Revision ID: 8f2c5a7e1d46
+Revises: 6b1d4e8f2a93
+Create Date: 2026-10-19 18:40:27.905114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2c5a7e1d46'
+down_revision: Union[str, None] = '6b1d4e8f2a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'users',
+        sa.Column('contacts_version', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'contacts_version')
@@ -0,0 +1,57 @@
+"""Soft delete contacts and users
+
+Revision ID: a7d2e9f41c58
+Revises: f3a8c1d04b27
+Create Date: 2026-10-19 12:41:09.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e9f41c58'
+down_revision: Union[str, None] = 'f3a8c1d04b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text('deleted_at IS NULL')
+DELETED = sa.text('deleted_at IS NOT NULL')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contacts', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    # Унікальність лише серед активних контактів: обмеження замінюються
+    # частковими унікальними індексами з тими самими назвами
+    op.drop_constraint('uq_contacts_user_email', 'contacts', type_='unique')
+    op.drop_constraint('uq_contacts_user_phone', 'contacts', type_='unique')
+    op.create_index('uq_contacts_user_email', 'contacts', ['user_id', 'email'], unique=True, postgresql_where=ACTIVE, sqlite_where=ACTIVE)
+    op.create_index('uq_contacts_user_phone', 'contacts', ['user_id', 'phone'], unique=True, postgresql_where=ACTIVE, sqlite_where=ACTIVE)
+
+    # Індекси для фонового видалення містять лише видалені рядки
+    op.create_index('ix_contacts_deleted_at', 'contacts', ['deleted_at'], unique=False, postgresql_where=DELETED, sqlite_where=DELETED)
+    op.create_index('ix_users_deleted_at', 'users', ['deleted_at'], unique=False, postgresql_where=DELETED, sqlite_where=DELETED)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_deleted_at', table_name='users')
+    op.drop_index('ix_contacts_deleted_at', table_name='contacts')
+
+    # М'яко видалені записи зникають разом з колонкою deleted_at
+    op.execute('DELETE FROM contacts WHERE deleted_at IS NOT NULL')
+    op.execute('DELETE FROM contacts WHERE user_id IN (SELECT id FROM users WHERE deleted_at IS NOT NULL)')
+    op.execute('DELETE FROM users WHERE deleted_at IS NOT NULL')
+
+    op.drop_index('uq_contacts_user_phone', table_name='contacts')
+    op.drop_index('uq_contacts_user_email', table_name='contacts')
+    op.create_unique_constraint('uq_contacts_user_email', 'contacts', ['user_id', 'email'])
+    op.create_unique_constraint('uq_contacts_user_phone', 'contacts', ['user_id', 'phone'])
+
+    op.drop_column('users', 'deleted_at')
+    op.drop_column('contacts', 'deleted_at')
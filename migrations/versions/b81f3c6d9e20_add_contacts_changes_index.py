@@ -0,0 +1,30 @@
+"""Add contacts changes index
+
+Revision ID: b81f3c6d9e20
+Revises: a7d2e9f41c58
+Create Date: 2026-10-19 13:58:32.771904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f3c6d9e20'
+down_revision: Union[str, None] = 'a7d2e9f41c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Рядки без updated_at не потрапили б у стрічку змін
+    op.execute('UPDATE contacts SET updated_at = coalesce(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL')
+    op.create_index('ix_contacts_user_changes', 'contacts', ['user_id', 'updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_user_changes', table_name='contacts')
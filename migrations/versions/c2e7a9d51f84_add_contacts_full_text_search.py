@@ -0,0 +1,44 @@
+"""Add contacts full-text search
+
+Revision ID: c2e7a9d51f84
+Revises: b81f3c6d9e20
+Create Date: 2026-10-19 15:12:47.093518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e7a9d51f84'
+down_revision: Union[str, None] = 'b81f3c6d9e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Копія src.database.models.CONTACT_SEARCH_VECTOR на момент міграції
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(surname, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || translate(coalesce(email, ''), '@.', '  ')), 'B') || "
+    "setweight(to_tsvector('simple', regexp_replace(coalesce(phone, ''), '\\D', '', 'g')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(info, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # На інших СУБД пошук працює через LIKE без додаткових колонок
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Додавання STORED-колонки переписує таблицю
+    op.execute(f"ALTER TABLE contacts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED")
+    op.create_index('ix_contacts_search', 'contacts', [sa.text('search_vector')], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_contacts_search', table_name='contacts')
+    op.drop_column('contacts', 'search_vector')
@@ -0,0 +1,38 @@
+"""Unique users email and username among active users only
+
+Revision ID: d4b9e2a7c13f
+Revises: 8f2c5a7e1d46
+Create Date: 2026-10-19 20:05:41.318260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b9e2a7c13f'
+down_revision: Union[str, None] = '8f2c5a7e1d46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text('deleted_at IS NULL')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # М'яко видалені користувачі не займають email і ім'я: обмеження
+    # замінюються частковими унікальними індексами
+    op.drop_constraint('users_email_key', 'users', type_='unique')
+    op.drop_constraint('users_username_key', 'users', type_='unique')
+    op.create_index('uq_users_email', 'users', ['email'], unique=True, postgresql_where=ACTIVE, sqlite_where=ACTIVE)
+    op.create_index('uq_users_username', 'users', ['username'], unique=True, postgresql_where=ACTIVE, sqlite_where=ACTIVE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_users_username', table_name='users')
+    op.drop_index('uq_users_email', table_name='users')
+    op.create_unique_constraint('users_username_key', 'users', ['username'])
+    op.create_unique_constraint('users_email_key', 'users', ['email'])
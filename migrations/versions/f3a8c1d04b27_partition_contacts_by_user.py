@@ -0,0 +1,101 @@
+"""Partition contacts by user_id
+
+Revision ID: f3a8c1d04b27
+Revises: e5b07c9d2a64
+Create Date: 2026-10-19 11:20:41.318027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c1d04b27'
+down_revision: Union[str, None] = 'e5b07c9d2a64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Кількість HASH-розділів зафіксована в ревізії: інша кількість потребує
+# нової міграції, а не зміни налаштувань
+PARTITIONS = 16
+# Назви, які PostgreSQL дав безіменним обмеженням міграції 4d480c805746;
+# у SQLite batch-режим присвоює їх під час відображення таблиці
+NAMING_CONVENTION = {'uq': '%(table_name)s_%(column_0_name)s_key'}
+
+
+def _add_constraints(primary_key: str, unique: Sequence[tuple[str, str]]) -> None:
+    # Обмеження створюються після копіювання даних: побудова індексу на
+    # заповненій таблиці значно швидша за оновлення індексів при вставці
+    op.execute(f"ALTER TABLE contacts ADD CONSTRAINT contacts_pkey PRIMARY KEY ({primary_key})")
+    for name, columns in unique:
+        op.execute(f"ALTER TABLE contacts ADD CONSTRAINT {name} UNIQUE ({columns})")
+    op.execute(
+        "ALTER TABLE contacts ADD CONSTRAINT contacts_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE"
+    )
+
+
+def _rebuild_contacts(partition_by: str, partitions: int) -> None:
+    # Послідовність id не повинна зникнути разом зі старою таблицею
+    op.execute("ALTER SEQUENCE contacts_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE contacts RENAME TO contacts_old")
+    op.execute(
+        "CREATE TABLE contacts (LIKE contacts_old INCLUDING DEFAULTS) " + partition_by
+    )
+    for remainder in range(partitions):
+        op.execute(
+            f"CREATE TABLE contacts_p{remainder} PARTITION OF contacts "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+    # Копіювання виконується в одній транзакції міграції і блокує таблицю:
+    # на десятках мільйонів рядків запускайте у вікні обслуговування
+    op.execute("INSERT INTO contacts SELECT * FROM contacts_old")
+    op.execute("DROP TABLE contacts_old")
+    op.execute("ALTER SEQUENCE contacts_id_seq OWNED BY contacts.id")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite не змінює обмеження через ALTER: batch-режим перебудовує таблицю
+        with op.batch_alter_table('contacts', naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint('contacts_email_key', type_='unique')
+            batch_op.drop_constraint('contacts_phone_key', type_='unique')
+            batch_op.create_unique_constraint('uq_contacts_user_email', ['user_id', 'email'])
+            batch_op.create_unique_constraint('uq_contacts_user_phone', ['user_id', 'phone'])
+        return
+
+    _rebuild_contacts("PARTITION BY HASH (user_id)", PARTITIONS)
+    # Ключ розбиття має входити до первинного ключа і всіх унікальних обмежень
+    _add_constraints(
+        "id, user_id",
+        [
+            ('uq_contacts_user_email', 'user_id, email'),
+            ('uq_contacts_user_phone', 'user_id, phone'),
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    is_partitioned = bind.dialect.name == 'postgresql' and bind.execute(
+        sa.text("SELECT relkind = 'p' FROM pg_class WHERE relname = 'contacts'")
+    ).scalar()
+    if not is_partitioned:
+        with op.batch_alter_table('contacts') as batch_op:
+            batch_op.drop_constraint('uq_contacts_user_phone', type_='unique')
+            batch_op.drop_constraint('uq_contacts_user_email', type_='unique')
+            batch_op.create_unique_constraint('contacts_email_key', ['email'])
+            batch_op.create_unique_constraint('contacts_phone_key', ['phone'])
+        return
+
+    _rebuild_contacts("", 0)
+    # Глобальна унікальність не вдасться, якщо різні користувачі вже мають
+    # контакти з однаковими email або телефоном
+    _add_constraints(
+        "id",
+        [('contacts_email_key', 'email'), ('contacts_phone_key', 'phone')],
+    )
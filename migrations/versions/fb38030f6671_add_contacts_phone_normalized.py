@@ -0,0 +1,98 @@
+"""Add contacts phone_normalized
+
+Revision ID: fb38030f6671
+Revises: c2e7a9d51f84
+Create Date: 2026-10-19 15:07:12.402318
+
+"""
+import re
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fb38030f6671'
+down_revision: Union[str, None] = 'c2e7a9d51f84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+# Значення settings.PHONE_DEFAULT_COUNTRY_CODE на момент міграції
+DEFAULT_COUNTRY_CODE = '380'
+
+contacts = sa.table(
+    'contacts',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('phone', sa.String),
+    sa.column('phone_normalized', sa.String),
+)
+
+
+def _normalize_phone(phone: str) -> Optional[str]:
+    # Копія src.services.contacts.normalize_phone на момент міграції
+    digits = re.sub(r'\D', '', phone)
+    if not digits:
+        return None
+    if phone.lstrip().startswith('+'):
+        return digits
+    if digits.startswith('00'):
+        return digits[2:]
+    if digits.startswith('0'):
+        return DEFAULT_COUNTRY_CODE + digits[1:]
+    return digits
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # Перевірка дозволяє повторити міграцію, якщо заповнення перервалося:
+    # колонка на той момент уже закомічена
+    if 'phone_normalized' not in {column['name'] for column in sa.inspect(bind).get_columns('contacts')}:
+        op.add_column('contacts', sa.Column('phone_normalized', sa.String(length=24), nullable=True))
+
+    # Заповнення пакетами за зростанням id поза транзакцією міграції: кожен
+    # пакет комітиться окремо, тож блокування рядків і WAL не накопичуються
+    # на всю таблицю, у пам'яті не більше BATCH_SIZE рядків, а user_id в
+    # умові UPDATE відсікає зайві HASH-розділи. Повторний прохід дає той
+    # самий результат
+    update = (
+        contacts.update()
+        .where(contacts.c.id == sa.bindparam('b_id'), contacts.c.user_id == sa.bindparam('b_user_id'))
+        .values(phone_normalized=sa.bindparam('b_phone_normalized'))
+    )
+    with op.get_context().autocommit_block():
+        last_id = 0
+        while True:
+            rows = bind.execute(
+                sa.select(contacts.c.id, contacts.c.user_id, contacts.c.phone)
+                .where(contacts.c.id > last_id)
+                .order_by(contacts.c.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            bind.execute(
+                update,
+                [
+                    {'b_id': row.id, 'b_user_id': row.user_id, 'b_phone_normalized': _normalize_phone(row.phone)}
+                    for row in rows
+                ],
+            )
+            last_id = rows[-1].id
+
+    op.create_index(
+        'ix_contacts_user_phone_normalized',
+        'contacts',
+        ['user_id', 'phone_normalized'],
+        unique=False,
+        postgresql_ops={'phone_normalized': 'varchar_pattern_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_user_phone_normalized', table_name='contacts')
+    op.drop_column('contacts', 'phone_normalized')
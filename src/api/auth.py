@@ -2,16 +2,29 @@ from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks,
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 
-from src.schemas import UserCreate, Token, User, RequestEmail, ResetPassword
+from src.schemas import (
+    UserCreate,
+    Token,
+    User,
+    RequestEmail,
+    ResetPassword,
+    RefreshTokenRequest,
+)
 from src.services.email import send_confirm_email, send_reset_password_email
 from src.services.auth import (
+    build_access_claims,
     create_access_token,
+    get_current_user,
     Hash,
     get_email_from_token,
     get_password_from_token,
+    oauth2_scheme,
+    revoke_access_token,
 )
+from src.services.refresh_tokens import RefreshTokenService
 from src.services.users import UserService
 from src.database.db import get_db
+from src.conf.config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -39,20 +52,7 @@ async def register_user(
     - HTTPException (409): Якщо користувач з таким email або іменем вже існує.
     """
     user_service = UserService(db)
-    email_user = await user_service.get_user_by_email(user_data.email)
-    if email_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Користувач з таким email вже існує",
-        )
-
-    username_user = await user_service.get_user_by_username(user_data.username)
-    if username_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Користувач з таким іменем вже існує",
-        )
-    user_data.password = Hash().get_password_hash(user_data.password)
+    user_data.password = await Hash().get_password_hash_async(user_data.password)
     new_user = await user_service.create_user(user_data)
     background_tasks.add_task(
         send_confirm_email, new_user.email, new_user.username, request.base_url
@@ -72,14 +72,17 @@ async def login_user(
     - db (AsyncSession): Сесія бази даних.
 
     Повертає:
-    - Token: JWT токен доступу.
+    - Token: JWT токен доступу та refresh-токен.
 
     Викликає:
     - HTTPException (401): Якщо логін або пароль неправильний, або email не підтверджений.
     """
     user_service = UserService(db)
     user = await user_service.get_user_by_username(form_data.username)
-    if not user or not Hash().verify_password(form_data.password, user.hashed_password):
+    verified = user is not None and await Hash().verify_password_async(
+        form_data.password, user.hashed_password
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неправильний логін або пароль",
@@ -90,8 +93,84 @@ async def login_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Електронна адреса не підтверджена",
         )
-    access_token = await create_access_token(data={"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"}
+    if Hash().needs_update(user.hashed_password):
+        # Параметри хешування змінилися: прозоро перехешовуємо пароль лише
+        # після всіх перевірок, щоб відповідь 401 не змарнувала хешування
+        new_hash = await Hash().get_password_hash_async(form_data.password)
+        await user_service.update_password_hash(user.id, new_hash)
+    access_token = await create_access_token(data=build_access_claims(user))
+    refresh_token = await RefreshTokenService(db).issue(user.id)
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    body: RefreshTokenRequest, db: AsyncSession = Depends(get_db)
+):
+    """
+    Оновлення токену доступу за refresh-токеном.
+
+    Refresh-токен одноразовий: замість нього видається новий. Це дешевий обмін
+    токенами замість повторної перевірки пароля.
+
+    Параметри:
+    - body (RefreshTokenRequest): Refresh-токен, отриманий під час входу.
+    - db (AsyncSession): Сесія бази даних.
+
+    Повертає:
+    - Token: Новий JWT токен доступу та новий refresh-токен.
+
+    Викликає:
+    - HTTPException (401): Якщо refresh-токен недійсний, прострочений або вже використаний.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Недійсний або прострочений refresh-токен",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    rotated = await RefreshTokenService(db).rotate(body.refresh_token)
+    if rotated is None:
+        raise credentials_exception
+    user_id, refresh_token = rotated
+    user = await UserService(db).get_user_by_id(user_id)
+    if user is None or not user.confirmed:
+        raise credentials_exception
+    access_token = await create_access_token(data=build_access_claims(user))
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+
+
+@router.post("/logout")
+async def logout_user(
+    body: RefreshTokenRequest,
+    token: str = Depends(oauth2_scheme),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Вихід з системи: відкликання refresh-токена та поточного токену доступу.
+
+    Відкликається лише refresh-токен поточного користувача.
+
+    Параметри:
+    - body (RefreshTokenRequest): Refresh-токен, який потрібно відкликати.
+    - token (str): Поточний токен доступу.
+    - user (User): Поточний користувач.
+    - db (AsyncSession): Сесія бази даних.
+
+    Повертає:
+    - dict: Повідомлення про успішний вихід.
+    """
+    await RefreshTokenService(db).revoke(body.refresh_token, user.id)
+    await revoke_access_token(token)
+    return {"message": "Ви вийшли з системи"}
 
 
 @router.get("/confirmed_email/{token}")
@@ -183,9 +262,10 @@ async def reset_password_request(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Ваша електронна пошта не підтверджена",
         )
-    hashed_password = Hash().get_password_hash(body.password)
+    hashed_password = await Hash().get_password_hash_async(body.password)
     reset_token = await create_access_token(
-        data={"sub": user.email, "password": hashed_password}
+        data={"sub": user.email, "password": hashed_password},
+        expires_delta=settings.RESET_TOKEN_EXPIRATION_SECONDS,
     )
     background_tasks.add_task(
         send_reset_password_email,
@@ -202,6 +282,9 @@ async def confirm_reset_password(token: str, db: AsyncSession = Depends(get_db))
     """
     Підтвердження скидання пароля.
 
+    Разом зі зміною пароля відкликаються всі токени доступу та refresh-токени
+    користувача.
+
     Параметри:
     - token (str): Токен підтвердження скидання пароля.
     - db (AsyncSession): Сесія бази даних.
@@ -228,4 +311,6 @@ async def confirm_reset_password(token: str, db: AsyncSession = Depends(get_db))
             detail="Користувача з такою електронною адресою не знайдено",
         )
     await user_service.reset_password(user.id, hashed_password)
+    # Викрадений refresh-токен не повинен пережити зміну пароля
+    await RefreshTokenService(db).revoke_all(user.id)
     return {"message": "Пароль успішно змінено"}
\ No newline at end of file
@@ -1,11 +1,21 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
-from src.schemas import ContactModel, ContactResponse, User
+from src.schemas import (
+    ContactBatchRequest,
+    ContactBatchResult,
+    ContactChanges,
+    ContactModel,
+    ContactResponse,
+    ContactStats,
+    DuplicateReport,
+    User,
+)
 from src.services.auth import get_current_user
 from src.services.contacts import ContactService
+from src.services.duplicates import duplicate_scanner
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 
@@ -31,11 +41,115 @@ async def get_upcoming_birthdays(
     return await contact_service.get_upcoming_birthdays(days, user)
 
 
+@router.get("/stats", response_model=ContactStats)
+async def get_contact_stats(
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Статистика контактів: загальна кількість, розподіл за місяцями
+    народження та кількість нещодавно доданих контактів.
+
+    Загальна кількість береться з лічильника користувача, а решта — з
+    кешованого агрегату, тож запит не сканує всі контакти.
+
+    Параметри:
+    - db (AsyncSession): Сесія бази даних.
+    - user (User): Поточний авторизований користувач.
+
+    Повертає:
+    - ContactStats: Статистика контактів.
+    """
+    contact_service = ContactService(db)
+    return await contact_service.get_stats(user)
+
+
+@router.get("/changes", response_model=ContactChanges)
+async def get_contact_changes(
+    since: Optional[str] = None,
+    limit: int = Query(default=500, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Стрічка змін контактів для синхронізації офлайн-клієнтів.
+
+    Повертає лише контакти, змінені або видалені після токена `since`, тож
+    обсяг синхронізації залежить від кількості змін, а не від кількості
+    контактів. Без `since` повертаються всі активні контакти. Клієнт
+    зберігає `next_token` і передає його в наступному запиті; поки
+    `has_more` дорівнює True, наступну сторінку можна запитати одразу.
+
+    Параметри:
+    - since (str): Токен з попередньої відповіді (необов'язковий).
+    - limit (int): Максимальна кількість змін у відповіді (1-1000, за замовчуванням 500).
+    - db (AsyncSession): Сесія бази даних.
+    - user (User): Поточний авторизований користувач.
+
+    Повертає:
+    - ContactChanges: Зміни, токен для наступного запиту та ознака наявності ще змін.
+
+    Викликає:
+    - HTTPException (400): Якщо токен пошкоджений.
+    - HTTPException (410): Якщо токен застарів і потрібна повна синхронізація.
+    """
+    contact_service = ContactService(db)
+    return await contact_service.get_changes(since, limit, user)
+
+
+@router.post(
+    "/duplicates/scan",
+    response_model=DuplicateReport,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def scan_duplicates(user: User = Depends(get_current_user)):
+    """
+    Запуск фонового пошуку дублікатів серед контактів користувача.
+
+    Пошук порівнює лише контакти зі спільним нормалізованим email, телефоном
+    або ім'ям, тож триває секунди навіть для 100 тис. контактів. Якщо пошук
+    уже виконується, новий не запускається. Результат доступний через
+    `GET /contacts/duplicates`.
+
+    Параметри:
+    - user (User): Поточний авторизований користувач.
+
+    Повертає:
+    - DuplicateReport: Звіт зі станом "running".
+    """
+    return await duplicate_scanner.start_scan(user)
+
+
+@router.get("/duplicates", response_model=DuplicateReport)
+async def get_duplicates(user: User = Depends(get_current_user)):
+    """
+    Отримання результату останнього пошуку дублікатів контактів.
+
+    Параметри:
+    - user (User): Поточний авторизований користувач.
+
+    Повертає:
+    - DuplicateReport: Стан пошуку та знайдені групи дублікатів.
+
+    Викликає:
+    - HTTPException (404): Якщо пошук не запускався або його результат застарів.
+    """
+    report = await duplicate_scanner.get_report(user)
+    if report is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Duplicate scan not found",
+        )
+    return report
+
+
 @router.get("/", response_model=List[ContactResponse])
 async def get_contacts(
+    response: Response,
     name: str = "",
     surname: str = "",
     email: str = "",
+    phone: str = "",
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
@@ -44,10 +158,15 @@ async def get_contacts(
     """
     Пошук контактів за фільтрами.
 
+    Без фільтрів відповідь містить заголовок `X-Total-Count` із загальною
+    кількістю контактів (з лічильника користувача, без COUNT(*)).
+
     Параметри:
+    - response (Response): HTTP-відповідь для заголовка `X-Total-Count`.
     - name (str): Ім'я контакту (необов'язкове).
     - surname (str): Прізвище контакту (необов'язкове).
     - email (str): Email контакту (необов'язкове).
+    - phone (str): Початок номера телефону в будь-якому форматі, напр. "050 123" або "+38050123" (необов'язкове).
     - skip (int): Кількість записів, які потрібно пропустити (за замовчуванням 0).
     - limit (int): Максимальна кількість записів, які потрібно повернути (за замовчуванням 100).
     - db (AsyncSession): Сесія бази даних.
@@ -58,11 +177,42 @@ async def get_contacts(
     """
     contact_service = ContactService(db)
     contacts = await contact_service.get_contacts(
-        name, surname, email, skip, limit, user
+        name, surname, email, phone, skip, limit, user
     )
+    if not (name or surname or email or phone):
+        total = await contact_service.count_contacts(user)
+        response.headers["X-Total-Count"] = str(total)
     return contacts
 
 
+@router.get("/search", response_model=List[ContactResponse])
+async def search_contacts(
+    q: str = Query(min_length=1, max_length=100),
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Повнотекстовий пошук контактів з ранжуванням за релевантністю.
+
+    Шукає за початком слів в імені, прізвищі, email, цифрах телефону та
+    додатковій інформації; збіги в імені та прізвищі мають найвищу вагу.
+
+    Параметри:
+    - q (str): Пошуковий запит (1-100 символів).
+    - skip (int): Кількість результатів, які потрібно пропустити (за замовчуванням 0).
+    - limit (int): Максимальна кількість результатів (1-100, за замовчуванням 20).
+    - db (AsyncSession): Сесія бази даних.
+    - user (User): Поточний авторизований користувач.
+
+    Повертає:
+    - List[ContactResponse]: Знайдені контакти, найрелевантніші першими.
+    """
+    contact_service = ContactService(db)
+    return await contact_service.search_contacts(q, skip, limit, user)
+
+
 @router.get("/{contact_id}", response_model=ContactResponse)
 async def get_contact(
     contact_id: int,
@@ -113,6 +263,32 @@ async def create_contact(
     return await contact_service.create_contact(body, user)
 
 
+@router.post("/batch", response_model=List[ContactBatchResult])
+async def batch_contacts(
+    body: ContactBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Пакетне виконання операцій get/update/delete над контактами.
+
+    Усі операції виконуються в одній транзакції кількома запитами до бази
+    даних на весь пакет, а автентифікація виконується один раз. Помилка
+    окремої операції (контакт не знайдено, конфлікт унікальності) не
+    скасовує решту пакета.
+
+    Параметри:
+    - body (ContactBatchRequest): Список операцій (до 500, ID контактів не повторюються).
+    - db (AsyncSession): Сесія бази даних.
+    - user (User): Поточний авторизований користувач.
+
+    Повертає:
+    - List[ContactBatchResult]: Результати операцій у порядку запиту зі статусом кожної.
+    """
+    contact_service = ContactService(db)
+    return await contact_service.batch(body.operations, user)
+
+
 @router.put("/{contact_id}", response_model=ContactResponse)
 async def update_contact(
     body: ContactModel,
@@ -0,0 +1,82 @@
+import re
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+
+from src.conf.config import settings
+from src.database.instrumentation import query_log
+from src.schemas import User
+from src.services.auth import get_current_admin_user
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/queries")
+async def queries(
+    limit: int = Query(20, ge=1, le=500),
+    user: User = Depends(get_current_admin_user),
+):
+    """
+    Статистика SQL-запитів поточного процесу (лише для адміністраторів).
+
+    Параметри:
+    - limit (int): Кількість унікальних запитів у відповіді.
+    - user (User): Поточний користувач з роллю адміністратора.
+
+    Повертає:
+    - dict: Найдовші за сумарним часом запити, останні повільні запити
+      та останні випадки N+1.
+    """
+    return {
+        "top": query_log.top(limit),
+        "slow": list(query_log.slow),
+        "n_plus_one": list(query_log.n_plus_one),
+    }
+
+
+@router.delete("/queries", status_code=204)
+async def reset_queries(user: User = Depends(get_current_admin_user)):
+    """
+    Очищення статистики SQL-запитів (лише для адміністраторів).
+    """
+    query_log.clear()
+
+
+@router.get("/profiles")
+async def profiles(user: User = Depends(get_current_admin_user)):
+    """
+    Список збережених профілів (лише для адміністраторів).
+
+    Повертає:
+    - list[dict]: ID, розмір і час зміни кожного профілю, новіші першими.
+    """
+    directory = Path(settings.PROFILE_DIR)
+    if not directory.is_dir():
+        return []
+    files = sorted(
+        directory.glob("*.folded"), key=lambda f: f.stat().st_mtime, reverse=True
+    )
+    return [
+        {"id": f.stem, "size": f.stat().st_size, "modified": f.stat().st_mtime}
+        for f in files
+    ]
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, user: User = Depends(get_current_admin_user)):
+    """
+    Завантаження профілю у форматі folded stacks (лише для адміністраторів).
+
+    Файл можна відкрити у speedscope або перетворити на flamegraph
+    за допомогою `flamegraph.pl`.
+
+    Випадки помилок:
+    - 404 NOT_FOUND: Якщо профіль не знайдено.
+    """
+    path = Path(settings.PROFILE_DIR) / f"{profile_id}.folded"
+    if not re.fullmatch(r"[\w-]+", profile_id) or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Профіль не знайдено"
+        )
+    return FileResponse(path, media_type="text/plain")
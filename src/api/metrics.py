@@ -0,0 +1,55 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from src.conf.config import settings
+from src.services.metrics import registry
+
+router = APIRouter(tags=["metrics"])
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def verify_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> None:
+    """
+    Перевіряє Bearer-токен збирача метрик.
+
+    Без налаштованого `METRICS_TOKEN` ендпоінт вимкнено, щоб метрики не
+    потрапили назовні випадково.
+
+    Викидає:
+    - HTTPException: 404, якщо токен не налаштовано; 401, якщо токен
+      відсутній або не збігається.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get(
+    "/metrics",
+    include_in_schema=False,
+    dependencies=[Depends(verify_metrics_token)],
+)
+async def metrics():
+    """
+    Метрики застосунку у текстовому форматі Prometheus.
+
+    Доступні лише з заголовком `Authorization: Bearer <METRICS_TOKEN>`.
+
+    Повертає:
+    - Response: Гістограми часу обробки запитів, кількість запитів у роботі,
+      стан пулу з'єднань з БД, лічильники кешів і глибину черг.
+    """
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
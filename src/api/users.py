@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, Request, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, status
+from fastapi.responses import FileResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,19 +7,27 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.conf.config import settings
 from src.database.db import get_db
 from src.schemas import User
-from src.services.auth import get_current_user, get_current_admin_user
-from src.services.upload_file import UploadFileService
+from src.services.auth import (
+    get_current_admin_user,
+    get_current_user,
+    get_current_user_profile,
+    oauth2_scheme,
+    revoke_access_token,
+)
+from src.services.refresh_tokens import RefreshTokenService
+from src.services.storage import LocalStorage, get_storage
+from src.services.upload_file import avatar_processor
 from src.services.users import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=get_remote_address, enabled=settings.RATE_LIMIT_ENABLED)
 
 
 @router.get(
     "/me", response_model=User, description="No more than 10 requests per minute"
 )
 @limiter.limit("10 per minute")
-async def me(request: Request, user: User = Depends(get_current_user)):
+async def me(request: Request, user: User = Depends(get_current_user_profile)):
     """
     Отримання інформації про поточного авторизованого користувача.
 
@@ -35,6 +44,35 @@ async def me(request: Request, user: User = Depends(get_current_user)):
     return user
 
 
+@router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_me(
+    token: str = Depends(oauth2_scheme),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Видалення облікового запису поточного користувача.
+
+    Обліковий запис позначається видаленим, а всі токени користувача
+    відкликаються. Контакти остаточно видаляються у фоні невеликими
+    пакетами, тому відповідь не залежить від їх кількості.
+
+    Параметри:
+    - token (str): Поточний токен доступу.
+    - user (User): Поточний авторизований користувач.
+    - db (AsyncSession): Сесія бази даних.
+
+    Викликає:
+    - HTTPException (404): Якщо користувача вже видалено.
+    """
+    if not await UserService(db).delete_user(user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Користувача не знайдено"
+        )
+    await RefreshTokenService(db).revoke_all(user.id)
+    await revoke_access_token(token)
+
+
 @router.patch("/avatar", response_model=User)
 async def update_avatar_user(
     file: UploadFile = File(),
@@ -44,6 +82,10 @@ async def update_avatar_user(
     """
     Оновлення аватара для поточного адміністратора.
 
+    Файл перевіряється і зменшується до квадратного зображення WEBP
+    (див. `AvatarProcessor`) ще до збереження у сховищі аватарів
+    (`STORAGE_BACKEND`: Cloudinary, локальний диск або S3).
+
     Параметри:
     - file (UploadFile): Завантажений файл аватара.
     - user (User): Поточний авторизований адміністратор.
@@ -51,15 +93,46 @@ async def update_avatar_user(
 
     Повертає:
     - User: Оновлені дані користувача з новим URL аватара.
+
+    Викликає:
+    - HTTPException (413): Якщо файл або роздільність зображення завеликі.
+    - HTTPException (415): Якщо файл не є зображенням підтримуваного формату.
     """
-    # Завантаження аватара на хмарне сховище
-    avatar_service = UploadFileService(
-        settings.CLD_NAME, settings.CLD_API_KEY, settings.CLD_API_SECRET
-    )
-    avatar_url = avatar_service.upload_file(file, user.username)
+    avatar = await avatar_processor.process(file)
+
+    # Збереження аватара у сховищі
+    storage = get_storage(settings.STORAGE_BACKEND)
+    avatar_url = await storage.save(f"{user.id}.webp", avatar, "image/webp")
 
     # Оновлення URL аватара в базі даних
     user_service = UserService(db)
     user = await user_service.update_avatar_url(user.email, avatar_url)
 
-    return user
\ No newline at end of file
+    return user
+
+
+@router.get("/avatars/{key}", response_class=FileResponse)
+async def get_avatar(key: str):
+    """
+    Віддає аватар, збережений у локальному сховищі (`STORAGE_BACKEND=local`).
+
+    Файл передається через `FileResponse` без читання в пам'ять застосунку
+    (із zero-copy передачею, якщо ASGI-сервер її підтримує).
+
+    Параметри:
+    - key (str): Ім'я файлу аватара.
+
+    Викликає:
+    - HTTPException (404): Якщо файл не знайдено або використовується інше сховище.
+    """
+    storage = get_storage(settings.STORAGE_BACKEND)
+    path = storage.path(key) if isinstance(storage, LocalStorage) else None
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Аватар не знайдено"
+        )
+    return FileResponse(
+        path,
+        media_type="image/webp",
+        headers={"Cache-Control": "public, max-age=86400"},
+    )
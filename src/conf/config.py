@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import ConfigDict, EmailStr
 from pydantic_settings import BaseSettings
 
@@ -9,10 +11,55 @@ class Settings(BaseSettings):
     Цей клас автоматично завантажує налаштування з середовища або файлу `.env`, використовуючи бібліотеку Pydantic.
 
     Атрибути:
+    - ENV (str): Середовище виконання: "development" або "production" (за замовчуванням: "production"); лише в "development" відповіді містять налагоджувальні заголовки X-DB-Queries і X-DB-Time.
     - DB_URL (str): URL для підключення до бази даних.
+    - DB_LEAN_READS (bool): Чи повертати списки контактів як легкі рядки замість ORM-сутностей (за замовчуванням: False).
+    - SLOW_QUERY_MS (int): Поріг у мілісекундах, починаючи з якого SQL-запит логується як повільний (за замовчуванням: 200).
+    - N_PLUS_ONE_THRESHOLD (int): Кількість однакових SQL-запитів у межах HTTP-запиту, що вважається ознакою N+1 (за замовчуванням: 10).
+    - METRICS_TOKEN (str): Bearer-токен, який Prometheus передає при зборі `/metrics`; порожній вимикає ендпоінт (за замовчуванням: "").
+    - SOFT_DELETE_RETENTION_SECONDS (int): Скільки секунд м'яко видалені контакти та користувачі зберігаються до остаточного видалення (за замовчуванням: 604800).
+    - PHONE_DEFAULT_COUNTRY_CODE (str): Код країни, що додається до національних номерів телефонів (з ведучим 0) при нормалізації (за замовчуванням: "380").
+    - DUPLICATES_MIN_SCORE (float): Мінімальна оцінка схожості (0-1), з якої пара контактів вважається дублікатом (за замовчуванням: 0.6).
+    - DUPLICATES_MAX_BLOCK_SIZE (int): Максимальна кількість контактів зі спільним ключем блокування, що порівнюються попарно; більші блоки пропускаються (за замовчуванням: 50).
+    - DUPLICATES_REPORT_TTL (int): Час життя звіту пошуку дублікатів у кеші в секундах (за замовчуванням: 3600).
+    - CONTACT_STATS_CACHE_TTL (int): Час життя кешованої статистики контактів (за місяцями народження та нещодавно доданими) у секундах (за замовчуванням: 300).
+    - PURGE_ENABLED (bool): Чи запускати фонове остаточне видалення м'яко видалених записів (за замовчуванням: True).
+    - PURGE_INTERVAL_SECONDS (int): Інтервал між проходами фонового видалення в секундах (за замовчуванням: 60).
+    - PURGE_BATCH_SIZE (int): Кількість рядків, що видаляються в одній транзакції (за замовчуванням: 1000).
+    - PURGE_BATCH_PAUSE_MS (int): Пауза між пакетами видалення в мілісекундах (за замовчуванням: 100).
     - JWT_SECRET (str): Секретний ключ для підпису JWT-токенів.
     - JWT_ALGORITHM (str): Алгоритм для генерації JWT-токенів (за замовчуванням: HS256).
-    - JWT_EXPIRATION_SECONDS (int): Час життя токенів у секундах (за замовчуванням: 3600).
+    - JWT_EXPIRATION_SECONDS (int): Час життя токенів доступу у секундах (за замовчуванням: 900; до появи refresh-токенів було 3600, тож клієнти мають оновлювати токен через /api/auth/refresh).
+    - JWT_REFRESH_EXPIRATION_SECONDS (int): Час життя refresh-токенів у секундах (за замовчуванням: 2592000).
+    - RESET_TOKEN_EXPIRATION_SECONDS (int): Час життя посилання для скидання пароля у секундах; не залежить від JWT_EXPIRATION_SECONDS (за замовчуванням: 3600).
+    - CONFIRM_TOKEN_EXPIRATION_SECONDS (int): Час життя посилання для підтвердження електронної пошти у секундах (за замовчуванням: 604800).
+    - JWT_BACKEND (str): Бібліотека для підпису та перевірки JWT: "jose" або "pyjwt" (за замовчуванням: "jose").
+    - JWT_CACHE_SIZE (int): Розмір LRU-кешу перевірених токенів, 0 вимикає кеш (за замовчуванням: 4096).
+    - JWT_STATELESS_CLAIMS (bool): Чи додавати до токенів доступу claims користувача (id, роль, версія токена) і автентифікувати без запиту до БД (за замовчуванням: False).
+    - TOKEN_VERSION_CACHE_TTL (int): Час життя версій токенів у кеші в секундах (за замовчуванням: 3600).
+    - PASSWORD_HASH_SCHEME (str): Схема хешування паролів: "bcrypt" або "argon2" (за замовчуванням: "bcrypt").
+    - BCRYPT_ROUNDS (int): Вартість bcrypt, однакова для всіх процесів; підібрати її під обладнання можна командою `python -m benchmarks.bench_password_hash --target-ms 250` (за замовчуванням: 12).
+    - PASSWORD_HASH_WORKERS (int): Кількість потоків для хешування паролів поза циклом подій (за замовчуванням: 4).
+    - ARGON2_MEMORY_COST (int): Обсяг пам'яті Argon2id у KiB (за замовчуванням: 65536).
+    - ARGON2_TIME_COST (int): Кількість ітерацій Argon2id (за замовчуванням: 3).
+    - ARGON2_PARALLELISM (int): Ступінь паралелізму Argon2id (за замовчуванням: 4).
+    - RATE_LIMIT_ENABLED (bool): Чи обмежувати частоту запитів до ендпоінтів з лімітами (за замовчуванням: True).
+    - COMPRESSION_ENABLED (bool): Чи стискати відповіді (за замовчуванням: True).
+    - COMPRESSION_MIN_SIZE (int): Мінімальний розмір відповіді в байтах, що стискається (за замовчуванням: 1024).
+    - COMPRESSION_GZIP_LEVEL (int): Рівень стиснення gzip (за замовчуванням: 6).
+    - COMPRESSION_BROTLI_QUALITY (int): Якість стиснення Brotli, якщо встановлено пакет `brotli` (за замовчуванням: 4).
+    - COMPRESSION_ZSTD_LEVEL (int): Рівень стиснення Zstandard, якщо встановлено пакет `zstandard` (за замовчуванням: 3).
+    - OPENAPI_SCHEMA_PATH (str): Файл попередньо згенерованої схеми OpenAPI; порожній рядок — генерувати при першому запиті (за замовчуванням: "").
+    - CACHE_BACKEND (str): Бекенд кешу aiocache: "redis" або "memory"; кеш у пам'яті не спільний для процесів, тож відкликання токенів видно лише в процесі, що його виконав, — лише для розробки й тестів (за замовчуванням: "redis").
+    - REDIS_HOST (str): Адреса Redis сервера (за замовчуванням: "localhost").
+    - REDIS_PORT (int): Порт Redis сервера (за замовчуванням: 6379).
+    - PROFILE_DIR (str): Каталог для збереження профілів (за замовчуванням: "profiles").
+    - PROFILE_INTERVAL_MS (int): Інтервал вибірки при профілюванні запиту в мілісекундах (за замовчуванням: 5).
+    - PROFILE_MAX_SECONDS (int): Максимальна тривалість профілювання одного запиту в секундах (за замовчуванням: 30).
+    - PROFILE_MAX_PER_MINUTE (int): Максимальна кількість профілювань запитів за хвилину (за замовчуванням: 6).
+    - PROFILE_CONTINUOUS (bool): Чи вмикати безперервне профілювання всього процесу (за замовчуванням: False).
+    - PROFILE_CONTINUOUS_INTERVAL_MS (int): Інтервал вибірки безперервного профілювання в мілісекундах (за замовчуванням: 100).
+    - PROFILE_FLUSH_SECONDS (int): Як часто записувати профіль безперервного профілювання у файл, у секундах (за замовчуванням: 60).
     - MAIL_USERNAME (EmailStr): Логін для SMTP сервера.
     - MAIL_PASSWORD (str): Пароль для SMTP сервера.
     - MAIL_FROM (EmailStr): Електронна адреса, від якої надсилаються листи.
@@ -23,9 +70,23 @@ class Settings(BaseSettings):
     - MAIL_SSL_TLS (bool): Чи використовувати SSL/TLS для SMTP (за замовчуванням: True).
     - USE_CREDENTIALS (bool): Чи використовувати облікові дані для SMTP (за замовчуванням: True).
     - VALIDATE_CERTS (bool): Чи перевіряти сертифікати SSL (за замовчуванням: True).
-    - CLOUDINARY_NAME (str): Ім'я облікового запису Cloudinary.
+    - AVATAR_SIZE (int): Сторона квадратного аватара в пікселях (за замовчуванням: 250).
+    - AVATAR_MAX_BYTES (int): Максимальний розмір файлу аватара в байтах (за замовчуванням: 10485760).
+    - AVATAR_MAX_PIXELS (int): Максимальна кількість пікселів зображення аватара (за замовчуванням: 24000000).
+    - AVATAR_QUALITY (int): Якість кодування аватара у WEBP (за замовчуванням: 80).
+    - AVATAR_WORKERS (int): Кількість процесів для обробки аватарів (за замовчуванням: 2).
+    - STORAGE_BACKEND (str): Сховище аватарів: "cloudinary", "local" або "s3" (за замовчуванням: "cloudinary").
+    - STORAGE_LOCAL_DIR (str): Каталог для аватарів при STORAGE_BACKEND=local (за замовчуванням: "media/avatars").
+    - STORAGE_PUBLIC_URL (str): Базовий URL (CDN), за яким доступні аватари зі сховищ "local" і "s3"; порожній рядок — URL за замовчуванням для сховища (за замовчуванням: "").
+    - CLOUDINARY_NAME (str): Ім'я облікового запису Cloudinary (обов'язкове для STORAGE_BACKEND=cloudinary).
     - CLOUDINARY_API_KEY (int): API-ключ для Cloudinary.
     - CLOUDINARY_API_SECRET (str): Секретний ключ для Cloudinary.
+    - S3_BUCKET (str): Назва бакета для STORAGE_BACKEND=s3 (потребує пакета boto3).
+    - S3_ENDPOINT_URL (str): Адреса S3-сумісного сервісу, наприклад MinIO; порожній рядок — AWS S3 (за замовчуванням: "").
+    - S3_REGION (str): Регіон бакета (за замовчуванням: "us-east-1").
+    - S3_ACCESS_KEY (str): Ключ доступу S3; порожній рядок — облікові дані з оточення (за замовчуванням: "").
+    - S3_SECRET_KEY (str): Секретний ключ S3 (за замовчуванням: "").
+    - S3_PREFIX (str): Префікс ключів аватарів у бакеті (за замовчуванням: "avatars/").
 
     Методи:
     - model_config: Конфігурація для завантаження налаштувань із файлу `.env`.
@@ -37,11 +98,63 @@ class Settings(BaseSettings):
     ```
     """
 
+    ENV: str = "production"
+
     DB_URL: str
+    DB_LEAN_READS: bool = False
+    SLOW_QUERY_MS: int = 200
+    N_PLUS_ONE_THRESHOLD: int = 10
+    METRICS_TOKEN: str = ""
+    SOFT_DELETE_RETENTION_SECONDS: int = 604800
+    PHONE_DEFAULT_COUNTRY_CODE: str = "380"
+    DUPLICATES_MIN_SCORE: float = 0.6
+    DUPLICATES_MAX_BLOCK_SIZE: int = 50
+    DUPLICATES_REPORT_TTL: int = 3600
+    CONTACT_STATS_CACHE_TTL: int = 300
+    PURGE_ENABLED: bool = True
+    PURGE_INTERVAL_SECONDS: int = 60
+    PURGE_BATCH_SIZE: int = 1000
+    PURGE_BATCH_PAUSE_MS: int = 100
 
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
-    JWT_EXPIRATION_SECONDS: int = 3600
+    JWT_EXPIRATION_SECONDS: int = 900
+    JWT_REFRESH_EXPIRATION_SECONDS: int = 2592000
+    RESET_TOKEN_EXPIRATION_SECONDS: int = 3600
+    CONFIRM_TOKEN_EXPIRATION_SECONDS: int = 604800
+    JWT_BACKEND: str = "jose"
+    JWT_CACHE_SIZE: int = 4096
+    JWT_STATELESS_CLAIMS: bool = False
+    TOKEN_VERSION_CACHE_TTL: int = 3600
+
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_TIME_COST: int = 3
+    ARGON2_PARALLELISM: int = 4
+
+    RATE_LIMIT_ENABLED: bool = True
+
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    OPENAPI_SCHEMA_PATH: str = ""
+
+    CACHE_BACKEND: str = "redis"
+    REDIS_HOST: str = "localhost"
+    REDIS_PORT: int = 6379
+
+    PROFILE_DIR: str = "profiles"
+    PROFILE_INTERVAL_MS: int = 5
+    PROFILE_MAX_SECONDS: int = 30
+    PROFILE_MAX_PER_MINUTE: int = 6
+    PROFILE_CONTINUOUS: bool = False
+    PROFILE_CONTINUOUS_INTERVAL_MS: int = 100
+    PROFILE_FLUSH_SECONDS: int = 60
 
     MAIL_USERNAME: EmailStr
     MAIL_PASSWORD: str
@@ -54,13 +167,30 @@ class Settings(BaseSettings):
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
 
-    CLOUDINARY_NAME: str
-    CLOUDINARY_API_KEY: int
-    CLOUDINARY_API_SECRET: str
+    AVATAR_SIZE: int = 250
+    AVATAR_MAX_BYTES: int = 10 * 1024 * 1024
+    AVATAR_MAX_PIXELS: int = 24_000_000
+    AVATAR_QUALITY: int = 80
+    AVATAR_WORKERS: int = 2
+
+    STORAGE_BACKEND: str = "cloudinary"
+    STORAGE_LOCAL_DIR: str = "media/avatars"
+    STORAGE_PUBLIC_URL: str = ""
+
+    CLOUDINARY_NAME: str = ""
+    CLOUDINARY_API_KEY: Optional[int] = None
+    CLOUDINARY_API_SECRET: str = ""
+
+    S3_BUCKET: str = ""
+    S3_ENDPOINT_URL: str = ""
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY: str = ""
+    S3_SECRET_KEY: str = ""
+    S3_PREFIX: str = "avatars/"
 
     model_config = ConfigDict(
         extra="ignore", env_file=".env", env_file_encoding="utf-8", case_sensitive=True
     )
 
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
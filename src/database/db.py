@@ -1,12 +1,16 @@
 import contextlib
+from typing import Awaitable, Callable
+
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
+    AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
 from src.conf.config import settings
+from src.database.instrumentation import instrument_engine
 
 
 class DatabaseSessionManager:
@@ -37,8 +41,11 @@ class DatabaseSessionManager:
         - url (str): URL для підключення до бази даних.
         """
         self._engine: AsyncEngine = create_async_engine(url)
+        instrument_engine(self._engine)
+        # expire_on_commit=False: після commit об'єкти лишаються придатними до
+        # читання без повторного SELECT; серверні значення повертає RETURNING
         self._session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self._engine
+            autoflush=False, autocommit=False, expire_on_commit=False, bind=self._engine
         )
 
     @contextlib.asynccontextmanager
@@ -69,6 +76,12 @@ async def get_db():
     """
     Генератор для отримання сесії бази даних у залежностях FastAPI.
 
+    Сесія працює як unit of work: репозиторії лише надсилають зміни
+    (flush), а фіксація транзакції виконується один раз після успішної
+    обробки запиту, до надсилання відповіді. Будь-який виняток, зокрема
+    HTTPException, відкочує всі зміни запиту. Дії, заплановані через
+    `after_commit`, виконуються лише після успішної фіксації.
+
     Приклад використання:
     ```
     @router.get("/")
@@ -77,4 +90,56 @@ async def get_db():
     ```
     """
     async with sessionmanager.session() as session:
-        yield session
\ No newline at end of file
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            session.info.pop(AFTER_COMMIT_KEY, None)
+            await session.rollback()
+            raise
+        await run_after_commit(session)
+
+
+AFTER_COMMIT_KEY = "after_commit"
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable]) -> None:
+    """
+    Запланувати дію, яка виконається після фіксації транзакції сесії.
+
+    Використовується для зовнішніх побічних ефектів (наприклад, інвалідації
+    кешу), які не можна відкотити разом із транзакцією: якщо запит
+    завершиться помилкою, дія не виконається, а паралельні запити не
+    прочитають з бази даних незафіксовані дані раніше, ніж вона відбудеться.
+
+    Аргументи:
+        session: Сесія, транзакцію якої фіксує `get_db`.
+        callback: Асинхронна функція без аргументів.
+    """
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+async def run_after_commit(session: AsyncSession) -> None:
+    """
+    Виконати дії, заплановані через `after_commit`, після фіксації транзакції.
+    """
+    for callback in session.info.pop(AFTER_COMMIT_KEY, []):
+        await callback()
+
+
+@contextlib.asynccontextmanager
+async def savepoint(session: AsyncSession):
+    """
+    Вкладена транзакція (SAVEPOINT) у межах поточної транзакції сесії.
+
+    При винятку відкочуються лише зміни всередині блоку, а решта
+    транзакції запиту залишається чинною.
+
+    Приклад використання:
+    ```
+    async with savepoint(db):
+        await db.execute(insert(User).values(...))
+    ```
+    """
+    async with session.begin_nested() as nested:
+        yield nested
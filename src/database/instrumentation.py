@@ -0,0 +1,239 @@
+import contextlib
+import hashlib
+import logging
+import re
+import time
+from collections import Counter, OrderedDict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.conf.config import settings
+
+logger = logging.getLogger("sql")
+
+# Скільки унікальних запитів і останніх повільних запитів тримати в пам'яті
+MAX_FINGERPRINTS = 500
+MAX_SLOW_QUERIES = 100
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str, parameters) -> str:
+    """
+    Відбиток запиту: хеш нормалізованого SQL і форми bind-параметрів.
+
+    Значення параметрів не враховуються (і не потрапляють у логи), тож
+    однакові запити з різними значеннями мають однаковий відбиток.
+    """
+    if isinstance(parameters, dict):
+        shape = ",".join(sorted(parameters))
+    elif isinstance(parameters, (list, tuple)):
+        shape = str(len(parameters))
+    else:
+        shape = ""
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    return hashlib.sha1(f"{normalized}|{shape}".encode()).hexdigest()[:12]
+
+
+def parameter_types(parameters) -> object:
+    """
+    Типи bind-параметрів без значень — для логів повільних запитів.
+    """
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+@dataclass
+class RequestQueries:
+    """
+    Запити до бази даних у межах одного HTTP-запиту.
+
+    Атрибути:
+    - count (int): Кількість виконаних запитів.
+    - total_time (float): Сумарний час виконання в секундах.
+    - fingerprints (Counter): Кількість виконань кожного унікального запиту.
+    - statements (dict): SQL за відбитком.
+    """
+
+    count: int = 0
+    total_time: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+    statements: dict = field(default_factory=dict)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Запити, виконані щонайменше `threshold` разів (ознака N+1).
+        """
+        return [
+            (fp, count)
+            for fp, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+
+@dataclass
+class QueryStats:
+    """
+    Сукупна статистика одного унікального запиту.
+    """
+
+    statement: str
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+
+class QueryLog:
+    """
+    Збір статистики SQL-запитів у пам'яті процесу.
+
+    Зберігає агреговані дані за відбитками (обмежена кількість, LRU),
+    останні повільні запити та останні випадки N+1.
+    """
+
+    def __init__(self):
+        self.fingerprints: OrderedDict[str, QueryStats] = OrderedDict()
+        self.slow: deque = deque(maxlen=MAX_SLOW_QUERIES)
+        self.n_plus_one: deque = deque(maxlen=MAX_SLOW_QUERIES)
+
+    def record(self, fp: str, statement: str, elapsed: float) -> None:
+        stats = self.fingerprints.get(fp)
+        if stats is None:
+            stats = self.fingerprints[fp] = QueryStats(statement)
+            if len(self.fingerprints) > MAX_FINGERPRINTS:
+                self.fingerprints.popitem(last=False)
+        else:
+            self.fingerprints.move_to_end(fp)
+        stats.count += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+
+    def top(self, limit: int = 20) -> list[dict]:
+        """
+        Унікальні запити з найбільшим сумарним часом виконання.
+        """
+        ranked = sorted(
+            self.fingerprints.items(), key=lambda item: item[1].total_time, reverse=True
+        )
+        return [
+            {
+                "fingerprint": fp,
+                "statement": stats.statement,
+                "count": stats.count,
+                "total_ms": round(stats.total_time * 1000, 3),
+                "avg_ms": round(stats.total_time / stats.count * 1000, 3),
+                "max_ms": round(stats.max_time * 1000, 3),
+            }
+            for fp, stats in ranked[:limit]
+        ]
+
+    def clear(self) -> None:
+        self.fingerprints.clear()
+        self.slow.clear()
+        self.n_plus_one.clear()
+
+
+query_log = QueryLog()
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar(
+    "request_queries", default=None
+)
+
+
+@contextlib.contextmanager
+def track_queries(path: str = ""):
+    """
+    Контекстний менеджер для підрахунку запитів у межах HTTP-запиту.
+
+    Після завершення перевіряє повторювані запити і логує можливий N+1.
+
+    Повертає:
+        RequestQueries: Статистика запитів, що заповнюється під час виконання.
+    """
+    queries = RequestQueries()
+    token = _current.set(queries)
+    try:
+        yield queries
+    finally:
+        _current.reset(token)
+        repeated = queries.repeated(settings.N_PLUS_ONE_THRESHOLD)
+        for fp, count in repeated:
+            logger.warning(
+                "Possible N+1 on %s: query %s executed %d times: %s",
+                path,
+                fp,
+                count,
+                queries.statements[fp],
+            )
+            query_log.n_plus_one.append(
+                {
+                    "path": path,
+                    "fingerprint": fp,
+                    "count": count,
+                    "statement": queries.statements[fp],
+                }
+            )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    fp = fingerprint(statement, parameters)
+    query_log.record(fp, statement, elapsed)
+
+    queries = _current.get()
+    if queries is not None:
+        queries.count += 1
+        queries.total_time += elapsed
+        queries.fingerprints[fp] += 1
+        queries.statements.setdefault(fp, statement)
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        types = parameter_types(parameters)
+        logger.warning(
+            "Slow query %s (%.1f ms), params %s: %s",
+            fp,
+            elapsed * 1000,
+            types,
+            statement,
+        )
+        query_log.slow.append(
+            {
+                "fingerprint": fp,
+                "statement": statement,
+                "parameters": types,
+                "duration_ms": round(elapsed * 1000, 3),
+            }
+        )
+
+
+def _handle_error(context):
+    # Запит завершився помилкою: after_cursor_execute не буде викликано
+    if context.connection is not None:
+        starts = context.connection.info.get("query_start")
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine: AsyncEngine | Engine) -> None:
+    """
+    Підключає обробники подій SQLAlchemy для вимірювання запитів.
+
+    Аргументи:
+        engine: Двигун бази даних (асинхронний або синхронний).
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
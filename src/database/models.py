@@ -7,16 +7,66 @@ from sqlalchemy import (
     Date,
     Column,
     ForeignKey,
+    Index,
     func,
+    text,
     Enum as SqlEnum,
 )
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-
+from sqlalchemy.orm import backref, relationship
+from sqlalchemy.sql.expression import FunctionElement
 
 Base = declarative_base()
 
 
+class utcnow(FunctionElement):
+    """
+    Поточний час бази даних в UTC без часового поясу.
+
+    Колонки DateTime зберігають час без часового поясу, а застосунок
+    порівнює їх з `datetime.now(timezone.utc)` (курсор стрічки змін,
+    статистика). `now()` у PostgreSQL повертає час у часовому поясі сесії,
+    тож на сервері не в UTC такі порівняння були б зсунуті.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _postgresql_utcnow(element, compiler, **kw):
+    return "timezone('utc', now())"
+
+
+@compiles(utcnow, "sqlite")
+def _sqlite_utcnow(element, compiler, **kw):
+    # CURRENT_TIMESTAMP у SQLite має точність до секунди і формат, що
+    # відрізняється від збережених SQLAlchemy дат ("... 12:00:00.000000"),
+    # через що порівняння з datetime-параметрами працюють неправильно
+    return "(strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')"
+
+
+# Вираз згенерованої колонки contacts.search_vector для повнотекстового пошуку.
+# Колонка та GIN-індекс ix_contacts_search існують лише в PostgreSQL
+# (міграція c2e7a9d51f84) і не описані в моделі, бо SQLite не підтримує
+# tsvector. Конфігурація 'simple' не залежить від мови: імена бувають
+# українською та англійською. Телефон індексується лише цифрами, email —
+# цілком і частинами до та після "@". Міграція тримає власну копію виразу,
+# тож його зміна потребує нової міграції.
+CONTACT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(surname, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || translate(coalesce(email, ''), '@.', '  ')), 'B') || "
+    "setweight(to_tsvector('simple', regexp_replace(coalesce(phone, ''), '\\D', '', 'g')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(info, '')), 'C')"
+)
+
+
 class UserRole(str, Enum):
     """
     Перерахунок ролей користувачів.
@@ -38,29 +88,83 @@ class Contact(Base):
     - id: Первинний ключ.
     - name: Ім'я контакту (обов'язкове).
     - surname: Прізвище контакту (обов'язкове).
-    - email: Електронна пошта контакту (унікальна, обов'язкова).
-    - phone: Телефонний номер контакту (унікальний, обов'язковий).
+    - email: Електронна пошта контакту (унікальна в межах користувача, обов'язкова).
+    - phone: Телефонний номер контакту (унікальний в межах користувача, обов'язковий).
+    - phone_normalized: Цифри номера телефону у форматі E.164 без "+" (обчислюються сервісом при записі).
     - birthday: Дата народження контакту (обов'язкова).
-    - created_at: Дата створення запису (автоматично).
-    - updated_at: Дата останнього оновлення запису (автоматично).
+    - created_at: Дата створення запису в UTC (автоматично).
+    - updated_at: Дата останнього оновлення запису в UTC (автоматично).
+    - change_version: Значення `users.contacts_version` на момент останньої зміни контакту (курсор стрічки змін).
     - info: Додаткова інформація про контакт.
     - user_id: Зовнішній ключ для прив'язки до користувача.
+    - deleted_at: Дата м'якого видалення; None для активних контактів.
     - user: Відношення до моделі User.
     """
 
     __tablename__ = "contacts"
+    # У PostgreSQL таблиця може бути розбита на HASH-розділи за user_id
+    # (міграція f3a8c1d04b27, 16 розділів). Тоді первинний ключ у базі
+    # даних складений (id, user_id), а ORM ідентифікує рядки лише за id, який
+    # лишається глобально унікальним завдяки спільній послідовності.
+    # Унікальність і пошук стосуються лише активних контактів, тому індекси
+    # часткові: м'яко видалені рядки не займають у них місця і не заважають
+    # створити контакт з тим самим email або телефоном
+    __table_args__ = (
+        Index(
+            "uq_contacts_user_email",
+            "user_id",
+            "email",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "uq_contacts_user_phone",
+            "user_id",
+            "phone",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Пошук і перевірка дублікатів за нормалізованим телефоном; клас
+        # операторів varchar_pattern_ops дозволяє шукати за префіксом (LIKE
+        # '380501%') незалежно від collation бази даних
+        Index(
+            "ix_contacts_user_phone_normalized",
+            "user_id",
+            "phone_normalized",
+            postgresql_ops={"phone_normalized": "varchar_pattern_ops"},
+        ),
+        # Курсор синхронізації змін: діапазон (change_version, id) в межах користувача
+        Index("ix_contacts_user_changes", "user_id", "change_version", "id"),
+        Index(
+            "ix_contacts_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String(50), nullable=False)
     surname = Column(String(50), nullable=False)
-    email = Column(String(100), nullable=False, unique=True)
-    phone = Column(String(20), nullable=False, unique=True)
+    email = Column(String(100), nullable=False)
+    phone = Column(String(20), nullable=False)
+    phone_normalized = Column(String(24), nullable=True)
     birthday = Column(Date, nullable=False)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=utcnow())
+    updated_at = Column(DateTime, default=utcnow(), onupdate=utcnow())
     info = Column(String(500), nullable=True)
     user_id = Column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    user = relationship("User", backref="contacts")
+    deleted_at = Column(DateTime, nullable=True)
+    change_version = Column(Integer, default=0, server_default="0", nullable=False)
+    # lazy="raise": неявне завантаження в async-коді призводить до помилки,
+    # тож зв'язки потрібно завантажувати явно (selectinload/joinedload)
+    user = relationship(
+        "User",
+        backref=backref("contacts", lazy="raise", passive_deletes=True),
+        lazy="raise",
+    )
 
 
 class User(Base):
@@ -69,22 +173,86 @@ class User(Base):
 
     Атрибути:
     - id: Первинний ключ.
-    - username: Унікальне ім'я користувача.
-    - email: Унікальна електронна пошта.
+    - username: Ім'я користувача (унікальне серед активних користувачів).
+    - email: Електронна пошта (унікальна серед активних користувачів).
     - hashed_password: Зашифрований пароль.
     - created_at: Дата створення запису (автоматично).
     - avatar: URL-адреса аватара користувача.
     - confirmed: Чи підтверджений користувач.
     - role: Роль користувача (USER або ADMIN).
+    - token_version: Версія токенів користувача; збільшується для відкликання виданих токенів.
+    - contacts_count: Кількість активних контактів користувача; підтримується `ContactRepository` у тій самій транзакції, що й зміни контактів.
+    - contacts_version: Версія контактів користувача; збільшується `ContactRepository` при кожній зміні контактів (ключ кешу статистики).
+    - deleted_at: Дата видалення облікового запису; None для активних користувачів.
     """
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Унікальність лише серед активних користувачів: email і ім'я
+        # видаленого облікового запису можна зареєструвати знову ще до
+        # його остаточного видалення
+        Index(
+            "uq_users_email",
+            "email",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "uq_users_username",
+            "username",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_users_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
-    username = Column(String, unique=True)
-    email = Column(String, unique=True)
+    username = Column(String)
+    email = Column(String)
     hashed_password = Column(String)
     created_at = Column(DateTime, default=func.now())
     avatar = Column(String(255), nullable=True)
     confirmed = Column(Boolean, default=False)
-    role = Column(SqlEnum(UserRole), default=UserRole.USER, nullable=False)
\ No newline at end of file
+    role = Column(SqlEnum(UserRole), default=UserRole.USER, nullable=False)
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
+    contacts_count = Column(Integer, default=0, server_default="0", nullable=False)
+    contacts_version = Column(Integer, default=0, server_default="0", nullable=False)
+    deleted_at = Column(DateTime, nullable=True)
+
+
+class RefreshToken(Base):
+    """
+    Модель для таблиці 'refresh_tokens'.
+
+    Зберігає лише SHA-256 хеш refresh-токена, тому витік таблиці не дає
+    можливості використати токени.
+
+    Атрибути:
+    - id: Первинний ключ.
+    - user_id: Зовнішній ключ для прив'язки до користувача.
+    - token_hash: SHA-256 хеш refresh-токена (унікальний).
+    - family_id: Ідентифікатор сім'ї токенів: усі токени, отримані ротацією
+      з одного входу в систему, мають спільний family_id.
+    - expires_at: Дата закінчення дії токена.
+    - revoked_at: Дата відкликання або ротації токена.
+    - created_at: Дата створення запису (автоматично).
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    token_hash = Column(String(64), nullable=False, unique=True)
+    family_id = Column(String(32), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=func.now())
@@ -0,0 +1,213 @@
+import asyncio
+import gzip
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - залежить від оточення
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - залежить від оточення
+    zstandard = None
+
+# Типи вмісту, які варто стискати; зображення та архіви вже стиснуті
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+# Більші тіла стискаються в окремому потоці (zlib, brotli і zstd звільняють
+# GIL), щоб не блокувати цикл подій на кілька мілісекунд
+THREAD_THRESHOLD = 64 * 1024
+
+
+def available_encodings(
+    gzip_level: int = 6, brotli_quality: int = 4, zstd_level: int = 3
+) -> Dict[str, Callable[[bytes], bytes]]:
+    """
+    Повертає доступні кодування у порядку переваги сервера.
+
+    Brotli і Zstandard використовуються лише тоді, коли встановлено пакети
+    `brotli` і `zstandard`; gzip доступний завжди.
+
+    Аргументи:
+        gzip_level: Рівень стиснення gzip (1-9).
+        brotli_quality: Якість стиснення Brotli (0-11).
+        zstd_level: Рівень стиснення Zstandard (1-22).
+
+    Повертає:
+        Словник "назва кодування -> функція стиснення".
+    """
+    encoders: Dict[str, Callable[[bytes], bytes]] = {}
+    if zstandard is not None:
+        # ZstdCompressor не потокобезпечний, а великі тіла стискаються в
+        # різних потоках одночасно: кожен потік має власний компресор
+        local = threading.local()
+
+        def zstd_compress(data: bytes) -> bytes:
+            compressor = getattr(local, "compressor", None)
+            if compressor is None:
+                compressor = local.compressor = zstandard.ZstdCompressor(
+                    level=zstd_level
+                )
+            return compressor.compress(data)
+
+        encoders["zstd"] = zstd_compress
+    if brotli is not None:
+        encoders["br"] = lambda data: brotli.compress(data, quality=brotli_quality)
+    encoders["gzip"] = lambda data: gzip.compress(
+        data, compresslevel=gzip_level, mtime=0
+    )
+    return encoders
+
+
+def negotiate_encoding(accept_encoding: str, supported: List[str]) -> Optional[str]:
+    """
+    Обирає кодування за заголовком `Accept-Encoding`.
+
+    Перемагає кодування з найбільшим q; за однакового q — перше в
+    `supported`. Кодування з `q=0` вважаються забороненими, `*` відповідає
+    всім кодуванням, не переліченим явно.
+
+    Повертає:
+        Назву кодування або None, якщо жодне не прийнятне.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[name] = quality
+
+    best, best_quality = None, 0.0
+    for name in supported:
+        quality = weights.get(name, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    ASGI-проміжний шар для стиснення відповідей (zstd, br або gzip).
+
+    Кодування обирається за заголовком `Accept-Encoding` клієнта серед
+    доступних на сервері (див. `available_encodings`). Стискаються лише
+    відповіді, не менші за `minimum_size` байт, з типом вмісту зі списку
+    `COMPRESSIBLE_TYPES` і без власного `Content-Encoding`: для малих
+    відповідей витрати CPU не окупаються економією трафіку. Тіла від
+    `THREAD_THRESHOLD` байт стискаються поза циклом подій. Потокові
+    відповіді (з кількома частинами тіла) передаються без змін.
+
+    Відповіді на шляхи з `static_paths` (наприклад, `/openapi.json`)
+    вважаються незмінними: вони стискаються один раз з максимальним рівнем
+    і надалі віддаються з пам'яті без виклику застосунку.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+        content_types: Tuple[str, ...] = COMPRESSIBLE_TYPES,
+        static_paths: Tuple[str, ...] = ("/openapi.json",),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = content_types
+        self.static_paths = static_paths
+        self.encoders = available_encodings(gzip_level, brotli_quality, zstd_level)
+        # Статичні відповіді стискаються один раз, тож можна не шкодувати CPU
+        self.static_encoders = available_encodings(9, 11, 19)
+        self._static: Dict[Tuple[str, str], Tuple[Message, bytes]] = {}
+
+    def _compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return content_type.startswith(self.content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), list(self.encoders)
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        static = scope["method"] == "GET" and scope["path"] in self.static_paths
+        cached = self._static.get((scope["path"], encoding)) if static else None
+        if cached is not None:
+            start, body = cached
+            await send({**start, "headers": list(start["headers"])})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                # Заголовки відкладаються, доки не стане відомий розмір тіла
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start_message)
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or not self._compressible(headers)
+            ):
+                passthrough = True
+                if self._compressible(headers):
+                    headers.add_vary_header("Accept-Encoding")
+                await send(start_message)
+                await send(message)
+                return
+
+            cacheable = static and start_message["status"] == 200
+            encoders = self.static_encoders if cacheable else self.encoders
+            if len(body) >= THREAD_THRESHOLD:
+                body = await asyncio.to_thread(encoders[encoding], body)
+            else:
+                body = encoders[encoding](body)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            if cacheable:
+                self._static[(scope["path"], encoding)] = (
+                    {**start_message, "headers": list(start_message["headers"])},
+                    body,
+                )
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
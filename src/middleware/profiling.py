@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import uuid
+
+from fastapi import HTTPException
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.services.auth import get_current_admin_user, get_current_user, oauth2_scheme
+from src.services.profiler import SamplingProfiler, profile_budget, save_profile
+
+
+class ProfilingMiddleware:
+    """
+    ASGI-проміжний шар для профілювання окремих запитів на вимогу.
+
+    Профілювання вмикається заголовком `X-Profile: 1` або параметром
+    `?profile=1` і доступне лише адміністраторам (`get_current_admin_user`);
+    для решти користувачів прапорець ігнорується і запит виконується як
+    звичайний.
+    Профіль зберігається у `PROFILE_DIR`, а його ID повертається в
+    заголовку `X-Profile-Id` (див. `GET /api/debug/profiles/{profile_id}`).
+
+    Якщо ліміт профілювання вичерпано, запит виконується без профайлера,
+    а відповідь містить заголовок `X-Profile: rate-limited`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def _requested(request: Request) -> bool:
+        return (
+            request.headers.get("x-profile") == "1"
+            or request.query_params.get("profile") == "1"
+        )
+
+    @staticmethod
+    async def _authorize(request: Request) -> bool:
+        try:
+            token = await oauth2_scheme(request)
+            async with sessionmanager.session() as db:
+                user = await get_current_user(token, db)
+            get_current_admin_user(user)
+        except HTTPException:
+            return False
+        return True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        if not self._requested(request) or not await self._authorize(request):
+            await self.app(scope, receive, send)
+            return
+
+        if not profile_budget.acquire():
+            await self.app(scope, receive, self._with_headers(send, "rate-limited"))
+            return
+
+        profile_id = uuid.uuid4().hex
+        profiler = SamplingProfiler(
+            settings.PROFILE_INTERVAL_MS / 1000,
+            thread_id=threading.get_ident(),
+            max_duration=settings.PROFILE_MAX_SECONDS,
+        )
+        profiler.start()
+        try:
+            await self.app(scope, receive, self._with_headers(send, "1", profile_id))
+        finally:
+            profiler.stop()
+            profile_budget.release()
+            await asyncio.to_thread(
+                save_profile, settings.PROFILE_DIR, profile_id, profiler.folded()
+            )
+
+    @staticmethod
+    def _with_headers(send: Send, status: str, profile_id: str | None = None) -> Send:
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Profile"] = status
+                if profile_id is not None:
+                    headers["X-Profile-Id"] = profile_id
+            await send(message)
+
+        return send_wrapper
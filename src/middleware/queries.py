@@ -0,0 +1,39 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.conf.config import settings
+from src.database.instrumentation import track_queries
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI-проміжний шар для підрахунку SQL-запитів у межах HTTP-запиту.
+
+    Підраховує запити для виявлення N+1 (див. `N_PLUS_ONE_THRESHOLD`).
+    Лише в середовищі розробки (`ENV=development`) додає до відповіді
+    заголовки:
+    - X-DB-Queries: кількість запитів до бази даних;
+    - X-DB-Time: сумарний час запитів у мілісекундах.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(scope["path"]) as queries:
+            if settings.ENV != "development":
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(queries.count)
+                    headers["X-DB-Time"] = f"{queries.total_time * 1000:.2f}"
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -1,84 +1,522 @@
-from datetime import date, timedelta
-from typing import List
-from sqlalchemy import select, func, and_, or_
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import (
+    Text,
+    case,
+    cast,
+    delete,
+    extract,
+    insert,
+    literal_column,
+    select,
+    update,
+    func,
+    and_,
+    or_,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.conf.config import settings
 from src.database.models import Contact, User
 from src.schemas import ContactModel
 
+# Згенерована колонка повнотекстового пошуку (лише PostgreSQL, див.
+# CONTACT_SEARCH_VECTOR у моделях)
+SEARCH_VECTOR = literal_column("contacts.search_vector", TSVECTOR)
+# Мінімальна кількість цифр у запиті для пошуку за номером телефону
+MIN_PHONE_DIGITS = 3
+
 
 class ContactRepository:
     def __init__(self, session: AsyncSession):
         self.db = session
 
+    @staticmethod
+    def _select_contacts():
+        """
+        SELECT активних (не видалених) контактів для списків лише для читання.
+
+        З `DB_LEAN_READS` вибираються колонки таблиці замість ORM-сутностей:
+        рядки не потрапляють в identity map сесії і не відстежуються.
+        """
+        if settings.DB_LEAN_READS:
+            stmt = select(*Contact.__table__.columns)
+        else:
+            stmt = select(Contact)
+        return stmt.where(Contact.deleted_at.is_(None))
+
+    async def _fetch_contacts(self, stmt) -> List[Contact]:
+        result = await self.db.execute(stmt)
+        if settings.DB_LEAN_READS:
+            return result.all()
+        return result.scalars().all()
+
+    async def _next_change_version(self, user_id: int, delta: int = 0) -> int:
+        # Викликається до зміни контактів: UPDATE блокує рядок користувача до
+        # кінця транзакції, тож паралельні записи того самого користувача
+        # отримують версії в порядку фіксації. Версія (change_version
+        # змінених рядків) — курсор стрічки змін і ключ кешу статистики.
+        # Лічильник контактів змінюється в тій самій транзакції і не
+        # розходиться з даними. Без синхронізації сесії: відкат точки
+        # збереження не робить завантаженого користувача застарілим
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(
+                contacts_count=User.contacts_count + delta,
+                contacts_version=User.contacts_version + 1,
+            )
+            .returning(User.contacts_version)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one()
+
+    async def _change_contacts_count(self, user_id: int, delta: int) -> None:
+        # Для видалень кількість змінених рядків відома лише після UPDATE
+        await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(contacts_count=User.contacts_count + delta)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_contacts_count(self, user: User) -> int:
+        """
+        Отримати кількість активних контактів користувача з лічильника
+        `users.contacts_count` (пошук за первинним ключем замість COUNT(*)).
+        """
+        stmt = select(User.contacts_count).where(User.id == user.id)
+        return await self.db.scalar(stmt) or 0
+
+    async def get_contacts_counters(self, user: User) -> Row:
+        """
+        Отримати кількість активних контактів користувача та версію його
+        контактів одним запитом за первинним ключем.
+        """
+        stmt = select(User.contacts_count, User.contacts_version).where(
+            User.id == user.id
+        )
+        result = await self.db.execute(stmt)
+        return result.one()
+
+    async def get_contact_stats(self, user: User, since: List[datetime]) -> List[Row]:
+        """
+        Агрегувати активні контакти користувача за місяцем народження.
+
+        Для кожного місяця повертає рядок (month, total, added_0, added_1, ...),
+        де added_i — кількість контактів, створених після `since[i]`.
+        """
+        month = extract("month", Contact.birthday)
+        stmt = (
+            select(
+                month.label("month"),
+                func.count().label("total"),
+                *(
+                    func.sum(case((Contact.created_at >= moment, 1), else_=0)).label(
+                        f"added_{index}"
+                    )
+                    for index, moment in enumerate(since)
+                ),
+            )
+            .where(Contact.user_id == user.id, Contact.deleted_at.is_(None))
+            .group_by(month)
+        )
+        result = await self.db.execute(stmt)
+        return result.all()
+
     async def get_contacts(
-        self, name: str, surname: str, email: str, skip: int, limit: int, user: User
+        self,
+        name: str,
+        surname: str,
+        email: str,
+        phone: str,
+        skip: int,
+        limit: int,
+        user: User,
     ) -> List[Contact]:
         """
         Отримати список контактів користувача з можливістю фільтрації.
+
+        `phone` — нормалізовані цифри номера; контакти фільтруються за
+        префіксом `phone_normalized` через індекс ix_contacts_user_phone_normalized.
         """
         stmt = (
-            select(Contact)
-            .filter_by(user=user)
+            self._select_contacts()
+            .where(Contact.user_id == user.id)
             .where(Contact.name.contains(name))
             .where(Contact.surname.contains(surname))
             .where(Contact.email.contains(email))
-            .offset(skip)
-            .limit(limit)
         )
-        contacts = await self.db.execute(stmt)
-        return contacts.scalars().all()
+        if phone:
+            stmt = stmt.where(Contact.phone_normalized.startswith(phone))
+        return await self._fetch_contacts(stmt.offset(skip).limit(limit))
+
+    @staticmethod
+    def _fulltext_query(query: str):
+        """
+        tsquery для пошуку за префіксами слів запиту.
+
+        Слова розбирає сам PostgreSQL (`plainto_tsquery`), після чого кожна
+        лексема стає префіксною (`'ann' & 'lee'` -> `'ann':* & 'lee':*`).
+        Якщо запит містить цифри, додатково шукається номер телефону, що
+        починається з цих цифр.
+        """
+        words = cast(func.plainto_tsquery("simple", query), Text)
+        tsquery = func.to_tsquery(
+            "simple", func.regexp_replace(words, "'( |$)", "':*\\1", "g")
+        )
+        digits = re.sub(r"\D", "", query)
+        if len(digits) >= MIN_PHONE_DIGITS:
+            tsquery = tsquery.op("||")(func.to_tsquery("simple", f"{digits}:*"))
+        return tsquery
+
+    async def search_contacts(
+        self, query: str, skip: int, limit: int, user: User
+    ) -> List[Contact]:
+        """
+        Повнотекстовий пошук контактів користувача з ранжуванням.
+
+        У PostgreSQL використовується GIN-індекс за `search_vector` (ім'я,
+        прізвище, email, цифри телефону, info), результати впорядковані за
+        `ts_rank_cd`. На інших СУБД (SQLite у тестах) кожне слово запиту
+        шукається через LIKE у тих самих полях, а вище ставляться збіги в
+        імені чи прізвищі.
+        """
+        if not query.strip():
+            return []
+        if self.db.bind.dialect.name == "postgresql":
+            tsquery = self._fulltext_query(query)
+            stmt = (
+                self._select_contacts()
+                .where(Contact.user_id == user.id)
+                .where(SEARCH_VECTOR.op("@@")(tsquery))
+                .order_by(func.ts_rank_cd(SEARCH_VECTOR, tsquery).desc(), Contact.id)
+            )
+        else:
+            terms = query.split()
+            stmt = self._select_contacts().where(Contact.user_id == user.id)
+            for term in terms:
+                stmt = stmt.where(
+                    or_(
+                        *(
+                            field.icontains(term, autoescape=True)
+                            for field in (
+                                Contact.name,
+                                Contact.surname,
+                                Contact.email,
+                                Contact.phone,
+                                Contact.info,
+                            )
+                        )
+                    )
+                )
+            in_name = or_(
+                Contact.name.icontains(terms[0], autoescape=True),
+                Contact.surname.icontains(terms[0], autoescape=True),
+            )
+            stmt = stmt.order_by(case((in_name, 0), else_=1), Contact.id)
+        return await self._fetch_contacts(stmt.offset(skip).limit(limit))
 
     async def get_contact_by_id(self, contact_id: int, user: User) -> Contact | None:
         """
         Отримати контакт за ID, прив'язаний до конкретного користувача.
         """
-        stmt = select(Contact).filter_by(id=contact_id, user=user)
+        stmt = select(Contact).where(
+            Contact.id == contact_id,
+            Contact.user_id == user.id,
+            Contact.deleted_at.is_(None),
+        )
         contact = await self.db.execute(stmt)
         return contact.scalar_one_or_none()
 
-    async def create_contact(self, body: ContactModel, user: User) -> Contact:
+    async def create_contact(
+        self, body: ContactModel, user: User, phone_normalized: Optional[str] = None
+    ) -> Contact:
         """
         Створити новий контакт для користувача.
+
+        INSERT ... RETURNING повертає згенеровані базою даних значення
+        (id, created_at) без окремого SELECT. `phone_normalized` обчислює
+        сервіс (`normalize_phone`). Лічильник і версія контактів користувача
+        збільшуються в тій самій транзакції.
         """
-        contact = Contact(**body.model_dump(exclude_unset=True), user=user)
-        self.db.add(contact)
-        await self.db.commit()
-        await self.db.refresh(contact)
-        return contact
+        version = await self._next_change_version(user.id, 1)
+        stmt = (
+            insert(Contact)
+            .values(
+                **body.model_dump(exclude_unset=True),
+                phone_normalized=phone_normalized,
+                user_id=user.id,
+                change_version=version,
+            )
+            .returning(Contact)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one()
 
     async def update_contact(
-        self, contact_id: int, body: ContactModel, user: User
+        self,
+        contact_id: int,
+        body: ContactModel,
+        user: User,
+        phone_normalized: Optional[str] = None,
     ) -> Contact | None:
         """
-        Оновити існуючий контакт користувача.
+        Оновити існуючий контакт користувача одним запитом UPDATE ... RETURNING.
+
+        Версія контактів користувача збільшується в тій самій транзакції.
         """
-        contact = await self.get_contact_by_id(contact_id, user)
-        if contact:
-            for key, value in body.dict(exclude_unset=True).items():
-                setattr(contact, key, value)
-            await self.db.commit()
-            await self.db.refresh(contact)
-        return contact
+        version = await self._next_change_version(user.id)
+        stmt = (
+            update(Contact)
+            .where(
+                Contact.id == contact_id,
+                Contact.user_id == user.id,
+                Contact.deleted_at.is_(None),
+            )
+            .values(
+                **body.model_dump(exclude_unset=True),
+                phone_normalized=phone_normalized,
+                change_version=version,
+            )
+            .returning(Contact)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
 
     async def remove_contact(self, contact_id: int, user: User) -> Contact | None:
         """
-        Видалити контакт користувача за ID.
+        М'яко видалити контакт користувача за ID одним запитом UPDATE ... RETURNING.
+
+        Рядок лише позначається видаленим і зникає з усіх вибірок; фізично
+        його видаляє фоновий `SoftDeletePurger` після `SOFT_DELETE_RETENTION_SECONDS`.
+        Лічильник контактів користувача зменшується в тій самій транзакції.
         """
-        contact = await self.get_contact_by_id(contact_id, user)
-        if contact:
-            await self.db.delete(contact)
-            await self.db.commit()
+        version = await self._next_change_version(user.id)
+        stmt = (
+            update(Contact)
+            .where(
+                Contact.id == contact_id,
+                Contact.user_id == user.id,
+                Contact.deleted_at.is_(None),
+            )
+            .values(
+                deleted_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                change_version=version,
+            )
+            .returning(Contact)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one_or_none()
+        if contact is not None:
+            await self._change_contacts_count(user.id, -1)
         return contact
 
-    async def is_contact_exists(self, email: str, phone: str, user: User) -> bool:
+    async def get_contacts_by_ids(self, ids: List[int], user: User) -> List[Contact]:
         """
-        Перевірити, чи існує контакт з вказаним email або телефоном для користувача.
+        Отримати активні контакти користувача за списком ID одним запитом.
+
+        `populate_existing` оновлює об'єкти, що вже є в сесії (наприклад,
+        після пакетного UPDATE без синхронізації сесії).
         """
-        query = (
+        if not ids:
+            return []
+        stmt = (
             select(Contact)
-            .filter_by(user=user)
-            .where((Contact.email == email) | (Contact.phone == phone))
+            .where(
+                Contact.id.in_(ids),
+                Contact.user_id == user.id,
+                Contact.deleted_at.is_(None),
+            )
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def update_contacts(
+        self,
+        changes: Dict[int, ContactModel],
+        user: User,
+        phones_normalized: Optional[Dict[int, str]] = None,
+    ) -> None:
+        """
+        Оновити кілька контактів користувача пакетним UPDATE за первинним ключем.
+
+        Усі рядки надсилаються одним executemany; контакти інших користувачів
+        і видалені контакти не змінюються завдяки додатковій умові WHERE.
+        `phones_normalized` зіставляє ID контакту з нормалізованим телефоном.
+        """
+        phones_normalized = phones_normalized or {}
+        if not changes:
+            return
+        version = await self._next_change_version(user.id)
+        stmt = (
+            update(Contact)
+            .where(Contact.user_id == user.id, Contact.deleted_at.is_(None))
+            .execution_options(synchronize_session=None)
+        )
+        await self.db.execute(
+            stmt,
+            [
+                {
+                    "id": contact_id,
+                    **body.model_dump(exclude_unset=True),
+                    "phone_normalized": phones_normalized.get(contact_id),
+                    "change_version": version,
+                }
+                for contact_id, body in changes.items()
+            ],
+        )
+
+    async def remove_contacts(self, ids: List[int], user: User) -> List[Contact]:
+        """
+        М'яко видалити кілька контактів користувача одним UPDATE ... RETURNING.
+        """
+        if not ids:
+            return []
+        version = await self._next_change_version(user.id)
+        stmt = (
+            update(Contact)
+            .where(
+                Contact.id.in_(ids),
+                Contact.user_id == user.id,
+                Contact.deleted_at.is_(None),
+            )
+            .values(
+                deleted_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                change_version=version,
+            )
+            .returning(Contact)
+        )
+        result = await self.db.execute(stmt)
+        contacts = result.scalars().all()
+        if contacts:
+            await self._change_contacts_count(user.id, -len(contacts))
+        return contacts
+
+    async def get_duplicate_candidates(self, user: User) -> List[Row]:
+        """
+        Отримати поля, за якими шукаються дублікати, для всіх активних
+        контактів користувача.
+
+        Вибираються лише потрібні колонки без ORM-сутностей, тож навіть
+        100 тис. контактів завантажуються одним легким запитом.
+        """
+        stmt = select(
+            Contact.id,
+            Contact.name,
+            Contact.surname,
+            Contact.email,
+            Contact.phone_normalized,
+            Contact.birthday,
+        ).where(Contact.user_id == user.id, Contact.deleted_at.is_(None))
+        result = await self.db.execute(stmt)
+        return result.all()
+
+    async def get_changes(
+        self,
+        user: User,
+        after: Optional[Tuple[int, Optional[int]]],
+        limit: int,
+    ) -> List[Contact]:
+        """
+        Отримати контакти користувача, змінені після курсора `after`.
+
+        Рядки впорядковані за (change_version, id) і вибираються діапазоном
+        індексу `ix_contacts_user_changes`, тому вартість запиту залежить від
+        кількості змін, а не від кількості контактів. Видалені контакти
+        повертаються як tombstones; без курсора (перша синхронізація) — лише
+        активні контакти.
+
+        Аргументи:
+            user: власник контактів.
+            after: курсор (change_version, id) останньої отриманої зміни;
+                (change_version, None) — усі зміни з цією версією вже отримано;
+                None — перша синхронізація.
+            limit: максимальна кількість рядків.
+        """
+        stmt = select(Contact).where(Contact.user_id == user.id)
+        if after is None:
+            stmt = stmt.where(Contact.deleted_at.is_(None))
+        elif after[1] is None:
+            stmt = stmt.where(Contact.change_version > after[0])
+        else:
+            stmt = stmt.where(
+                tuple_(Contact.change_version, Contact.id) > tuple_(*after)
+            )
+        stmt = stmt.order_by(Contact.change_version, Contact.id).limit(limit)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def purge_deleted_contacts(self, deleted_before: datetime, limit: int) -> int:
+        """
+        Остаточно видалити до `limit` контактів, м'яко видалених раніше за `deleted_before`.
+
+        Пакет спершу вибирається окремим запитом, а DELETE обмежується
+        user_id його рядків, щоб PostgreSQL відсікав зайві HASH-розділи.
+
+        Повертає кількість видалених рядків.
+        """
+        result = await self.db.execute(
+            select(Contact.user_id, Contact.id)
+            .where(Contact.deleted_at < deleted_before)
+            .limit(limit)
+        )
+        rows = [tuple(row) for row in result.all()]
+        if not rows:
+            return 0
+        stmt = (
+            delete(Contact)
+            .where(
+                Contact.user_id.in_({user_id for user_id, _ in rows}),
+                tuple_(Contact.user_id, Contact.id).in_(rows),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount
+
+    async def purge_user_contacts(self, user_id: int, limit: int) -> int:
+        """
+        Остаточно видалити до `limit` контактів користувача (перед видаленням
+        самого користувача).
+
+        Повертає кількість видалених рядків.
+        """
+        batch = (
+            select(Contact.id)
+            .where(Contact.user_id == user_id)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        stmt = (
+            delete(Contact)
+            .where(Contact.user_id == user_id, Contact.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount
+
+    async def is_contact_exists(
+        self, email: str, phone_normalized: Optional[str], user: User
+    ) -> bool:
+        """
+        Перевірити, чи існує контакт з вказаним email або нормалізованим
+        телефоном для користувача. Якщо `phone_normalized` порожній,
+        перевіряється лише email.
+        """
+        duplicate = Contact.email == email
+        if phone_normalized:
+            duplicate = duplicate | (Contact.phone_normalized == phone_normalized)
+        query = (
+            select(Contact.id)
+            .where(Contact.user_id == user.id, Contact.deleted_at.is_(None))
+            .where(duplicate)
+            .limit(1)
         )
         result = await self.db.execute(query)
         return result.scalars().first() is not None
@@ -91,8 +529,8 @@ class ContactRepository:
         end_date = today + timedelta(days=days)
 
         query = (
-            select(Contact)
-            .filter_by(user=user)
+            self._select_contacts()
+            .where(Contact.user_id == user.id)
             .where(
                 or_(
                     func.date_part("day", Contact.birthday).between(
@@ -112,5 +550,4 @@ class ContactRepository:
             .order_by(func.date_part("day", Contact.birthday).asc())
         )
 
-        result = await self.db.execute(query)
-        return result.scalars().all()
\ No newline at end of file
+        return await self._fetch_contacts(query)
@@ -0,0 +1,86 @@
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import RefreshToken
+
+
+class RefreshTokenRepository:
+    def __init__(self, session: AsyncSession):
+        self.db = session
+
+    async def create_token(
+        self, user_id: int, token_hash: str, family_id: str, expires_at: datetime
+    ) -> RefreshToken:
+        """
+        Зберегти хеш нового refresh-токена користувача.
+        """
+        token = RefreshToken(
+            user_id=user_id,
+            token_hash=token_hash,
+            family_id=family_id,
+            expires_at=expires_at,
+        )
+        self.db.add(token)
+        await self.db.flush()
+        return token
+
+    async def consume_token(
+        self, token_hash: str, now: datetime, user_id: int | None = None
+    ) -> tuple[int, str] | None:
+        """
+        Атомарно відкликати дійсний refresh-токен і повернути ID його
+        користувача та сім'ї.
+
+        Один UPDATE ... RETURNING гарантує, що при паралельних запитах
+        токен буде використано лише один раз. Якщо задано `user_id`,
+        відкликається лише токен цього користувача.
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(revoked_at=now)
+            .returning(RefreshToken.user_id, RefreshToken.family_id)
+        )
+        if user_id is not None:
+            stmt = stmt.where(RefreshToken.user_id == user_id)
+        result = await self.db.execute(stmt)
+        row = result.one_or_none()
+        return None if row is None else tuple(row)
+
+    async def get_token(self, token_hash: str) -> RefreshToken | None:
+        """
+        Отримати refresh-токен за хешем (у т.ч. відкликаний або прострочений).
+        """
+        stmt = select(RefreshToken).filter_by(token_hash=token_hash)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def revoke_family(self, family_id: str, now: datetime) -> None:
+        """
+        Відкликати всі активні refresh-токени однієї сім'ї.
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None)
+            )
+            .values(revoked_at=now)
+        )
+        await self.db.execute(stmt)
+
+    async def revoke_user_tokens(self, user_id: int, now: datetime) -> None:
+        """
+        Відкликати всі активні refresh-токени користувача.
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        await self.db.execute(stmt)
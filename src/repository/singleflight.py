@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Об'єднання паралельних однакових запитів (single-flight).
+
+    Поки запит з певним ключем виконується, інші виклики з тим самим ключем
+    не запускають власний запит, а чекають на результат першого. Працює в
+    межах одного процесу та одного циклу подій.
+
+    Атрибути:
+    - calls (int): Загальна кількість викликів.
+    - coalesced (int): Кількість викликів, що отримали результат чужого запиту.
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Кількість запитів, що виконуються зараз.
+        """
+        return len(self._flights)
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """
+        Виконує `fn` або приєднується до вже запущеного виклику з тим самим ключем.
+
+        Аргументи:
+            key: Ключ запиту.
+            fn: Функція, що виконує запит.
+
+        Повертає:
+            tuple: Результат і ознаку того, що результат отримано від іншого виклику.
+        """
+        self.calls += 1
+        future = self._flights.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # Скасовано сам виклик, а не запит, до якого він приєднався
+                if not future.cancelled():
+                    raise
+            # Запит-лідер скасовано: виконуємо власний запит
+            return await fn(), False
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights[key] = future
+        try:
+            result = await fn()
+        except Exception as e:
+            future.set_exception(e)
+            # Позначаємо виняток отриманим, якщо очікувачів немає
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._flights[key]
@@ -1,79 +1,250 @@
-from sqlalchemy import select
+from datetime import datetime, timezone
+from typing import List
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from src.database.db import savepoint
 from src.database.models import User
+from src.repository.singleflight import SingleFlight
 from src.schemas import UserCreate
 
+# Відповідність унікальних індексів таблиці users полям користувача
+USER_UNIQUE_CONSTRAINTS = {
+    "uq_users_email": "email",
+    "uq_users_username": "username",
+}
+
+
+class UserConflictError(Exception):
+    """
+    Користувач з таким самим значенням унікального поля вже існує.
+
+    Атрибути:
+    - field (str): Назва поля, що спричинило конфлікт ("email" або "username").
+    """
+
+    def __init__(self, field: str):
+        super().__init__(field)
+        self.field = field
+
+
+def _conflict_field(exc: IntegrityError) -> str | None:
+    """
+    Визначити поле, унікальне обмеження якого порушено.
+
+    Для PostgreSQL використовується назва обмеження з помилки драйвера,
+    для SQLite — текст повідомлення про помилку.
+    """
+    orig = exc.orig
+    for error in (orig, getattr(orig, "__cause__", None)):
+        constraint = getattr(error, "constraint_name", None)
+        if constraint in USER_UNIQUE_CONSTRAINTS:
+            return USER_UNIQUE_CONSTRAINTS[constraint]
+    message = str(orig)
+    for field in USER_UNIQUE_CONSTRAINTS.values():
+        if f"users.{field}" in message:
+            return field
+    return None
+
 
 class UserRepository:
+    # Спільний для всіх сесій процесу: об'єднує паралельні однакові запити
+    # користувача при перевірці токенів (лише читання, див. get_user_for_auth)
+    flights = SingleFlight()
+
     def __init__(self, session: AsyncSession):
         self.db = session
 
+    async def _get_user_shared(self, key: tuple, stmt) -> User | None:
+        """
+        Виконати запит користувача через single-flight.
+
+        Виклик, що приєднався до чужого запиту, отримує копію рядка,
+        прикріплену до власної сесії, а не спільний ORM-об'єкт. Копія не
+        перечитується з бази даних, тож годиться лише для читання.
+        """
+
+        async def query():
+            result = await self.db.execute(stmt)
+            user = result.scalar_one_or_none()
+            snapshot = None
+            if user is not None:
+                snapshot = {
+                    attr.key: getattr(user, attr.key)
+                    for attr in User.__mapper__.column_attrs
+                }
+            return user, snapshot
+
+        (user, snapshot), shared = await self.flights.do(key, query)
+        if not shared or snapshot is None:
+            return user
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return await self.db.merge(user, load=False)
+
     async def get_user_by_id(self, user_id: int) -> User | None:
         """
         Отримати користувача за його ID.
         """
-        stmt = select(User).filter_by(id=user_id)
+        stmt = select(User).filter_by(id=user_id, deleted_at=None)
         user = await self.db.execute(stmt)
         return user.scalar_one_or_none()
 
+    async def get_token_version(self, user_id: int) -> int | None:
+        """
+        Отримати поточну версію токенів користувача.
+        """
+        stmt = select(User.token_version).filter_by(id=user_id, deleted_at=None)
+        version = await self.db.execute(stmt)
+        return version.scalar_one_or_none()
+
     async def get_user_by_username(self, username: str) -> User | None:
         """
         Отримати користувача за його ім'ям користувача.
         """
-        stmt = select(User).filter_by(username=username)
+        stmt = select(User).filter_by(username=username, deleted_at=None)
         user = await self.db.execute(stmt)
         return user.scalar_one_or_none()
 
+    async def get_user_for_auth(self, username: str) -> User | None:
+        """
+        Отримати користувача для перевірки токена доступу.
+
+        Паралельні однакові запити об'єднуються через single-flight, тому
+        результат призначений лише для читання; для змін користувача його
+        слід завантажити знову (наприклад, через `get_user_by_id`).
+        """
+        stmt = select(User).filter_by(username=username, deleted_at=None)
+        return await self._get_user_shared(("username", username), stmt)
+
     async def get_user_by_email(self, email: str) -> User | None:
         """
         Отримати користувача за його email.
         """
-        stmt = select(User).filter_by(email=email)
+        stmt = select(User).filter_by(email=email, deleted_at=None)
         user = await self.db.execute(stmt)
         return user.scalar_one_or_none()
 
     async def create_user(self, body: UserCreate, avatar: str = None) -> User:
         """
-        Створити нового користувача.
+        Створити нового користувача одним запитом INSERT ... RETURNING.
+
+        Перевірка унікальності email та імені покладена на обмеження бази
+        даних, тому окремі запити перед вставкою не потрібні.
+
+        Викидає:
+            UserConflictError: Якщо користувач з таким email або іменем вже існує.
         """
-        user = User(
-            **body.model_dump(exclude_unset=True, exclude={"password"}),
-            hashed_password=body.password,
-            avatar=avatar,
+        stmt = (
+            insert(User)
+            .values(
+                **body.model_dump(exclude_unset=True, exclude={"password"}),
+                hashed_password=body.password,
+                avatar=avatar,
+            )
+            .returning(User)
         )
-        self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        try:
+            # Порушення унікальності відкочує лише цю вставку, а не весь запит
+            async with savepoint(self.db):
+                result = await self.db.execute(stmt)
+                user = result.scalar_one()
+        except IntegrityError as e:
+            field = _conflict_field(e)
+            if field is None:
+                raise
+            raise UserConflictError(field) from e
         return user
 
     async def confirmed_email(self, email: str) -> None:
         """
         Підтвердити email користувача.
         """
-        user = await self.get_user_by_email(email)
-        if user:
-            user.confirmed = True
-            await self.db.commit()
+        stmt = (
+            update(User)
+            .where(User.email == email, User.deleted_at.is_(None))
+            .values(confirmed=True)
+        )
+        await self.db.execute(stmt)
 
     async def update_avatar_url(self, email: str, url: str) -> User:
         """
         Оновити URL аватару користувача.
         """
-        user = await self.get_user_by_email(email)
-        if user:
-            user.avatar = url
-            await self.db.commit()
-            await self.db.refresh(user)
-        return user
+        stmt = (
+            update(User)
+            .where(User.email == email, User.deleted_at.is_(None))
+            .values(avatar=url)
+            .returning(User)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
 
     async def reset_password(self, user_id: int, password: str) -> User:
         """
-        Скинути пароль користувача.
+        Скинути пароль користувача і відкликати всі його токени.
+        """
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(hashed_password=password, token_version=User.token_version + 1)
+            .returning(User)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def update_password_hash(self, user_id: int, password: str) -> None:
+        """
+        Оновити хеш пароля користувача без відкликання токенів.
+        """
+        stmt = update(User).where(User.id == user_id).values(hashed_password=password)
+        await self.db.execute(stmt)
+
+    async def soft_delete_user(self, user_id: int) -> int | None:
+        """
+        Позначити користувача видаленим і відкликати всі його токени.
+
+        Контакти користувача не змінюються: вони недоступні разом з обліковим
+        записом, а фізично видаляються фоновим `SoftDeletePurger` пакетами.
+
+        Повертає нову версію токенів або None, якщо користувача не знайдено.
+        """
+        stmt = (
+            update(User)
+            .where(User.id == user_id, User.deleted_at.is_(None))
+            .values(
+                deleted_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                token_version=User.token_version + 1,
+            )
+            .returning(User.token_version)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_deleted_user_ids(
+        self, deleted_before: datetime, limit: int
+    ) -> List[int]:
+        """
+        Отримати ID користувачів, видалених раніше за `deleted_before`.
+        """
+        stmt = (
+            select(User.id)
+            .where(User.deleted_at < deleted_before)
+            .order_by(User.deleted_at)
+            .limit(limit)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def purge_user(self, user_id: int) -> None:
+        """
+        Остаточно видалити м'яко видаленого користувача.
+
+        Контакти користувача мають бути попередньо видалені пакетами, інакше
+        каскадне видалення зробить це в одній довгій транзакції.
         """
-        user = await self.get_user_by_id(user_id)
-        if user:
-            user.hashed_password = password
-            await self.db.commit()
-            await self.db.refresh(user)
-        return user
\ No newline at end of file
+        stmt = delete(User).where(User.id == user_id, User.deleted_at.isnot(None))
+        await self.db.execute(stmt)
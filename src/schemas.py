@@ -1,6 +1,14 @@
 from datetime import date, datetime
-from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
+from enum import Enum
+from typing import Dict, List, Optional
+from pydantic import (
+    BaseModel,
+    Field,
+    ConfigDict,
+    EmailStr,
+    field_validator,
+    model_validator,
+)
 
 from src.database.models import UserRole
 
@@ -13,7 +21,7 @@ class ContactModel(BaseModel):
         name: ім'я контакту (мінімум 2 символи, максимум 50 символів)
         surname: прізвище контакту (мінімум 2 символи, максимум 50 символів)
         email: електронна пошта контакту (мінімум 7 символів, максимум 100 символів)
-        phone: номер телефону контакту (мінімум 7 символів, максимум 20 символів)
+        phone: номер телефону контакту (мінімум 7 символів, максимум 20 символів, має містити цифри)
         birthday: дата народження контакту
         info: додаткові відомості про контакт (необов'язково)
     """
@@ -25,6 +33,13 @@ class ContactModel(BaseModel):
     birthday: date
     info: Optional[str] = None
 
+    @field_validator("phone")
+    @classmethod
+    def check_phone_has_digits(cls, phone: str) -> str:
+        if not any(char.isdigit() for char in phone):
+            raise ValueError("Phone number must contain digits")
+        return phone
+
 
 class ContactResponse(ContactModel):
     """
@@ -42,6 +57,192 @@ class ContactResponse(ContactModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Максимальна кількість операцій в одному пакетному запиті
+MAX_BATCH_OPERATIONS = 500
+
+
+class ContactBatchOp(str, Enum):
+    """
+    Тип операції в пакетному запиті до контактів.
+    """
+
+    GET = "get"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class ContactBatchItem(BaseModel):
+    """
+    Одна операція пакетного запиту.
+
+    Атрибути:
+        op: тип операції (get, update або delete)
+        id: ідентифікатор контакту
+        data: нові дані контакту (обов'язкові лише для update)
+    """
+
+    op: ContactBatchOp
+    id: int
+    data: Optional[ContactModel] = None
+
+    @model_validator(mode="after")
+    def check_data(self):
+        if self.op == ContactBatchOp.UPDATE and self.data is None:
+            raise ValueError("'data' is required for update operation")
+        return self
+
+
+class ContactBatchRequest(BaseModel):
+    """
+    Пакетний запит до контактів.
+
+    Атрибути:
+        operations: список операцій (кожен контакт може зустрічатися лише один раз)
+    """
+
+    operations: List[ContactBatchItem] = Field(
+        min_length=1, max_length=MAX_BATCH_OPERATIONS
+    )
+
+    @model_validator(mode="after")
+    def check_unique_ids(self):
+        ids = [item.id for item in self.operations]
+        if len(ids) != len(set(ids)):
+            raise ValueError("Each contact id may appear only once per batch")
+        return self
+
+
+class ContactBatchResult(BaseModel):
+    """
+    Результат однієї операції пакетного запиту.
+
+    Атрибути:
+        op: тип операції
+        id: ідентифікатор контакту
+        status: HTTP-статус операції (200, 404 або 409)
+        contact: дані контакту (для успішних операцій)
+        detail: опис помилки (для неуспішних операцій)
+    """
+
+    op: ContactBatchOp
+    id: int
+    status: int
+    contact: Optional[ContactResponse] = None
+    detail: Optional[str] = None
+
+
+class ContactChange(BaseModel):
+    """
+    Зміна контакту у стрічці синхронізації.
+
+    Атрибути:
+        id: ідентифікатор контакту
+        deleted: чи видалено контакт (tombstone)
+        updated_at: час зміни
+        contact: актуальні дані контакту (відсутні для видалених)
+    """
+
+    id: int
+    deleted: bool
+    updated_at: datetime
+    contact: Optional[ContactResponse] = None
+
+
+class ContactChanges(BaseModel):
+    """
+    Сторінка стрічки змін контактів.
+
+    Атрибути:
+        changes: зміни, впорядковані за часом зміни
+        next_token: токен для наступного запиту (`since`)
+        has_more: чи є ще зміни, які можна отримати одразу
+    """
+
+    changes: List[ContactChange]
+    next_token: str
+    has_more: bool
+
+
+class ContactStats(BaseModel):
+    """
+    Статистика контактів користувача.
+
+    Атрибути:
+        total: кількість активних контактів
+        by_birth_month: кількість контактів за місяцем народження (1-12)
+        added_last_7_days: кількість контактів, доданих за останні 7 днів
+        added_last_30_days: кількість контактів, доданих за останні 30 днів
+        generated_at: час обчислення статистики за місяцями та нещодавно доданими
+    """
+
+    total: int
+    by_birth_month: Dict[int, int]
+    added_last_7_days: int
+    added_last_30_days: int
+    generated_at: datetime
+
+
+class DuplicatePair(BaseModel):
+    """
+    Пара контактів, схожих на дублікати.
+
+    Атрибути:
+        first_id: ідентифікатор першого контакту (менший)
+        second_id: ідентифікатор другого контакту
+        score: оцінка схожості від 0 до 1
+        reasons: ознаки, що збіглися (email, email_local, phone, name, birthday)
+    """
+
+    first_id: int
+    second_id: int
+    score: float
+    reasons: List[str]
+
+
+class DuplicateGroup(BaseModel):
+    """
+    Група контактів, пов'язаних парами-дублікатами.
+
+    Атрибути:
+        contact_ids: ідентифікатори контактів групи
+        pairs: пари, що об'єднали контакти в групу
+    """
+
+    contact_ids: List[int]
+    pairs: List[DuplicatePair]
+
+
+class DuplicateScanStatus(str, Enum):
+    """
+    Стан пошуку дублікатів.
+    """
+
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class DuplicateReport(BaseModel):
+    """
+    Результат пошуку дублікатів контактів користувача.
+
+    Атрибути:
+        status: стан пошуку
+        started_at: час запуску пошуку
+        finished_at: час завершення пошуку (необов'язково)
+        contacts_scanned: кількість перевірених контактів
+        comparisons: кількість порівняних пар-кандидатів
+        groups: знайдені групи дублікатів, найбільші першими
+    """
+
+    status: DuplicateScanStatus
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    contacts_scanned: int = 0
+    comparisons: int = 0
+    groups: List[DuplicateGroup] = []
+
+
 class User(BaseModel):
     """
     Модель для представлення користувача.
@@ -85,13 +286,26 @@ class Token(BaseModel):
 
     Атрибути:
         access_token: токен доступу
+        refresh_token: токен для оновлення токену доступу
         token_type: тип токену (наприклад, Bearer)
     """
 
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str
 
 
+class RefreshTokenRequest(BaseModel):
+    """
+    Модель для оновлення токену доступу або виходу з системи.
+
+    Атрибут:
+        refresh_token: refresh-токен, отриманий під час входу
+    """
+
+    refresh_token: str
+
+
 class RequestEmail(BaseModel):
     """
     Модель для запиту електронної пошти для відновлення паролю.
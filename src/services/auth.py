@@ -1,36 +1,160 @@
+import asyncio
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from aiocache import cached
 from fastapi import Depends, HTTPException, status
+from passlib import hash as passlib_hash
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import JWTError, jwt
 
 from src.database.db import get_db
 from src.database.models import User, UserRole
 from src.conf.config import settings
+from src.services.tokens import InvalidTokenError, TokenVerifier, get_backend
+from src.services.revocation import revoked_tokens
+from src.services.token_versions import token_versions
 from src.services.users import UserService
 
 
 class Hash:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    """
+    Хешування паролів з налаштовуваними параметрами.
+
+    Схема ("bcrypt" або "argon2") і її вартість задаються в `Settings` і
+    однакові для всіх процесів, тож процеси не перехешовують паролі один
+    одного. Контекст створюється під час першого використання або явним
+    викликом `configure` при старті застосунку. Хеші, створені зі старими
+    параметрами чи іншою схемою, залишаються дійсними й прозоро
+    перехешовуються під час входу (див. `needs_update`).
+    """
+
+    pwd_context: Optional[CryptContext] = None
+
+    # Окремий пул потоків, щоб bcrypt не блокував цикл подій
+    executor = ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+    )
+
+    # Межі підбору вартості bcrypt (див. `calibrate_bcrypt_rounds`)
+    BCRYPT_CALIBRATION_RANGE = (10, 16)
+
+    @classmethod
+    def configure(
+        cls,
+        scheme: Optional[str] = None,
+        bcrypt_rounds: Optional[int] = None,
+    ) -> CryptContext:
+        """
+        Створює контекст хешування з параметрів налаштувань.
+
+        Аргументи:
+            scheme: Основна схема хешування (за замовчуванням з налаштувань).
+            bcrypt_rounds: Вартість bcrypt (за замовчуванням з налаштувань).
+
+        Викидає:
+            RuntimeError: Якщо обрано argon2, а пакет argon2-cffi не встановлено.
+        """
+        scheme = scheme or settings.PASSWORD_HASH_SCHEME
+        if bcrypt_rounds is None:
+            bcrypt_rounds = settings.BCRYPT_ROUNDS
+
+        argon2_available = passlib_hash.argon2.has_backend()
+        if scheme == "argon2" and not argon2_available:
+            raise RuntimeError(
+                "PASSWORD_HASH_SCHEME=argon2 потребує встановленого пакета argon2-cffi"
+            )
+        schemes = [scheme] + [
+            name
+            for name in ("bcrypt", "argon2")
+            if name != scheme and (name != "argon2" or argon2_available)
+        ]
+        cls.pwd_context = CryptContext(
+            schemes=schemes,
+            deprecated="auto",
+            bcrypt__rounds=bcrypt_rounds,
+            bcrypt__min_rounds=bcrypt_rounds,
+            argon2__type="ID",
+            argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+            argon2__rounds=settings.ARGON2_TIME_COST,
+            argon2__parallelism=settings.ARGON2_PARALLELISM,
+        )
+        return cls.pwd_context
+
+    @classmethod
+    def calibrate_bcrypt_rounds(cls, target_ms: int) -> int:
+        """
+        Підбирає найбільшу вартість bcrypt, за якої хешування триває не довше
+        за `target_ms` мілісекунд на поточному обладнанні.
+
+        Виконується офлайн (`python -m benchmarks.bench_password_hash
+        --target-ms 250`), а результат зберігається в `BCRYPT_ROUNDS`.
+        """
+        low, high = cls.BCRYPT_CALIBRATION_RANGE
+        start = time.perf_counter()
+        passlib_hash.bcrypt.using(rounds=low).hash("calibration")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        rounds = low
+        # Кожен додатковий раунд подвоює час хешування
+        while rounds < high and elapsed_ms * 2 <= target_ms:
+            rounds += 1
+            elapsed_ms *= 2
+        return rounds
+
+    @property
+    def context(self) -> CryptContext:
+        return self.pwd_context or self.configure()
 
     def verify_password(self, plain_password, hashed_password) -> bool:
         """
         Перевіряє, чи співпадає відкритий пароль з захешованим.
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return self.context.verify(plain_password, hashed_password)
+
+    def needs_update(self, hashed_password) -> bool:
+        """
+        Перевіряє, чи створено хеш з застарілими параметрами чи іншою схемою.
+        """
+        return self.context.needs_update(hashed_password)
 
     def get_password_hash(self, password: str) -> str:
         """
         Генерує хеш для пароля.
         """
-        return self.pwd_context.hash(password)
+        return self.context.hash(password)
+
+    async def verify_password_async(self, plain_password, hashed_password) -> bool:
+        """
+        Те саме, що `verify_password`, але виконується в пулі потоків хешування.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self.verify_password, plain_password, hashed_password
+        )
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """
+        Те саме, що `get_password_hash`, але виконується в пулі потоків хешування.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self.get_password_hash, password
+        )
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+token_verifier = TokenVerifier(
+    get_backend(settings.JWT_BACKEND),
+    settings.JWT_SECRET,
+    settings.JWT_ALGORITHM,
+    max_size=settings.JWT_CACHE_SIZE,
+)
+
 
 async def create_access_token(data: dict, expires_delta: Optional[int] = None) -> str:
     """
@@ -44,12 +168,73 @@ async def create_access_token(data: dict, expires_delta: Optional[int] = None) -
             seconds=settings.JWT_EXPIRATION_SECONDS
         )
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM
-    )
+    encoded_jwt = token_verifier.encode(to_encode)
     return encoded_jwt
 
 
+# Версія набору claims у stateless-токенах доступу
+CLAIMS_VERSION = 1
+
+
+def build_access_claims(user: User) -> dict:
+    """
+    Формує claims токена доступу для користувача.
+
+    Кожен токен отримує унікальний `jti`, за яким його можна відкликати.
+    Якщо увімкнено `JWT_STATELESS_CLAIMS`, токен додатково містить id, роль,
+    email та версію токенів користувача, що дозволяє автентифікувати запити
+    без звернення до бази даних.
+    """
+    claims = {"sub": user.username, "jti": uuid.uuid4().hex}
+    if settings.JWT_STATELESS_CLAIMS:
+        claims.update(
+            {
+                "cv": CLAIMS_VERSION,
+                "uid": user.id,
+                "role": UserRole(user.role).value,
+                "email": user.email,
+                "tv": user.token_version or 0,
+            }
+        )
+    return claims
+
+
+async def get_user_from_claims(payload: dict, db: AsyncSession) -> User | None:
+    """
+    Відновлює користувача з claims stateless-токена.
+
+    Перевіряє версію токена через кеш версій, тому після скидання пароля або
+    відкликання токенів старі токени одразу стають недійсними. Повертає
+    об'єкт User, не прив'язаний до сесії бази даних, або None, якщо токен
+    відкликано.
+    """
+    user_id = payload["uid"]
+    user_service = UserService(db)
+    version = await token_versions.get(user_id, user_service.get_token_version)
+    if version is None or version != payload.get("tv"):
+        return None
+    return User(
+        id=user_id,
+        username=payload["sub"],
+        email=payload.get("email"),
+        role=UserRole(payload["role"]),
+        token_version=version,
+    )
+
+
+async def revoke_access_token(token: str) -> None:
+    """
+    Відкликає токен доступу до закінчення терміну його дії.
+    """
+    try:
+        payload = token_verifier.decode(token)
+    except InvalidTokenError:
+        return
+    jti = payload.get("jti")
+    if jti:
+        await revoked_tokens.revoke(jti, int(payload["exp"] - time.time()))
+
+
 def cache_key_builder(func, args, kwargs) -> str:
     """
     Генерує ключ для кешування за допомогою імені користувача.
@@ -62,7 +247,6 @@ async def get_user_from_db(username: str, db: AsyncSession) -> User:
     """
     Отримує користувача з бази даних, використовуючи кешування.
     """
-    print("NOT CACHED USER")
     user_service = UserService(db)
     user = await user_service.get_user_by_username(username)
 
@@ -82,21 +266,48 @@ async def get_current_user(
     )
 
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-        )
-        username = payload["sub"]
-        if username is None:
-            raise credentials_exception
-    except JWTError as e:
+        payload = token_verifier.decode(token)
+    except InvalidTokenError:
         raise credentials_exception
-    user_service = UserService(db)
-    user = await user_service.get_user_by_username(username)
+    username = payload.get("sub")
+    if username is None:
+        raise credentials_exception
+    jti = payload.get("jti")
+    if jti and await revoked_tokens.is_revoked(jti):
+        raise credentials_exception
+    if settings.JWT_STATELESS_CLAIMS and payload.get("cv") == CLAIMS_VERSION:
+        user = await get_user_from_claims(payload, db)
+    else:
+        user_service = UserService(db)
+        user = await user_service.get_user_for_auth(username)
     if user is None:
         raise credentials_exception
     return user
 
 
+async def get_current_user_profile(
+    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Повертає повний профіль поточного користувача з бази даних.
+
+    Користувач зі stateless-токена містить лише дані з claims, тому для
+    ендпоінтів, яким потрібні всі поля (наприклад, аватар), він довантажується
+    з бази даних.
+    """
+    if not inspect(current_user).transient:
+        return current_user
+    user_service = UserService(db)
+    user = await user_service.get_user_by_id(current_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
 def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
     """
     Перевіряє, чи є поточний користувач адміністратором.
@@ -111,9 +322,11 @@ def create_email_token(data: dict) -> str:
     Створює токен для перевірки електронної пошти.
     """
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(days=7)
+    expire = datetime.now(timezone.utc) + timedelta(
+        seconds=settings.CONFIRM_TOKEN_EXPIRATION_SECONDS
+    )
     to_encode.update({"iat": datetime.now(timezone.utc), "exp": expire})
-    token = jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+    token = token_verifier.encode(to_encode)
     return token
 
 
@@ -121,31 +334,26 @@ async def get_email_from_token(token: str) -> str:
     """
     Отримує email з токену для підтвердження електронної пошти.
     """
-    try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-        )
-        email = payload["sub"]
-        return email
-    except JWTError as e:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Неправильний токен для перевірки електронної пошти",
-        )
+    payload = _decode_token(token, "Неправильний токен для перевірки електронної пошти")
+    return payload.get("sub")
 
 
 async def get_password_from_token(token: str) -> str:
     """
     Отримує пароль з токену для скидання пароля.
     """
+    payload = _decode_token(token, "Wrong token")
+    return payload.get("password")
+
+
+def _decode_token(token: str, detail: str) -> dict:
+    """
+    Перевіряє токен з листа та повертає його claims або помилку 422.
+    """
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-        )
-        password = payload["password"]
-        return password
-    except JWTError as e:
+        return token_verifier.decode(token)
+    except InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Wrong token",
-        )
\ No newline at end of file
+            detail=detail,
+        )
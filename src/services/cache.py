@@ -1,15 +1,26 @@
 from aiocache import caches
 
+from src.conf.config import settings
+
+if settings.CACHE_BACKEND == "redis":
+    cache_config = {
+        "cache": "aiocache.RedisCache",  # Тип кешу - Redis
+        "endpoint": settings.REDIS_HOST,  # Адреса Redis сервера
+        "port": settings.REDIS_PORT,  # Порт Redis сервера
+        "timeout": 10,  # Час очікування на відповідь
+    }
+else:
+    cache_config = {
+        "cache": "aiocache.SimpleMemoryCache",  # Кеш у пам'яті процесу
+    }
+
 caches.set_config(
     {
         "default": {
-            "cache": "aiocache.RedisCache",  # Тип кешу - Redis
-            "endpoint": "localhost",  # Адреса Redis сервера
-            "port": 6379,  # Порт Redis сервера
-            "timeout": 10,  # Час очікування на відповідь
+            **cache_config,
             "serializer": {
                 "class": "aiocache.serializers.PickleSerializer"
             },  # Сералізатор для кешування даних
         }
     }
-)
\ No newline at end of file
+)
@@ -1,11 +1,94 @@
-from typing import List
+import base64
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from aiocache import caches
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.openapi.models import Contact
 
+import src.services.cache  # noqa: F401  (реєструє конфігурацію кешу)
+from src.conf.config import settings
+from src.database.db import savepoint
 from src.database.models import User
 from src.repository.contacts import ContactRepository
-from src.schemas import ContactModel
+from src.schemas import (
+    ContactBatchItem,
+    ContactBatchOp,
+    ContactBatchResult,
+    ContactChange,
+    ContactChanges,
+    ContactModel,
+    ContactResponse,
+    ContactStats,
+)
+
+
+def normalize_phone(phone: str, country_code: Optional[str] = None) -> Optional[str]:
+    """
+    Нормалізує номер телефону до цифр у форматі E.164 без "+".
+
+    Усі символи, крім цифр, відкидаються. Номер з "+" вважається
+    міжнародним, префікс "00" відкидається, а національний номер з ведучим
+    0 отримує код країни (`PHONE_DEFAULT_COUNTRY_CODE`). Так "+380 50 123-45-67",
+    "00380501234567" і "050 123 45 67" дають "380501234567".
+
+    Аргументи:
+        phone: номер телефону у довільному форматі.
+        country_code: код країни для національних номерів (за замовчуванням з налаштувань).
+
+    Повертає:
+        Рядок цифр або None, якщо номер не містить цифр: такі номери
+        зберігаються як NULL і не вважаються дублікатами один одного.
+    """
+    digits = re.sub(r"\D", "", phone)
+    if not digits:
+        return None
+    if phone.lstrip().startswith("+"):
+        return digits
+    if digits.startswith("00"):
+        return digits[2:]
+    if digits.startswith("0"):
+        return (country_code or settings.PHONE_DEFAULT_COUNTRY_CODE) + digits[1:]
+    return digits
+
+
+def encode_change_token(
+    version: int, contact_id: Optional[int], issued_at: datetime
+) -> str:
+    """
+    Кодує курсор стрічки змін (change_version, id) і час його видачі у
+    непрозорий токен. `contact_id` None означає, що всі зміни з версією
+    `version` уже отримано.
+    """
+    raw = (
+        f"{version}|{'' if contact_id is None else contact_id}|{issued_at.isoformat()}"
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_change_token(token: str) -> Tuple[int, Optional[int], datetime]:
+    """
+    Декодує токен стрічки змін.
+
+    Токени старого формату (курсор за updated_at) повертаються з часом
+    видачі `datetime.min`, тож вважаються застарілими.
+
+    Викидає:
+        ValueError, якщо токен пошкоджений.
+    """
+    raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+    parts = raw.split("|")
+    if len(parts) == 2:
+        datetime.fromisoformat(parts[0])
+        return 0, int(parts[1]), datetime.min
+    version, contact_id, issued_at = parts
+    return (
+        int(version),
+        int(contact_id) if contact_id else None,
+        datetime.fromisoformat(issued_at),
+    )
 
 
 class ContactService:
@@ -20,13 +103,16 @@ class ContactService:
         Аргументи:
             db: підключення до асинхронної сесії бази даних.
         """
+        self.db = db
         self.repository = ContactRepository(db)
 
     async def create_contact(self, body: ContactModel, user: User) -> Contact:
         """
         Створює новий контакт.
 
-        Перевіряє, чи існує контакт з таким email або номером телефону. Якщо такий контакт існує, викликає помилку.
+        Перевіряє, чи існує контакт з таким email або номером телефону (з урахуванням
+        нормалізації, тож "+380 50 123-45-67" і "0501234567" вважаються одним номером).
+        Якщо такий контакт існує, викликає помилку.
 
         Аргументи:
             body: модель даних для створення контакту.
@@ -38,15 +124,23 @@ class ContactService:
         Викидає:
             HTTPException, якщо контакт з таким email або телефоном вже існує.
         """
-        if await self.repository.is_contact_exists(body.email, body.phone, user):
+        phone_normalized = normalize_phone(body.phone)
+        if await self.repository.is_contact_exists(body.email, phone_normalized, user):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Contact with '{body.email}' email or '{body.phone}' phone number already exists.",
             )
-        return await self.repository.create_contact(body, user)
+        return await self.repository.create_contact(body, user, phone_normalized)
 
     async def get_contacts(
-        self, name: str, surname: str, email: str, skip: int, limit: int, user: User
+        self,
+        name: str,
+        surname: str,
+        email: str,
+        phone: str,
+        skip: int,
+        limit: int,
+        user: User,
     ) -> List[Contact]:
         """
         Отримує список контактів з можливістю фільтрації за параметрами.
@@ -55,6 +149,7 @@ class ContactService:
             name: ім'я контакту для фільтрації.
             surname: прізвище контакту для фільтрації.
             email: електронна пошта контакту для фільтрації.
+            phone: початок номера телефону в будь-якому форматі (нормалізується).
             skip: кількість контактів для пропуску (пагінація).
             limit: максимальна кількість контактів для отримання.
             user: поточний користувач для перевірки доступу до контактів.
@@ -63,9 +158,81 @@ class ContactService:
             Список контактів, що задовольняють умови фільтрації.
         """
         return await self.repository.get_contacts(
-            name, surname, email, skip, limit, user
+            name,
+            surname,
+            email,
+            normalize_phone(phone) or "",
+            skip,
+            limit,
+            user,
         )
 
+    async def count_contacts(self, user: User) -> int:
+        """
+        Повертає кількість активних контактів користувача (з лічильника, без COUNT(*)).
+
+        Аргументи:
+            user: поточний користувач.
+        """
+        return await self.repository.get_contacts_count(user)
+
+    async def get_stats(self, user: User) -> ContactStats:
+        """
+        Повертає статистику контактів користувача.
+
+        Загальна кількість читається з лічильника `users.contacts_count` при
+        кожному запиті. Розподіл за місяцями народження та кількість
+        нещодавно доданих контактів обчислюються одним агрегатним запитом і
+        кешуються на `CONTACT_STATS_CACHE_TTL` секунд. Ключ кешу містить
+        `users.contacts_version`, яка збільшується при кожному створенні,
+        зміні чи видаленні контакту, тож після будь-якої зміни статистика
+        обчислюється заново.
+
+        Аргументи:
+            user: поточний користувач.
+
+        Повертає:
+            Статистику контактів.
+        """
+        total, version = await self.repository.get_contacts_counters(user)
+        cache = caches.get("default")
+        key = f"contact_stats: {user.id}:{version}"
+        stats = await cache.get(key)
+        if stats is None:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            rows = await self.repository.get_contact_stats(
+                user, [now - timedelta(days=7), now - timedelta(days=30)]
+            )
+            stats = {
+                "by_birth_month": {month: 0 for month in range(1, 13)},
+                "added_last_7_days": 0,
+                "added_last_30_days": 0,
+                "generated_at": now,
+            }
+            for row in rows:
+                stats["by_birth_month"][int(row.month)] = row.total
+                stats["added_last_7_days"] += row.added_0 or 0
+                stats["added_last_30_days"] += row.added_1 or 0
+            await cache.set(key, stats, ttl=settings.CONTACT_STATS_CACHE_TTL)
+        return ContactStats(total=total, **stats)
+
+    async def search_contacts(
+        self, query: str, skip: int, limit: int, user: User
+    ) -> List[Contact]:
+        """
+        Шукає контакти за словами запиту в імені, прізвищі, email, телефоні та info.
+
+        Аргументи:
+            query: пошуковий запит.
+            skip: кількість результатів для пропуску (пагінація).
+            limit: максимальна кількість результатів.
+            user: поточний користувач для перевірки доступу до контактів.
+
+        Повертає:
+            Список контактів, впорядкований за релевантністю.
+        """
+        return await self.repository.search_contacts(query, skip, limit, user)
+
     async def get_contact(self, contact_id: int, user: User) -> Contact | None:
         """
         Отримує контакт за його ID.
@@ -93,7 +260,9 @@ class ContactService:
         Повертає:
             Оновлений контакт.
         """
-        return await self.repository.update_contact(contact_id, body, user)
+        return await self.repository.update_contact(
+            contact_id, body, user, normalize_phone(body.phone)
+        )
 
     async def remove_contact(self, contact_id: int, user: User) -> Contact:
         """
@@ -119,4 +288,182 @@ class ContactService:
         Повертає:
             Список контактів з найближчими днями народження.
         """
-        return await self.repository.get_upcoming_birthdays(days, user)
\ No newline at end of file
+        return await self.repository.get_upcoming_birthdays(days, user)
+
+    async def _apply_updates(
+        self, changes: Dict[int, ContactModel], user: User
+    ) -> Set[int]:
+        """
+        Застосовує пакетне оновлення і повертає ID контактів, оновлення яких
+        порушує унікальність email або телефону.
+
+        Спершу всі зміни надсилаються одним пакетом; лише якщо він порушує
+        обмеження, оновлення повторюються по одному, щоб знайти конфліктні.
+        """
+        phones = {
+            contact_id: normalize_phone(body.phone)
+            for contact_id, body in changes.items()
+        }
+        try:
+            async with savepoint(self.db):
+                await self.repository.update_contacts(changes, user, phones)
+            return set()
+        except IntegrityError:
+            pass
+        conflicts = set()
+        for contact_id, body in changes.items():
+            try:
+                async with savepoint(self.db):
+                    await self.repository.update_contacts(
+                        {contact_id: body}, user, phones
+                    )
+            except IntegrityError:
+                conflicts.add(contact_id)
+        return conflicts
+
+    async def batch(
+        self, operations: List[ContactBatchItem], user: User
+    ) -> List[ContactBatchResult]:
+        """
+        Виконує пакет операцій get/update/delete над контактами в одній транзакції.
+
+        Операції групуються за типом і виконуються кількома запитами на весь
+        пакет незалежно від кількості операцій: видалення одним UPDATE ...
+        RETURNING, оновлення одним executemany, а читання (разом з повторним
+        читанням оновлених контактів) одним SELECT.
+
+        Аргументи:
+            operations: список операцій (ID контактів не повторюються).
+            user: поточний користувач для перевірки доступу до контактів.
+
+        Повертає:
+            Результати операцій у порядку запиту: 200 з даними контакту,
+            404, якщо контакт не знайдено, або 409 при конфлікті унікальності.
+        """
+        ids = {op: [] for op in ContactBatchOp}
+        for item in operations:
+            ids[item.op].append(item.id)
+
+        removed = {
+            contact.id: contact
+            for contact in await self.repository.remove_contacts(
+                ids[ContactBatchOp.DELETE], user
+            )
+        }
+        changes = {
+            item.id: item.data
+            for item in operations
+            if item.op == ContactBatchOp.UPDATE
+        }
+        conflicts = await self._apply_updates(changes, user)
+        found = {
+            contact.id: contact
+            for contact in await self.repository.get_contacts_by_ids(
+                ids[ContactBatchOp.GET]
+                + [contact_id for contact_id in changes if contact_id not in conflicts],
+                user,
+            )
+        }
+
+        results = []
+        for item in operations:
+            contact = (removed if item.op == ContactBatchOp.DELETE else found).get(
+                item.id
+            )
+            if item.id in conflicts:
+                result = ContactBatchResult(
+                    op=item.op,
+                    id=item.id,
+                    status=status.HTTP_409_CONFLICT,
+                    detail=f"Contact with '{item.data.email}' email or '{item.data.phone}' phone number already exists.",
+                )
+            elif contact is None:
+                result = ContactBatchResult(
+                    op=item.op,
+                    id=item.id,
+                    status=status.HTTP_404_NOT_FOUND,
+                    detail="Contact not found",
+                )
+            else:
+                result = ContactBatchResult(
+                    op=item.op,
+                    id=item.id,
+                    status=status.HTTP_200_OK,
+                    contact=ContactResponse.model_validate(contact),
+                )
+            results.append(result)
+        return results
+
+    async def get_changes(
+        self, since: Optional[str], limit: int, user: User
+    ) -> ContactChanges:
+        """
+        Повертає зміни контактів користувача після токена `since`.
+
+        Без токена повертаються всі активні контакти (перша синхронізація).
+        Курсор — версія контактів користувача (`change_version`), яку
+        репозиторій отримує під блокуванням рядка користувача, тож версії
+        фіксуються в порядку зростання: зміна, зафіксована після видачі
+        токена, завжди має більшу версію і не губиться.
+
+        Аргументи:
+            since: токен з попередньої відповіді або None.
+            limit: максимальна кількість змін у відповіді.
+            user: поточний користувач.
+
+        Повертає:
+            Сторінку змін і токен для наступного запиту.
+
+        Викидає:
+            HTTPException 400, якщо токен пошкоджений, або 410, якщо він
+            старший за час зберігання видалених контактів (потрібна повна
+            синхронізація).
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        after = None
+        if since:
+            try:
+                version, contact_id, issued_at = decode_change_token(since)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid change token",
+                )
+            retention = timedelta(seconds=settings.SOFT_DELETE_RETENTION_SECONDS)
+            if issued_at < now - retention:
+                raise HTTPException(
+                    status_code=status.HTTP_410_GONE,
+                    detail="Change token expired, full resync required",
+                )
+            after = (version, contact_id)
+
+        # Версія читається до вибірки змін: усі зміни з версією не більшою
+        # за неї вже зафіксовані і потраплять у вибірку
+        _, committed = await self.repository.get_contacts_counters(user)
+        contacts = await self.repository.get_changes(user, after, limit + 1)
+        has_more = len(contacts) > limit
+        contacts = contacts[:limit]
+        if has_more:
+            last = contacts[-1]
+            next_token = encode_change_token(last.change_version, last.id, now)
+        else:
+            # Усі зміни до поточної версії отримано: курсор просувається навіть
+            # без змін, тож токен клієнта, що регулярно синхронізується, не старіє
+            seen = contacts[-1].change_version if contacts else 0
+            floor = after[0] if after else 0
+            next_token = encode_change_token(max(committed, seen, floor), None, now)
+
+        changes = [
+            ContactChange(
+                id=contact.id,
+                deleted=contact.deleted_at is not None,
+                updated_at=contact.updated_at,
+                contact=(
+                    None
+                    if contact.deleted_at is not None
+                    else ContactResponse.model_validate(contact)
+                ),
+            )
+            for contact in contacts
+        ]
+        return ContactChanges(changes=changes, next_token=next_token, has_more=has_more)
\ No newline at end of file
@@ -0,0 +1,345 @@
+import asyncio
+import logging
+import unicodedata
+from collections import defaultdict
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from itertools import combinations
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from aiocache import caches
+
+import src.services.cache  # noqa: F401  (реєструє конфігурацію кешу)
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.database.models import User
+from src.repository.contacts import ContactRepository
+from src.schemas import (
+    DuplicateGroup,
+    DuplicatePair,
+    DuplicateReport,
+    DuplicateScanStatus,
+)
+
+logger = logging.getLogger("duplicates")
+
+# Ваги ознак в оцінці пари; сума обмежується 1.0
+EMAIL_WEIGHT = 0.6
+EMAIL_LOCAL_WEIGHT = 0.3
+PHONE_WEIGHT = 0.6
+NAME_WEIGHT = 0.4
+BIRTHDAY_WEIGHT = 0.2
+# Мінімальна схожість повних імен (SequenceMatcher), що вважається збігом
+NAME_SIMILARITY = 0.85
+# Коротші частини email і телефони не використовуються як ключі блокування
+MIN_EMAIL_LOCAL_LENGTH = 4
+MIN_PHONE_LENGTH = 7
+
+GMAIL_DOMAINS = {"gmail.com", "googlemail.com"}
+
+
+class _Features(NamedTuple):
+    id: int
+    email: str
+    email_local: str
+    phone: str
+    name: str
+    surname: str
+    full_name: str
+    birthday: object
+
+
+def _normalize_text(value: Optional[str]) -> str:
+    # Без діакритики, регістру та розділових знаків: "Zoë-Anne" -> "zoeanne"
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return "".join(ch for ch in decomposed.casefold() if ch.isalnum())
+
+
+def _normalize_email(email: Optional[str]) -> Tuple[str, str]:
+    local, _, domain = (email or "").strip().casefold().rpartition("@")
+    local = local.split("+", 1)[0]
+    if domain in GMAIL_DOMAINS:
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}", local
+
+
+def _features(contact) -> _Features:
+    email, email_local = _normalize_email(contact.email)
+    name = _normalize_text(contact.name)
+    surname = _normalize_text(contact.surname)
+    return _Features(
+        id=contact.id,
+        email=email,
+        email_local=email_local,
+        phone=contact.phone_normalized or "",
+        name=name,
+        surname=surname,
+        # Порядок слів не важливий: "Olena Shevchenko" == "Shevchenko Olena"
+        full_name=" ".join(sorted((name, surname))),
+        birthday=contact.birthday,
+    )
+
+
+def blocking_keys(features: _Features) -> List[str]:
+    """
+    Ключі блокування контакту: порівнюються лише контакти зі спільним ключем.
+
+    Ключі — нормалізований email, його локальна частина, нормалізований
+    телефон, ім'я та прізвище без урахування порядку, а також прізвище чи
+    ім'я разом з датою народження (ловлять описки й зміну прізвища).
+    """
+    keys = [f"email:{features.email}", f"name:{features.full_name}"]
+    if len(features.email_local) >= MIN_EMAIL_LOCAL_LENGTH:
+        keys.append(f"local:{features.email_local}")
+    if len(features.phone) >= MIN_PHONE_LENGTH:
+        keys.append(f"phone:{features.phone}")
+    if features.birthday is not None:
+        keys.append(f"surname_bd:{features.surname}|{features.birthday}")
+        keys.append(f"name_bd:{features.name}|{features.birthday}")
+    return keys
+
+
+def _similar_names(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    # Дешеві верхні межі схожості відсікають більшість пар без повного ratio()
+    if 2 * min(len(a), len(b)) < NAME_SIMILARITY * (len(a) + len(b)):
+        return False
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    return (
+        matcher.quick_ratio() >= NAME_SIMILARITY and matcher.ratio() >= NAME_SIMILARITY
+    )
+
+
+def score_pair(a: _Features, b: _Features) -> Tuple[float, List[str]]:
+    """
+    Оцінює схожість двох контактів.
+
+    Повертає:
+        Оцінку від 0 до 1 і список ознак, що збіглися.
+    """
+    score = 0.0
+    reasons = []
+    if a.email == b.email:
+        score += EMAIL_WEIGHT
+        reasons.append("email")
+    elif a.email_local == b.email_local and a.email_local:
+        score += EMAIL_LOCAL_WEIGHT
+        reasons.append("email_local")
+    if a.phone and a.phone == b.phone:
+        score += PHONE_WEIGHT
+        reasons.append("phone")
+    if _similar_names(a.full_name, b.full_name):
+        score += NAME_WEIGHT
+        reasons.append("name")
+    if a.birthday is not None and a.birthday == b.birthday:
+        score += BIRTHDAY_WEIGHT
+        reasons.append("birthday")
+    return round(min(score, 1.0), 2), reasons
+
+
+def find_duplicates(
+    contacts: Iterable, min_score: float, max_block_size: int
+) -> Tuple[List[DuplicateGroup], int]:
+    """
+    Шукає групи дублікатів серед контактів одного користувача.
+
+    Контакти розкладаються в блоки за ключами `blocking_keys`, і
+    оцінюються лише пари всередині блоків, тож вартість лінійна за
+    кількістю контактів, а не квадратична. Блоки, більші за
+    `max_block_size` (наприклад, поширене ім'я), пропускаються: такий ключ
+    нічого не говорить про дублікати. Пари з оцінкою від `min_score`
+    об'єднуються в групи (транзитивно).
+
+    Аргументи:
+        contacts: контакти з полями id, name, surname, email, phone_normalized, birthday.
+        min_score: мінімальна оцінка пари-дубліката.
+        max_block_size: максимальний розмір блоку, що порівнюється.
+
+    Повертає:
+        Групи дублікатів (найбільші першими) і кількість порівняних пар.
+    """
+    features = [_features(contact) for contact in contacts]
+    blocks: Dict[str, List[int]] = defaultdict(list)
+    for index, item in enumerate(features):
+        for key in blocking_keys(item):
+            blocks[key].append(index)
+
+    candidates = set()
+    for block in blocks.values():
+        if 1 < len(block) <= max_block_size:
+            candidates.update(combinations(block, 2))
+
+    parent = list(range(len(features)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    matched = []
+    for i, j in candidates:
+        score, reasons = score_pair(features[i], features[j])
+        if score < min_score:
+            continue
+        parent[find(i)] = find(j)
+        first, second = sorted((features[i].id, features[j].id))
+        matched.append(
+            (
+                i,
+                DuplicatePair(
+                    first_id=first, second_id=second, score=score, reasons=reasons
+                ),
+            )
+        )
+
+    pairs: Dict[int, List[DuplicatePair]] = defaultdict(list)
+    members: Dict[int, List[int]] = defaultdict(list)
+    for i, pair in matched:
+        pairs[find(i)].append(pair)
+    for index, item in enumerate(features):
+        root = find(index)
+        if root in pairs:
+            members[root].append(item.id)
+
+    groups = [
+        DuplicateGroup(
+            contact_ids=sorted(members[root]),
+            pairs=sorted(pairs[root], key=lambda p: (p.first_id, p.second_id)),
+        )
+        for root in pairs
+    ]
+    groups.sort(key=lambda group: (-len(group.contact_ids), group.contact_ids[0]))
+    return groups, len(candidates)
+
+
+class DuplicateScanner:
+    """
+    Фоновий пошук дублікатів контактів на вимогу користувача.
+
+    Пошук запускається як фонова задача, а його результат (або стан
+    "running") зберігається в кеші (Redis або пам'ять процесу, див.
+    `CACHE_BACKEND`) на `ttl` секунд, тож повторні запити звіту не
+    виконують пошук знову. Для одного користувача в процесі одночасно
+    виконується не більше одного пошуку. Порівняння пар виконується в
+    окремому потоці, щоб не блокувати цикл подій.
+    """
+
+    def __init__(
+        self,
+        min_score: float,
+        max_block_size: int,
+        ttl: int,
+        alias: str = "default",
+        session_factory=sessionmanager.session,
+    ):
+        """
+        Аргументи:
+            min_score: Мінімальна оцінка пари-дубліката.
+            max_block_size: Максимальний розмір блоку кандидатів.
+            ttl: Час життя звіту в кеші в секундах.
+            alias: Псевдонім кешу aiocache.
+            session_factory: Фабрика асинхронних сесій бази даних.
+        """
+        self.min_score = min_score
+        self.max_block_size = max_block_size
+        self.ttl = ttl
+        self.alias = alias
+        self.session_factory = session_factory
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    @property
+    def cache(self):
+        return caches.get(self.alias)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"duplicates: {user_id}"
+
+    async def _save(self, user_id: int, report: DuplicateReport) -> None:
+        await self.cache.set(
+            self._key(user_id), report.model_dump(mode="json"), ttl=self.ttl
+        )
+
+    async def get_report(self, user: User) -> Optional[DuplicateReport]:
+        """
+        Повертає останній звіт пошуку дублікатів користувача або None.
+        """
+        report = await self.cache.get(self._key(user.id))
+        return None if report is None else DuplicateReport.model_validate(report)
+
+    async def scan(self, user: User) -> DuplicateReport:
+        """
+        Виконує пошук дублікатів серед активних контактів користувача.
+        """
+        started_at = datetime.now(timezone.utc)
+        async with self.session_factory() as db:
+            contacts = await ContactRepository(db).get_duplicate_candidates(user)
+        groups, comparisons = await asyncio.to_thread(
+            find_duplicates, contacts, self.min_score, self.max_block_size
+        )
+        return DuplicateReport(
+            status=DuplicateScanStatus.DONE,
+            started_at=started_at,
+            finished_at=datetime.now(timezone.utc),
+            contacts_scanned=len(contacts),
+            comparisons=comparisons,
+            groups=groups,
+        )
+
+    async def _run(self, user: User, started: DuplicateReport) -> None:
+        try:
+            report = await self.scan(user)
+        except Exception:
+            logger.exception(f"Duplicate scan failed for user {user.id}")
+            report = started.model_copy(
+                update={
+                    "status": DuplicateScanStatus.FAILED,
+                    "finished_at": datetime.now(timezone.utc),
+                }
+            )
+        await self._save(user.id, report)
+
+    async def start_scan(self, user: User) -> DuplicateReport:
+        """
+        Запускає фоновий пошук дублікатів, якщо він ще не виконується.
+
+        Повертає:
+            Звіт зі станом "running".
+        """
+        task = self._tasks.get(user.id)
+        if task is not None and not task.done():
+            report = await self.get_report(user)
+            if report is not None:
+                return report
+        report = DuplicateReport(
+            status=DuplicateScanStatus.RUNNING,
+            started_at=datetime.now(timezone.utc),
+        )
+        await self._save(user.id, report)
+        task = asyncio.create_task(self._run(user, report))
+        self._tasks[user.id] = task
+        task.add_done_callback(
+            lambda done: (
+                self._tasks.pop(user.id) if self._tasks.get(user.id) is done else None
+            )
+        )
+        return report
+
+    async def stop(self) -> None:
+        """
+        Скасовує пошуки, що виконуються (при зупинці застосунку).
+        """
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+duplicate_scanner = DuplicateScanner(
+    settings.DUPLICATES_MIN_SCORE,
+    settings.DUPLICATES_MAX_BLOCK_SIZE,
+    settings.DUPLICATES_REPORT_TTL,
+)
@@ -1,25 +1,37 @@
+from functools import lru_cache
 from pathlib import Path
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from fastapi_mail.errors import ConnectionErrors
 from pydantic import EmailStr
 
 from src.services.auth import create_email_token
 from src.conf.config import settings
+from src.services.metrics import EMAILS_IN_PROGRESS
 
-# Налаштування конфігурації для підключення до сервера електронної пошти
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
-    MAIL_STARTTLS=settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS=settings.USE_CREDENTIALS,
-    VALIDATE_CERTS=settings.VALIDATE_CERTS,
-    TEMPLATE_FOLDER=Path(__file__).parent / "templates",
-)
+
+@lru_cache
+def get_mail_client():
+    """
+    Повертає клієнт FastMail, створюючи його при першому надсиланні листа.
+
+    fastapi_mail (разом з aiosmtplib, jinja2 і httpx) імпортується лише тут,
+    а не при старті застосунку, що помітно скорочує час холодного старту.
+    """
+    from fastapi_mail import ConnectionConfig, FastMail
+
+    # Налаштування конфігурації для підключення до сервера електронної пошти
+    conf = ConnectionConfig(
+        MAIL_USERNAME=settings.MAIL_USERNAME,
+        MAIL_PASSWORD=settings.MAIL_PASSWORD,
+        MAIL_FROM=settings.MAIL_FROM,
+        MAIL_PORT=settings.MAIL_PORT,
+        MAIL_SERVER=settings.MAIL_SERVER,
+        MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
+        MAIL_STARTTLS=settings.MAIL_STARTTLS,
+        MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
+        USE_CREDENTIALS=settings.USE_CREDENTIALS,
+        VALIDATE_CERTS=settings.VALIDATE_CERTS,
+        TEMPLATE_FOLDER=Path(__file__).parent / "templates",
+    )
+    return FastMail(conf)
 
 
 async def send_confirm_email(to_email: EmailStr, username: str, host: str) -> None:
@@ -37,26 +49,31 @@ async def send_confirm_email(to_email: EmailStr, username: str, host: str) -> No
     Викидає:
         ConnectionErrors: Якщо виникає помилка під час підключення до сервера електронної пошти.
     """
-    try:
-        # Створення токену для підтвердження електронної пошти
-        token_verification = create_email_token({"sub": to_email})
-        # Формування повідомлення для відправки
-        message = MessageSchema(
-            subject="Confirm your email",
-            recipients=[to_email],
-            template_body={
-                "host": host,
-                "username": username,
-                "token": token_verification,
-            },
-            subtype=MessageType.html,
-        )
-
-        # Ініціалізація FastMail та відправка повідомлення
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="verify_email.html")
-    except ConnectionErrors as err:
-        print(err)
+    from fastapi_mail import MessageSchema, MessageType
+    from fastapi_mail.errors import ConnectionErrors
+
+    with EMAILS_IN_PROGRESS.track_inprogress():
+        try:
+            # Створення токену для підтвердження електронної пошти
+            token_verification = create_email_token({"sub": to_email})
+            # Формування повідомлення для відправки
+            message = MessageSchema(
+                subject="Confirm your email",
+                recipients=[to_email],
+                template_body={
+                    "host": host,
+                    "username": username,
+                    "token": token_verification,
+                },
+                subtype=MessageType.html,
+            )
+
+            # Відправка повідомлення
+            await get_mail_client().send_message(
+                message, template_name="verify_email.html"
+            )
+        except ConnectionErrors as err:
+            print(err)
 
 
 async def send_reset_password_email(
@@ -77,20 +94,25 @@ async def send_reset_password_email(
     Викидає:
         ConnectionErrors: Якщо виникає помилка під час підключення до сервера електронної пошти.
     """
-    try:
-        # Формування посилання для скидання пароля
-        reset_link = f"{host}api/auth/confirm_reset_password/{reset_token}"
-
-        # Формування повідомлення для відправки
-        message = MessageSchema(
-            subject="Important: Update your account information",
-            recipients=[to_email],
-            template_body={"reset_link": reset_link, "username": username},
-            subtype=MessageType.html,
-        )
-
-        # Ініціалізація FastMail та відправка повідомлення
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="reset_password.html")
-    except ConnectionErrors as err:
-        print(err)
\ No newline at end of file
+    from fastapi_mail import MessageSchema, MessageType
+    from fastapi_mail.errors import ConnectionErrors
+
+    with EMAILS_IN_PROGRESS.track_inprogress():
+        try:
+            # Формування посилання для скидання пароля
+            reset_link = f"{host}api/auth/confirm_reset_password/{reset_token}"
+
+            # Формування повідомлення для відправки
+            message = MessageSchema(
+                subject="Important: Update your account information",
+                recipients=[to_email],
+                template_body={"reset_link": reset_link, "username": username},
+                subtype=MessageType.html,
+            )
+
+            # Відправка повідомлення
+            await get_mail_client().send_message(
+                message, template_name="reset_password.html"
+            )
+        except ConnectionErrors as err:
+            print(err)
\ No newline at end of file
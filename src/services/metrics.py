@@ -0,0 +1,93 @@
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    disable_created_metrics,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from src.database.db import sessionmanager
+from src.repository.users import UserRepository
+from src.services.auth import Hash, token_verifier
+
+# Ряди *_created лише подвоюють обсяг відповіді /metrics
+disable_created_metrics()
+
+# Окремий реєстр, щоб /metrics віддавав лише метрики застосунку
+registry = CollectorRegistry(auto_describe=True)
+
+# Межі кошиків підібрані під типові часи відповіді API (від 5 мс до 10 с)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Час обробки HTTP-запиту за шаблоном маршруту.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+    registry=registry,
+)
+REQUESTS = Counter(
+    "http_requests",
+    "Кількість HTTP-запитів за шаблоном маршруту і статусом відповіді.",
+    ["method", "route", "status"],
+    registry=registry,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Кількість HTTP-запитів, що обробляються зараз.",
+    registry=registry,
+)
+EMAILS_IN_PROGRESS = Gauge(
+    "email_send_in_progress",
+    "Кількість листів, що надсилаються зараз.",
+    registry=registry,
+)
+
+
+class RuntimeCollector:
+    """
+    Збирає метрики стану застосунку в момент запиту до /metrics.
+
+    Значення читаються з уже наявних лічильників (пул з'єднань, кеш токенів,
+    single-flight, пул хешування паролів), тож на шляху обробки запитів
+    не виникає жодних додаткових витрат.
+    """
+
+    def collect(self):
+        pool = sessionmanager._engine.pool
+        for name, description, method in (
+            ("db_pool_size", "Розмір пулу з'єднань з БД.", "size"),
+            (
+                "db_pool_checked_out",
+                "Кількість з'єднань, виданих з пулу.",
+                "checkedout",
+            ),
+            ("db_pool_overflow", "Кількість з'єднань понад розмір пулу.", "overflow"),
+        ):
+            # Не всі пули (наприклад, NullPool для SQLite) мають ці лічильники
+            if hasattr(pool, method):
+                yield GaugeMetricFamily(
+                    name, description, value=getattr(pool, method)()
+                )
+
+        cache = CounterMetricFamily(
+            "cache_requests",
+            "Звернення до кешів застосунку за результатом.",
+            labels=["cache", "result"],
+        )
+        cache.add_metric(["jwt", "hit"], token_verifier.hits)
+        cache.add_metric(["jwt", "miss"], token_verifier.misses)
+        flights = UserRepository.flights
+        cache.add_metric(["user_lookup", "hit"], flights.coalesced)
+        cache.add_metric(["user_lookup", "miss"], flights.calls - flights.coalesced)
+        yield cache
+
+        yield GaugeMetricFamily(
+            "password_hash_queue_depth",
+            "Кількість задач хешування паролів, що очікують на вільний потік.",
+            value=Hash.executor._work_queue.qsize(),
+        )
+
+
+registry.register(RuntimeCollector())
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import logging
+import sys
+from pathlib import Path
+
+import fastapi
+import pydantic
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger("openapi")
+
+# Корінь проєкту і джерела, з яких будується схема (маршрути й моделі)
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SCHEMA_SOURCES = ("main.py", "src")
+# Ключ відбитка у файлі схеми; вилучається при завантаженні
+FINGERPRINT_KEY = "x-schema-fingerprint"
+
+
+def schema_fingerprint(app: FastAPI) -> str:
+    """
+    Обчислює відбиток усього, від чого залежить схема OpenAPI застосунку.
+
+    Враховуються маршрути застосунку, вміст файлів з кодом проєкту (моделі
+    запитів і відповідей, описи ендпоінтів) і версії FastAPI та pydantic.
+    Обчислення не потребує генерації схеми: файли лише зчитуються.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{fastapi.__version__} {pydantic.__version__}".encode())
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.include_in_schema:
+            endpoint = f"{route.endpoint.__module__}.{route.endpoint.__qualname__}"
+            digest.update(f"{route.path} {sorted(route.methods)} {endpoint}".encode())
+    for source in SCHEMA_SOURCES:
+        source_path = PROJECT_ROOT / source
+        files = (
+            sorted(source_path.rglob("*.py")) if source_path.is_dir() else [source_path]
+        )
+        for file in files:
+            if file.is_file():
+                digest.update(str(file.relative_to(PROJECT_ROOT)).encode())
+                digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def dump_openapi_schema(app: FastAPI, path: str) -> None:
+    """
+    Генерує схему OpenAPI застосунку і записує її у файл.
+
+    Призначена для запуску при збиранні образу:
+    `python -m src.services.openapi openapi.json`.
+
+    Аргументи:
+        app: Застосунок FastAPI.
+        path: Шлях до файлу схеми.
+    """
+    schema = {**app.openapi(), FINGERPRINT_KEY: schema_fingerprint(app)}
+    Path(path).write_text(
+        json.dumps(schema, ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+
+
+def load_openapi_schema(app: FastAPI, path: str) -> bool:
+    """
+    Встановлює застосунку схему OpenAPI, попередньо згенеровану у файл.
+
+    FastAPI будує схему при першому запиті до /openapi.json або /docs,
+    обходячи всі маршрути й моделі. Завантажена з файлу схема лише
+    зчитується при старті і надалі віддається з пам'яті.
+
+    Файл містить відбиток коду, з якого його згенеровано (див.
+    `schema_fingerprint`). Якщо файлу немає або відбиток не збігається з
+    поточним (змінилися маршрути, моделі чи версії бібліотек), схема
+    вважається застарілою і буде згенерована звичайним чином при першому
+    запиті.
+
+    Аргументи:
+        app: Застосунок FastAPI.
+        path: Шлях до файлу схеми; порожній рядок вимикає завантаження.
+
+    Повертає:
+        True, якщо схему завантажено з файлу.
+    """
+    if not path:
+        return False
+    schema_path = Path(path)
+    if not schema_path.is_file():
+        logger.warning(f"OpenAPI schema file '{path}' not found")
+        return False
+    schema = json.loads(schema_path.read_bytes())
+    if schema.pop(FINGERPRINT_KEY, None) != schema_fingerprint(app):
+        logger.warning(f"OpenAPI schema file '{path}' is stale, ignoring it")
+        return False
+    app.openapi_schema = schema
+    return True
+
+
+if __name__ == "__main__":
+    from main import app
+
+    dump_openapi_schema(app, sys.argv[1] if len(sys.argv) > 1 else "openapi.json")
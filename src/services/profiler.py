@@ -0,0 +1,208 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Optional
+
+from src.conf.config import settings
+
+# Мінімальний інтервал вибірки: частіші вибірки помітно навантажують процес
+MIN_INTERVAL = 0.001
+# Максимальна глибина стеку в одній вибірці
+MAX_DEPTH = 128
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{code.co_name}:{frame.f_lineno}"
+
+
+def fold_stack(frame, root: Optional[str] = None) -> str:
+    """
+    Перетворює стек викликів у рядок формату folded stacks (`a;b;c`).
+
+    Аргументи:
+        frame: Верхній кадр стеку.
+        root: Необов'язковий кореневий елемент (наприклад, ім'я потоку).
+    """
+    labels = []
+    while frame is not None and len(labels) < MAX_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    if root:
+        labels.append(root)
+    labels.reverse()
+    return ";".join(labels)
+
+
+class SamplingProfiler:
+    """
+    Статистичний профайлер на основі `sys._current_frames()`.
+
+    Окремий потік з інтервалом `interval` знімає стек цільового потоку (або
+    всіх потоків) і підраховує однакові стеки. Результат у форматі folded
+    stacks сумісний з flamegraph.pl, speedscope та Pyroscope.
+
+    Асинхронні обробники виконуються в потоці циклу подій, тож профіль
+    запиту містить і роботу інших запитів, що виконувались одночасно.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        thread_id: Optional[int] = None,
+        max_duration: Optional[float] = None,
+    ):
+        """
+        Аргументи:
+            interval: Інтервал між вибірками в секундах.
+            thread_id: ID потоку для профілювання; None — усі потоки.
+            max_duration: Максимальна тривалість профілювання в секундах.
+        """
+        self.interval = max(interval, MIN_INTERVAL)
+        self.thread_id = thread_id
+        self.max_duration = max_duration
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        deadline = time.monotonic() + self.max_duration if self.max_duration else None
+        while not self._stop.wait(self.interval):
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            self.sample(own)
+            self.on_sample()
+
+    def on_sample(self) -> None:
+        """
+        Викликається після кожної вибірки (точка розширення для підкласів).
+        """
+
+    def sample(self, own: int) -> None:
+        frames = sys._current_frames()
+        if self.thread_id is not None:
+            frame = frames.get(self.thread_id)
+            if frame is not None:
+                self.stacks[fold_stack(frame)] += 1
+        else:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in frames.items():
+                if thread_id != own:
+                    root = names.get(thread_id, str(thread_id))
+                    self.stacks[fold_stack(frame, root)] += 1
+        self.samples += 1
+
+    def folded(self) -> str:
+        """
+        Профіль у форматі folded stacks: один рядок `стек кількість` на стек.
+        """
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+class ContinuousProfiler(SamplingProfiler):
+    """
+    Фоновий профайлер з низькою частотою вибірки для всіх потоків процесу.
+
+    Кожні `flush_interval` секунд записує накопичений профіль у файл
+    `continuous-<час>-<pid>.folded` у каталозі `directory`.
+    """
+
+    def __init__(self, interval: float, directory: str, flush_interval: float):
+        super().__init__(interval)
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def on_sample(self) -> None:
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def stop(self) -> None:
+        super().stop()
+        self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self.stacks:
+            return
+        name = f"continuous-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        save_profile(self.directory, name, self.folded())
+        self.stacks = Counter()
+
+
+class ProfileBudget:
+    """
+    Обмеження на профілювання запитів, щоб його не можна було використати
+    для погіршення роботи сервісу: не більше `max_concurrent` одночасних
+    профілів і не більше `max_per_minute` за хвилину.
+    """
+
+    def __init__(self, max_per_minute: int, max_concurrent: int = 1):
+        self.max_per_minute = max_per_minute
+        self.max_concurrent = max_concurrent
+        self.active = 0
+        self._started: deque = deque()
+
+    def acquire(self) -> bool:
+        now = time.monotonic()
+        while self._started and now - self._started[0] >= 60:
+            self._started.popleft()
+        if (
+            self.active >= self.max_concurrent
+            or len(self._started) >= self.max_per_minute
+        ):
+            return False
+        self.active += 1
+        self._started.append(now)
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+
+
+def save_profile(directory: str, name: str, folded: str) -> Path:
+    """
+    Зберігає профіль у файл `<name>.folded` у вказаному каталозі.
+    """
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    file = path / f"{name}.folded"
+    file.write_text(folded)
+    return file
+
+
+def start_continuous_profiler() -> Optional[ContinuousProfiler]:
+    """
+    Запускає безперервне профілювання, якщо його ввімкнено в налаштуваннях.
+    """
+    if not settings.PROFILE_CONTINUOUS:
+        return None
+    profiler = ContinuousProfiler(
+        settings.PROFILE_CONTINUOUS_INTERVAL_MS / 1000,
+        settings.PROFILE_DIR,
+        settings.PROFILE_FLUSH_SECONDS,
+    )
+    profiler.start()
+    return profiler
+
+
+profile_budget = ProfileBudget(settings.PROFILE_MAX_PER_MINUTE)
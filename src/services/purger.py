@@ -0,0 +1,162 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import text
+
+from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.repository.contacts import ContactRepository
+from src.repository.users import UserRepository
+
+logger = logging.getLogger("purger")
+
+# Скільки видалених користувачів обробляється за один прохід
+USERS_PER_PASS = 100
+# Ключ advisory-блокування PostgreSQL, яке має лише один робочий процес
+PURGE_LOCK_KEY = 0x5075_7267
+
+
+class SoftDeletePurger:
+    """
+    Фонове остаточне видалення м'яко видалених контактів і користувачів.
+
+    Записи, видалені раніше ніж `retention` секунд тому, видаляються
+    пакетами по `batch_size` рядків, кожен пакет у власній короткій
+    транзакції, з паузою `pause` секунд між пакетами. Так видалення
+    користувача з сотнями тисяч контактів не тримає блокування і не
+    навантажує базу даних одним великим DELETE.
+
+    Пурджер запускається в кожному робочому процесі, але прохід виконує
+    лише той, хто отримав advisory-блокування PostgreSQL; решта пропускають
+    прохід до наступного інтервалу.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        retention: float,
+        batch_size: int,
+        pause: float,
+        session_factory=sessionmanager.session,
+    ):
+        """
+        Аргументи:
+            interval: Інтервал між проходами в секундах.
+            retention: Скільки секунд зберігати м'яко видалені записи.
+            batch_size: Кількість рядків, що видаляються в одній транзакції.
+            pause: Пауза між пакетами в секундах.
+            session_factory: Фабрика асинхронних сесій бази даних.
+        """
+        self.interval = interval
+        self.retention = retention
+        self.batch_size = batch_size
+        self.pause = pause
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+
+    async def _purge_batches(self, purge) -> int:
+        total = 0
+        while True:
+            async with self.session_factory() as db:
+                deleted = await purge(db)
+                await db.commit()
+            total += deleted
+            if deleted < self.batch_size:
+                return total
+            await asyncio.sleep(self.pause)
+
+    @asynccontextmanager
+    async def _leader(self) -> AsyncIterator[bool]:
+        # Блокування рівня транзакції тримає окрема сесія до кінця проходу і
+        # звільняється при її закритті, навіть якщо процес аварійно завершився
+        async with self.session_factory() as db:
+            if db.bind.dialect.name != "postgresql":
+                yield True
+                return
+            acquired = (
+                await db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": PURGE_LOCK_KEY},
+                )
+            ).scalar()
+            yield acquired
+
+    async def purge_once(self) -> int:
+        """
+        Виконує один прохід видалення.
+
+        Повертає кількість остаточно видалених контактів; 0, якщо прохід
+        уже виконує інший робочий процес.
+        """
+        async with self._leader() as is_leader:
+            if not is_leader:
+                return 0
+            return await self._purge()
+
+    async def _purge(self) -> int:
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            seconds=self.retention
+        )
+        deleted = await self._purge_batches(
+            lambda db: ContactRepository(db).purge_deleted_contacts(
+                cutoff, self.batch_size
+            )
+        )
+
+        async with self.session_factory() as db:
+            user_ids = await UserRepository(db).get_deleted_user_ids(
+                cutoff, USERS_PER_PASS
+            )
+        for user_id in user_ids:
+            deleted += await self._purge_batches(
+                lambda db: ContactRepository(db).purge_user_contacts(
+                    user_id, self.batch_size
+                )
+            )
+            async with self.session_factory() as db:
+                await UserRepository(db).purge_user(user_id)
+                await db.commit()
+
+        if deleted or user_ids:
+            logger.info(f"Purged {deleted} contacts and {len(user_ids)} users")
+        return deleted
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.purge_once()
+            except Exception:
+                logger.exception("Soft-delete purge failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+def start_purger() -> Optional[SoftDeletePurger]:
+    """
+    Запускає фонове видалення, якщо його ввімкнено в налаштуваннях.
+    """
+    if not settings.PURGE_ENABLED:
+        return None
+    purger = SoftDeletePurger(
+        settings.PURGE_INTERVAL_SECONDS,
+        settings.SOFT_DELETE_RETENTION_SECONDS,
+        settings.PURGE_BATCH_SIZE,
+        settings.PURGE_BATCH_PAUSE_MS / 1000,
+    )
+    purger.start()
+    return purger
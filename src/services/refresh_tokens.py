@@ -0,0 +1,108 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import settings
+from src.repository.refresh_tokens import RefreshTokenRepository
+
+
+class RefreshTokenService:
+    """
+    Сервіс для видачі та ротації refresh-токенів.
+
+    Refresh-токен — це випадковий непрозорий рядок; у базі даних зберігається
+    лише його SHA-256 хеш. Кожне використання токена відкликає його і видає
+    новий (ротація) у тій самій сім'ї. Повторне використання вже відкликаного,
+    але ще не простроченого токена вважається ознакою викрадення, тому
+    відкликається вся його сім'я; інші сесії користувача не зачіпаються.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """
+        Ініціалізація сервісу для роботи з refresh-токенами.
+
+        Аргументи:
+            db: Об'єкт асинхронної сесії бази даних.
+        """
+        self.db = db
+        self.repository = RefreshTokenRepository(db)
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    async def issue(self, user_id: int, family_id: str | None = None) -> str:
+        """
+        Видає новий refresh-токен користувачу.
+
+        Аргументи:
+            user_id: ID користувача.
+            family_id: Сім'я токена при ротації; None — нова сім'я (вхід у систему).
+
+        Повертає:
+            str: Refresh-токен у відкритому вигляді (зберігається лише його хеш).
+        """
+        token = secrets.token_urlsafe(32)
+        expires_at = self._now() + timedelta(
+            seconds=settings.JWT_REFRESH_EXPIRATION_SECONDS
+        )
+        await self.repository.create_token(
+            user_id, self._hash(token), family_id or secrets.token_hex(16), expires_at
+        )
+        return token
+
+    async def rotate(self, token: str) -> tuple[int, str] | None:
+        """
+        Використовує refresh-токен і видає замість нього новий.
+
+        Аргументи:
+            token: Refresh-токен, отриманий від клієнта.
+
+        Повертає:
+            tuple або None: ID користувача та новий refresh-токен, або None,
+            якщо токен недійсний, прострочений чи вже використаний.
+        """
+        token_hash = self._hash(token)
+        now = self._now()
+        consumed = await self.repository.consume_token(token_hash, now)
+        if consumed is None:
+            stored = await self.repository.get_token(token_hash)
+            if (
+                stored is not None
+                and stored.revoked_at is not None
+                and stored.expires_at > now
+            ):
+                # Повторне використання токена: відкликаємо його сім'ю.
+                # Фіксуємо одразу, бо відповідь 401 відкотить транзакцію запиту
+                await self.repository.revoke_family(stored.family_id, now)
+                await self.db.commit()
+            return None
+        user_id, family_id = consumed
+        return user_id, await self.issue(user_id, family_id)
+
+    async def revoke(self, token: str, user_id: int) -> None:
+        """
+        Відкликає refresh-токен користувача (наприклад, при виході з системи).
+
+        Токен іншого користувача не відкликається.
+
+        Аргументи:
+            token: Refresh-токен, отриманий від клієнта.
+            user_id: ID користувача, якому має належати токен.
+        """
+        await self.repository.consume_token(self._hash(token), self._now(), user_id)
+
+    async def revoke_all(self, user_id: int) -> None:
+        """
+        Відкликає всі refresh-токени користувача (наприклад, при видаленні облікового запису).
+
+        Аргументи:
+            user_id: ID користувача.
+        """
+        await self.repository.revoke_user_tokens(user_id, self._now())
@@ -0,0 +1,48 @@
+from aiocache import caches
+
+import src.services.cache  # noqa: F401  (реєструє конфігурацію кешу)
+
+
+class RevocationList:
+    """
+    Компактний список відкликаних токенів доступу.
+
+    Зберігає лише ідентифікатори `jti` відкликаних токенів у кеші (Redis або
+    пам'ять процесу, див. `CACHE_BACKEND`) з часом життя, що дорівнює
+    залишку терміну дії токена, тому список не росте необмежено.
+    """
+
+    def __init__(self, alias: str = "default"):
+        """
+        Аргументи:
+            alias: Псевдонім кешу aiocache.
+        """
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches.get(self.alias)
+
+    @staticmethod
+    def _key(jti: str) -> str:
+        return f"revoked: {jti}"
+
+    async def revoke(self, jti: str, ttl: int) -> None:
+        """
+        Додає токен до списку відкликаних.
+
+        Аргументи:
+            jti: Ідентифікатор токена.
+            ttl: Залишок терміну дії токена в секундах.
+        """
+        if ttl > 0:
+            await self.cache.set(self._key(jti), 1, ttl=ttl)
+
+    async def is_revoked(self, jti: str) -> bool:
+        """
+        Перевіряє, чи відкликано токен.
+        """
+        return await self.cache.exists(self._key(jti))
+
+
+revoked_tokens = RevocationList()
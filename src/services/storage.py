@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from src.conf.config import settings
+
+# Шлях, за яким застосунок віддає файли LocalStorage (див. src/api/users.py)
+LOCAL_AVATARS_URL = "/api/users/avatars"
+
+
+def _versioned(url: str, data: bytes) -> str:
+    # Нова версія файлу отримує новий URL, тож кеш CDN і браузера не заважає
+    return f"{url}?v={hashlib.sha256(data).hexdigest()[:12]}"
+
+
+class CloudinaryStorage:
+    """
+    Сховище аватарів у Cloudinary.
+    """
+
+    name = "cloudinary"
+
+    def __init__(self, cloud_name: str, api_key, api_secret: str, folder="RestApp"):
+        """
+        Аргументи:
+            cloud_name: Ім'я хмари в Cloudinary.
+            api_key: API ключ для доступу до Cloudinary.
+            api_secret: API секрет для доступу до Cloudinary.
+            folder: Каталог у Cloudinary, в який завантажуються файли.
+        """
+        if not cloud_name:
+            raise RuntimeError("STORAGE_BACKEND=cloudinary потребує CLOUDINARY_NAME")
+        # Cloudinary імпортується лише при завантаженні аватара, а не при
+        # старті застосунку
+        import cloudinary
+
+        cloudinary.config(
+            cloud_name=cloud_name,
+            api_key=api_key,
+            api_secret=api_secret,
+            secure=True,
+        )
+        self.folder = folder
+
+    @classmethod
+    def from_settings(cls) -> "CloudinaryStorage":
+        return cls(
+            settings.CLOUDINARY_NAME,
+            settings.CLOUDINARY_API_KEY,
+            settings.CLOUDINARY_API_SECRET,
+        )
+
+    async def save(self, key: str, data: bytes, content_type: str) -> str:
+        """
+        Завантажує файл у Cloudinary і повертає його URL.
+
+        Клієнт Cloudinary синхронний, тож запит виконується в окремому
+        потоці; файл передається як multipart/form-data.
+        """
+        import cloudinary.uploader
+
+        public_id = f"{self.folder}/{Path(key).stem}"
+        response = await asyncio.to_thread(
+            cloudinary.uploader.upload,
+            io.BytesIO(data),
+            public_id=public_id,
+            overwrite=True,
+        )
+        return response["secure_url"]
+
+
+class LocalStorage:
+    """
+    Сховище аватарів на локальному диску.
+
+    Файли віддає сам застосунок (`GET /api/users/avatars/{key}`) або
+    CDN чи вебсервер, налаштований на каталог `directory`, якщо задано
+    `public_url`. Не потребує зовнішніх сервісів, тож підходить для
+    розробки і тестів без мережі.
+    """
+
+    name = "local"
+
+    def __init__(self, directory: str, public_url: str = LOCAL_AVATARS_URL):
+        """
+        Аргументи:
+            directory: Каталог для збереження файлів (створюється за потреби).
+            public_url: Базовий URL, за яким доступні файли.
+        """
+        self.directory = Path(directory).resolve()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.public_url = public_url.rstrip("/")
+
+    @classmethod
+    def from_settings(cls) -> "LocalStorage":
+        return cls(
+            settings.STORAGE_LOCAL_DIR, settings.STORAGE_PUBLIC_URL or LOCAL_AVATARS_URL
+        )
+
+    def _resolve(self, key: str) -> Optional[Path]:
+        # Ключ — лише ім'я файлу всередині каталогу, без "../" і підкаталогів
+        path = (self.directory / key).resolve()
+        return path if path.parent == self.directory else None
+
+    def path(self, key: str) -> Optional[Path]:
+        """
+        Повертає шлях до збереженого файлу або None, якщо файлу немає.
+        """
+        path = self._resolve(key)
+        return path if path is not None and path.is_file() else None
+
+    def _write(self, path: Path, data: bytes) -> None:
+        # Запис у тимчасовий файл і атомарна заміна: читачі ніколи не
+        # бачать частково записаний файл
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    async def save(self, key: str, data: bytes, content_type: str) -> str:
+        """
+        Записує файл у каталог сховища і повертає його URL.
+
+        Викидає:
+            ValueError: Якщо ключ не є простим ім'ям файлу.
+        """
+        path = self._resolve(key)
+        if path is None:
+            raise ValueError(f"Недопустимий ключ файлу: '{key}'")
+        await asyncio.to_thread(self._write, path, data)
+        return _versioned(f"{self.public_url}/{key}", data)
+
+
+class S3Storage:
+    """
+    Сховище аватарів у S3-сумісному сервісі (AWS S3, MinIO).
+
+    Потребує необов'язкового пакета boto3. Файли завантажуються через
+    `upload_fileobj`, який для великих файлів автоматично використовує
+    multipart upload, в окремому потоці, щоб не блокувати цикл подій.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str = "",
+        region: str = "us-east-1",
+        access_key: str = "",
+        secret_key: str = "",
+        prefix: str = "avatars/",
+        public_url: str = "",
+    ):
+        """
+        Аргументи:
+            bucket: Назва бакета.
+            endpoint_url: Адреса S3-сумісного сервісу (для MinIO); порожня — AWS.
+            region: Регіон бакета.
+            access_key: Ключ доступу; порожній — облікові дані з оточення.
+            secret_key: Секретний ключ.
+            prefix: Префікс ключів об'єктів у бакеті.
+            public_url: Базовий URL (CDN), за яким доступні об'єкти; порожній —
+                пряма адреса бакета.
+        """
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError(
+                "STORAGE_BACKEND=s3 потребує встановленого пакета boto3"
+            ) from e
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 потребує S3_BUCKET")
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region,
+            aws_access_key_id=access_key or None,
+            aws_secret_access_key=secret_key or None,
+        )
+        self.bucket = bucket
+        self.prefix = prefix
+        if public_url:
+            self.public_url = public_url.rstrip("/")
+        elif endpoint_url:
+            self.public_url = f"{endpoint_url.rstrip('/')}/{bucket}"
+        else:
+            self.public_url = f"https://{bucket}.s3.{region}.amazonaws.com"
+
+    @classmethod
+    def from_settings(cls) -> "S3Storage":
+        return cls(
+            settings.S3_BUCKET,
+            settings.S3_ENDPOINT_URL,
+            settings.S3_REGION,
+            settings.S3_ACCESS_KEY,
+            settings.S3_SECRET_KEY,
+            settings.S3_PREFIX,
+            settings.STORAGE_PUBLIC_URL,
+        )
+
+    async def save(self, key: str, data: bytes, content_type: str) -> str:
+        """
+        Завантажує файл у бакет і повертає його URL.
+        """
+        object_key = f"{self.prefix}{key}"
+        await asyncio.to_thread(
+            self.client.upload_fileobj,
+            io.BytesIO(data),
+            self.bucket,
+            object_key,
+            ExtraArgs={
+                "ContentType": content_type,
+                "CacheControl": "public, max-age=86400",
+            },
+        )
+        return _versioned(f"{self.public_url}/{object_key}", data)
+
+
+STORAGES = {
+    CloudinaryStorage.name: CloudinaryStorage,
+    LocalStorage.name: LocalStorage,
+    S3Storage.name: S3Storage,
+}
+
+
+@lru_cache
+def get_storage(name: str):
+    """
+    Створює сховище аватарів за його назвою з налаштувань.
+
+    Сховище створюється один раз і надалі повторно використовується.
+
+    Аргументи:
+        name: Назва сховища ("cloudinary", "local" або "s3").
+
+    Викидає:
+        ValueError: Якщо сховище з такою назвою не підтримується.
+    """
+    try:
+        storage = STORAGES[name]
+    except KeyError:
+        raise ValueError(f"Непідтримуване сховище аватарів: '{name}'")
+    return storage.from_settings()
@@ -0,0 +1,77 @@
+from typing import Awaitable, Callable, Optional
+
+from aiocache import caches
+
+import src.services.cache  # noqa: F401  (реєструє конфігурацію кешу)
+from src.conf.config import settings
+
+
+class TokenVersionStore:
+    """
+    Кеш поточних версій токенів користувачів.
+
+    Версія токена зберігається в колонці `users.token_version` і дублюється
+    в кеші (Redis або пам'ять процесу, див. `CACHE_BACKEND`), щоб перевірка
+    stateless-токенів не потребувала запиту до бази даних. Збільшення версії
+    миттєво робить недійсними всі раніше видані токени користувача.
+
+    Для кількох процесів застосунку потрібен спільний Redis-кеш, інакше
+    відкликання буде видно лише в процесі, який його виконав.
+    """
+
+    def __init__(self, alias: str = "default", ttl: int = 3600):
+        """
+        Аргументи:
+            alias: Псевдонім кешу aiocache.
+            ttl: Час життя запису у кеші в секундах.
+        """
+        self.alias = alias
+        self.ttl = ttl
+
+    @property
+    def cache(self):
+        return caches.get(self.alias)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"token_version: {user_id}"
+
+    async def get(
+        self, user_id: int, loader: Callable[[int], Awaitable[Optional[int]]]
+    ) -> Optional[int]:
+        """
+        Повертає поточну версію токена користувача.
+
+        Аргументи:
+            user_id: ID користувача.
+            loader: Функція для читання версії з бази даних при промаху кешу.
+
+        Повертає:
+            Версію токена або None, якщо користувача не знайдено.
+        """
+        version = await self.cache.get(self._key(user_id))
+        if version is None:
+            version = await loader(user_id)
+            if version is not None:
+                await self.cache.set(self._key(user_id), version, ttl=self.ttl)
+        return version
+
+    async def set(self, user_id: int, version: int) -> None:
+        """
+        Записує нову версію токена користувача в кеш.
+        """
+        await self.cache.set(self._key(user_id), version, ttl=self.ttl)
+
+    async def invalidate(self, user_id: int) -> None:
+        """
+        Видаляє версію токена користувача з кешу; наступна перевірка
+        прочитає її з бази даних.
+
+        Викликається після фіксації транзакції, що змінила версію: на
+        відміну від `set`, паралельні зміни не можуть записати в кеш
+        застарілу версію.
+        """
+        await self.cache.delete(self._key(user_id))
+
+
+token_versions = TokenVersionStore(ttl=settings.TOKEN_VERSION_CACHE_TTL)
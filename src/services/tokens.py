@@ -0,0 +1,168 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from jose import JWTError, jwt
+
+
+class InvalidTokenError(Exception):
+    """
+    Помилка перевірки JWT-токена (недійсний підпис, формат або прострочений токен).
+    """
+
+
+class JoseBackend:
+    """
+    Бекенд JWT на основі бібліотеки python-jose (використовується за замовчуванням).
+    """
+
+    name = "jose"
+
+    def encode(self, claims: dict, secret: str, algorithm: str) -> str:
+        """
+        Підписує набір claims і повертає JWT-токен.
+        """
+        return jwt.encode(claims, secret, algorithm=algorithm)
+
+    def decode(self, token: str, secret: str, algorithm: str) -> dict:
+        """
+        Перевіряє підпис токена та повертає його claims.
+        """
+        try:
+            return jwt.decode(token, secret, algorithms=[algorithm])
+        except JWTError as e:
+            raise InvalidTokenError(str(e)) from e
+
+
+class PyJWTBackend:
+    """
+    Швидший бекенд JWT на основі бібліотеки PyJWT (необов'язкова залежність).
+    """
+
+    name = "pyjwt"
+
+    def __init__(self):
+        try:
+            import jwt as pyjwt
+        except ImportError as e:
+            raise RuntimeError(
+                "JWT_BACKEND=pyjwt потребує встановленого пакета PyJWT"
+            ) from e
+        self._jwt = pyjwt
+
+    def encode(self, claims: dict, secret: str, algorithm: str) -> str:
+        """
+        Підписує набір claims і повертає JWT-токен.
+        """
+        return self._jwt.encode(claims, secret, algorithm=algorithm)
+
+    def decode(self, token: str, secret: str, algorithm: str) -> dict:
+        """
+        Перевіряє підпис токена та повертає його claims.
+        """
+        try:
+            return self._jwt.decode(token, secret, algorithms=[algorithm])
+        except self._jwt.PyJWTError as e:
+            raise InvalidTokenError(str(e)) from e
+
+
+BACKENDS = {
+    JoseBackend.name: JoseBackend,
+    PyJWTBackend.name: PyJWTBackend,
+}
+
+
+def get_backend(name: str):
+    """
+    Створює бекенд JWT за його назвою з налаштувань.
+
+    Аргументи:
+        name: Назва бекенду ("jose" або "pyjwt").
+
+    Викидає:
+        ValueError: Якщо бекенд з такою назвою не підтримується.
+    """
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Непідтримуваний JWT бекенд: '{name}'")
+
+
+class TokenVerifier:
+    """
+    Перевіряє JWT-токени з локальним LRU-кешем вже перевірених токенів.
+
+    Кеш зберігає SHA-256 дайджест токена разом з його claims і часом `exp`,
+    тому повторні запити з тим самим токеном не виконують HMAC-перевірку та
+    розбір JSON. Токени без `exp` не кешуються, а прострочені записи
+    видаляються при зверненні.
+
+    Атрибути:
+    - hits (int): Кількість запитів, обслужених з кешу.
+    - misses (int): Кількість запитів, що потребували повної перевірки.
+    """
+
+    def __init__(self, backend, secret: str, algorithm: str, max_size: int = 4096):
+        """
+        Аргументи:
+            backend: Бекенд JWT з методами `encode` і `decode`.
+            secret: Секретний ключ для підпису токенів.
+            algorithm: Алгоритм підпису токенів.
+            max_size: Максимальна кількість записів у кеші (0 вимикає кеш).
+        """
+        self.backend = backend
+        self.secret = secret
+        self.algorithm = algorithm
+        self.max_size = max_size
+        self._cache: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, claims: dict) -> str:
+        """
+        Підписує claims поточним бекендом.
+        """
+        return self.backend.encode(claims, self.secret, self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        """
+        Повертає claims перевіреного токена, використовуючи кеш за можливості.
+
+        Викидає:
+            InvalidTokenError: Якщо токен недійсний або прострочений.
+        """
+        if not self.max_size:
+            return self.backend.decode(token, self.secret, self.algorithm)
+
+        key = hashlib.sha256(token.encode()).digest()
+        entry = self._cache.get(key)
+        if entry is not None:
+            claims, exp = entry
+            if exp > time.time():
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return dict(claims)
+            del self._cache[key]
+
+        self.misses += 1
+        claims = self.backend.decode(token, self.secret, self.algorithm)
+        exp = self._expiration(claims)
+        if exp is not None:
+            self._cache[key] = (claims, exp)
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return dict(claims)
+
+    def clear(self) -> None:
+        """
+        Очищає кеш перевірених токенів.
+        """
+        self._cache.clear()
+
+    @staticmethod
+    def _expiration(claims: dict) -> Optional[float]:
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            return float(exp)
+        return None
@@ -1,49 +1,197 @@
-import cloudinary
-import cloudinary.uploader
+import asyncio
+import io
+import multiprocessing
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 
+from fastapi import HTTPException, UploadFile, status
 
-class UploadFileService:
-    def __init__(self, cloud_name, api_key, api_secret):
-        """
-        Ініціалізація сервісу для завантаження файлів на Cloudinary.
+from src.conf.config import settings
+
+# Формати, які приймаються як аватар (за вмістом файлу, а не його назвою)
+AVATAR_FORMATS = {"JPEG", "PNG", "WEBP", "GIF"}
+# Розмір частини при потоковому читанні завантаженого файлу
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ImageTooLargeError(ValueError):
+    """
+    Розміри зображення перевищують допустиму кількість пікселів.
+    """
+
+
+def resize_avatar(data: bytes, size: int, max_pixels: int, quality: int) -> bytes:
+    """
+    Обрізає зображення до квадрата `size`x`size` і кодує його у WEBP.
+
+    Виконується в окремому процесі (див. `AvatarProcessor`). Розміри
+    зображення перевіряються за заголовком файлу ще до декодування, тож
+    "бомба декомпресії" (маленький файл з величезною роздільністю) не
+    розпаковується в пам'ять. JPEG декодується одразу зі зменшенням
+    (`Image.draft`), що в рази скорочує пам'ять і час для фото з камери.
+    З анімованих зображень береться лише перший кадр.
+
+    Аргументи:
+        data: Вміст завантаженого файлу.
+        size: Сторона квадратного аватара в пікселях.
+        max_pixels: Максимальна кількість пікселів вихідного зображення.
+        quality: Якість кодування WEBP (0-100).
+
+    Повертає:
+        Зображення у форматі WEBP.
 
+    Викидає:
+        ImageTooLargeError: Якщо зображення має більше `max_pixels` пікселів.
+        ValueError: Якщо формат зображення не підтримується.
+        OSError: Якщо файл пошкоджений.
+    """
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    with warnings.catch_warnings():
+        # Попередження Pillow про "бомбу декомпресії" стає помилкою
+        warnings.simplefilter("error", Image.DecompressionBombWarning)
+        try:
+            image = Image.open(io.BytesIO(data), formats=sorted(AVATAR_FORMATS))
+        except (Image.DecompressionBombError, Image.DecompressionBombWarning) as e:
+            raise ImageTooLargeError(str(e)) from e
+    with image:
+        if image.width * image.height > max_pixels:
+            raise ImageTooLargeError(f"{image.width}x{image.height}")
+        image.draft("RGB", (size, size))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        avatar = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    avatar.save(output, format="WEBP", quality=quality, method=4)
+    return output.getvalue()
+
+
+class AvatarProcessor:
+    """
+    Перевірка та зменшення аватарів перед завантаженням у сховище.
+
+    Файл читається частинами з обмеженням `max_bytes`, тож завеликий
+    запит відхиляється, не потрапляючи в пам'ять повністю. Зображення
+    обрізається до `size`x`size` і перекодовується у WEBP в пулі процесів
+    (декодування й масштабування навантажують CPU і не звільняють GIL
+    повністю), тому цикл подій не блокується, а у сховище передаються
+    кілька десятків кілобайт замість мегабайтних фото.
+
+    Пул створюється методом `start` у lifespan застосунку. Процеси
+    запускаються через forkserver (або spawn, де він недоступний), а не
+    fork: копія процесу з робочим циклом подій, пулом з'єднань до бази
+    даних і потоками може зависнути на успадкованих блокуваннях.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_bytes: int,
+        max_pixels: int,
+        quality: int,
+        workers: int,
+    ):
+        """
         Аргументи:
-            cloud_name: Ім'я хмари в Cloudinary.
-            api_key: API ключ для доступу до Cloudinary.
-            api_secret: API секрет для доступу до Cloudinary.
-        """
-        self.cloud_name = cloud_name
-        self.api_key = api_key
-        self.api_secret = api_secret
-        # Налаштування Cloudinary для завантаження файлів
-        cloudinary.config(
-            cloud_name=self.cloud_name,
-            api_key=self.api_key,
-            api_secret=self.api_secret,
-            secure=True,
-        )
+            size: Сторона квадратного аватара в пікселях.
+            max_bytes: Максимальний розмір завантаженого файлу в байтах.
+            max_pixels: Максимальна кількість пікселів вихідного зображення.
+            quality: Якість кодування WEBP (0-100).
+            workers: Кількість процесів для обробки зображень.
+        """
+        self.size = size
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.quality = quality
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
 
     @staticmethod
-    def upload_file(file, username) -> str:
+    def _mp_context():
+        methods = multiprocessing.get_all_start_methods()
+        return multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn"
+        )
+
+    def start(self) -> None:
+        """
+        Створює пул процесів (при старті застосунку).
         """
-        Завантажує файл на Cloudinary і генерує URL для доступу до зображення.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=self._mp_context()
+            )
 
-        Формує унікальний ідентифікатор для користувача і завантажує файл на сервер.
-        Після успішного завантаження повертає URL зображення з певними параметрами (розмір, обрізка).
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Поза застосунком (тести, бенчмарки) пул створюється при першому виклику
+        self.start()
+        return self._executor
 
-        Аргументи:
-            file: Файл для завантаження.
-            username: Ім'я користувача для формування унікального public_id.
-
-        Повертає:
-            str: URL зображення, доступного на Cloudinary.
-        """
-        # Створення унікального public_id для користувача
-        public_id = f"RestApp/{username}"
-        # Завантаження файлу на сервер Cloudinary
-        r = cloudinary.uploader.upload(file.file, public_id=public_id, overwrite=True)
-        # Формування URL для доступу до зображення з відповідними розмірами
-        src_url = cloudinary.CloudinaryImage(public_id).build_url(
-            width=250, height=250, crop="fill", version=r.get("version")
-        )
-        return src_url
\ No newline at end of file
+    async def read(self, file: UploadFile) -> bytes:
+        """
+        Читає завантажений файл частинами, не більше `max_bytes` байт.
+
+        Викидає:
+            HTTPException (413): Якщо файл більший за `max_bytes`.
+        """
+        chunks = []
+        total = 0
+        while chunk := await file.read(READ_CHUNK_SIZE):
+            total += len(chunk)
+            if total > self.max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Файл аватара перевищує {self.max_bytes} байт",
+                )
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def process(self, file: UploadFile) -> bytes:
+        """
+        Перевіряє завантажений файл і повертає аватар у форматі WEBP.
+
+        Викидає:
+            HTTPException (413): Якщо файл або роздільність зображення завеликі.
+            HTTPException (415): Якщо файл не є зображенням підтримуваного формату.
+        """
+        data = await self.read(file)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self.executor,
+                resize_avatar,
+                data,
+                self.size,
+                self.max_pixels,
+                self.quality,
+            )
+        except ImageTooLargeError:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Зображення перевищує {self.max_pixels} пікселів",
+            )
+        except (ValueError, OSError):
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Непідтримуваний або пошкоджений файл зображення",
+            )
+
+    def shutdown(self) -> None:
+        """
+        Зупиняє пул процесів (при зупинці застосунку).
+        """
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+avatar_processor = AvatarProcessor(
+    settings.AVATAR_SIZE,
+    settings.AVATAR_MAX_BYTES,
+    settings.AVATAR_MAX_PIXELS,
+    settings.AVATAR_QUALITY,
+    settings.AVATAR_WORKERS,
+)
\ No newline at end of file
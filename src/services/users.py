@@ -1,9 +1,12 @@
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from libgravatar import Gravatar
 
+from src.database.db import after_commit
 from src.database.models import User
-from src.repository.users import UserRepository
+from src.repository.users import UserConflictError, UserRepository
 from src.schemas import UserCreate
+from src.services.token_versions import token_versions
 
 
 class UserService:
@@ -15,8 +18,14 @@ class UserService:
             db: Об'єкт асинхронної сесії бази даних.
         """
         # Ініціалізація репозиторію для роботи з користувачами
+        self.db = db
         self.repository = UserRepository(db)
 
+    def _invalidate_token_version(self, user_id: int) -> None:
+        # Кеш версії токенів оновлюється лише після фіксації транзакції:
+        # інакше паралельний запит міг би закешувати стару версію з бази
+        after_commit(self.db, lambda: token_versions.invalidate(user_id))
+
     async def create_user(self, body: UserCreate) -> User:
         """
         Створює нового користувача.
@@ -25,10 +34,13 @@ class UserService:
         користувача в базі даних.
 
         Аргументи:
-            body: Дані користувача для створення нового запису.
+            body: Дані користувача для створення нового запису (пароль уже захешований).
 
         Повертає:
             User: Створений користувач.
+
+        Викидає:
+            HTTPException: 409, якщо користувач з таким email або іменем вже існує.
         """
         # Створення аватара за допомогою Gravatar
         avatar = None
@@ -40,7 +52,15 @@ class UserService:
             print(e)
 
         # Створення користувача в базі даних через репозиторій
-        return await self.repository.create_user(body, avatar)
+        try:
+            return await self.repository.create_user(body, avatar)
+        except UserConflictError as e:
+            detail = (
+                "Користувач з таким email вже існує"
+                if e.field == "email"
+                else "Користувач з таким іменем вже існує"
+            )
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
 
     async def get_user_by_id(self, user_id: int) -> User | None:
         """
@@ -68,6 +88,21 @@ class UserService:
         # Отримання користувача за username
         return await self.repository.get_user_by_username(username)
 
+    async def get_user_for_auth(self, username: str) -> User | None:
+        """
+        Отримує користувача за username для перевірки токена доступу.
+
+        Паралельні однакові запити об'єднуються в один, тому результат
+        призначений лише для читання.
+
+        Аргументи:
+            username: Ім'я користувача.
+
+        Повертає:
+            User або None: Знайдений користувач або None, якщо користувача не знайдено.
+        """
+        return await self.repository.get_user_for_auth(username)
+
     async def get_user_by_email(self, email: str) -> User | None:
         """
         Отримує користувача за email.
@@ -119,5 +154,55 @@ class UserService:
         Повертає:
             User: Оновлений користувач.
         """
-        # Скидання пароля користувача
-        return await self.repository.reset_password(user_id, password)
\ No newline at end of file
+        # Скидання пароля користувача та відкликання виданих токенів
+        user = await self.repository.reset_password(user_id, password)
+        if user:
+            self._invalidate_token_version(user.id)
+        return user
+
+    async def update_password_hash(self, user_id: int, password: str) -> None:
+        """
+        Замінює хеш пароля користувача на новий з актуальними параметрами.
+
+        На відміну від `reset_password`, не відкликає видані токени.
+
+        Аргументи:
+            user_id: ID користувача.
+            password: Новий хеш пароля.
+
+        Повертає:
+            None
+        """
+        return await self.repository.update_password_hash(user_id, password)
+
+    async def get_token_version(self, user_id: int) -> int | None:
+        """
+        Отримує поточну версію токенів користувача з бази даних.
+
+        Аргументи:
+            user_id: ID користувача.
+
+        Повертає:
+            int або None: Версія токенів або None, якщо користувача не знайдено.
+        """
+        return await self.repository.get_token_version(user_id)
+
+    async def delete_user(self, user_id: int) -> bool:
+        """
+        Видаляє обліковий запис користувача (м'яке видалення).
+
+        Користувач одразу перестає автентифікуватися, а всі його токени
+        відкликаються. Дані користувача остаточно видаляє фоновий
+        `SoftDeletePurger`, тому відповідь не чекає на видалення контактів.
+
+        Аргументи:
+            user_id: ID користувача.
+
+        Повертає:
+            bool: True, якщо користувача видалено, False, якщо його не знайдено.
+        """
+        version = await self.repository.soft_delete_user(user_id)
+        if version is None:
+            return False
+        self._invalidate_token_version(user_id)
+        return True
@@ -1,16 +1,26 @@
 import asyncio
+import os
+from datetime import date
 from unittest.mock import MagicMock
 import pytest
 import pytest_asyncio
+from aiocache import caches
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
+from sqlalchemy import insert, update
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+# Тести працюють без Redis і з налагоджувальними заголовками
+os.environ.setdefault("CACHE_BACKEND", "memory")
+os.environ.setdefault("ENV", "development")
+
 from main import app
 from src.database.models import Base, User, Contact
-from src.database.db import get_db
+from src.database.db import get_db, run_after_commit
 from src.schemas import ContactModel
 from src.services.auth import create_access_token, Hash
+from src.services.contacts import ContactService
 
 DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
@@ -87,6 +97,115 @@ def contact_body():
     )
 
 
+@pytest.fixture
+def make_contact_body():
+    """
+    Фабрика тіл запитів контактів з унікальними email і телефоном для номера n.
+    """
+
+    def factory(n: int, **overrides) -> ContactModel:
+        data = {
+            "name": "Name",
+            "surname": "Surname",
+            "email": f"c{n}@example.com",
+            "phone": f"+380000000{n}",
+            "birthday": date(1990, 1, 1),
+        }
+        data.update(overrides)
+        return ContactModel(**data)
+
+    return factory
+
+
+@pytest.fixture
+def make_contact(make_contact_body):
+    """
+    Фабрика рядків таблиці contacts для `insert(Contact)` на основі `make_contact_body`.
+
+    Поля ContactModel передаються в тіло контакту, решта (наприклад,
+    `deleted_at`, `updated_at`, `phone_normalized`) — у рядок таблиці.
+    """
+
+    def factory(n: int, user_id: int = 1, **overrides) -> dict:
+        fields = {
+            key: overrides.pop(key)
+            for key in list(overrides)
+            if key in ContactModel.model_fields
+        }
+        row = make_contact_body(n, **fields).model_dump()
+        row.update(id=n, user_id=user_id)
+        row.update(overrides)
+        return row
+
+    return factory
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """
+    Фабрика сесій окремої бази SQLite в пам'яті з порожньою схемою.
+    """
+    memory_engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with memory_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(memory_engine, expire_on_commit=False)
+    await memory_engine.dispose()
+    await caches.get("default").clear()
+
+
+@pytest_asyncio.fixture
+async def db(session_factory):
+    """
+    Сесія бази SQLite в пам'яті з користувачами 1 ("a") і 2 ("b").
+    """
+    async with session_factory() as session:
+        await session.execute(
+            insert(User), [{"id": 1, "username": "a"}, {"id": 2, "username": "b"}]
+        )
+        yield session
+
+
+@pytest_asyncio.fixture
+async def seeded_contacts(request, db, make_contact_body):
+    """
+    Контакти в сесії `db`, задані параметром фікстури (`indirect=True`).
+
+    Параметр — словник {user_id: номери}, де номер — це n або (n, перевизначення).
+    Контакти створюються через ContactService у порядку зростання n, тож
+    лічильники і версії змін користувача узгоджені, а id збігається з n. Поля ContactModel
+    передаються в тіло контакту, решта (наприклад, `deleted_at`) записується
+    в рядок напряму після створення. Відсутні користувачі створюються.
+
+    Повертає словник {n: Contact}.
+    """
+    rows = []
+    for user_id, numbers in request.param.items():
+        if await db.get(User, user_id) is None:
+            db.add(User(id=user_id, username=f"user{user_id}"))
+            await db.flush()
+        for number in numbers:
+            n, overrides = number if isinstance(number, tuple) else (number, {})
+            rows.append((n, user_id, overrides))
+
+    service = ContactService(db)
+    contacts = {}
+    for n, user_id, overrides in sorted(rows):
+        fields = {
+            key: value
+            for key, value in overrides.items()
+            if key in ContactModel.model_fields
+        }
+        contacts[n] = await service.create_contact(
+            make_contact_body(n, **fields), await db.get(User, user_id)
+        )
+        columns = {key: value for key, value in overrides.items() if key not in fields}
+        if columns:
+            await db.execute(
+                update(Contact).where(Contact.id == contacts[n].id).values(**columns)
+            )
+    return contacts
+
+
 @pytest.fixture(scope="module", autouse=True)
 def init_models_wrap():
     async def init_models():
@@ -118,9 +237,11 @@ def client():
         async with TestingSessionLocal() as session:
             try:
                 yield session
+                await session.commit()
             except Exception as err:
                 await session.rollback()
                 raise
+            await run_after_commit(session)
 
     app.dependency_overrides[get_db] = override_get_db
 
@@ -0,0 +1,105 @@
+from unittest.mock import AsyncMock
+import pytest
+from src.database.models import User, UserRole
+from src.services import auth
+
+
+@pytest.fixture
+def user():
+    return User(
+        id=1,
+        username="testuser",
+        email="test@example.com",
+        role=UserRole.ADMIN,
+        token_version=3,
+    )
+
+
+def test_build_access_claims_default(user, monkeypatch):
+    monkeypatch.setattr(auth.settings, "JWT_STATELESS_CLAIMS", False)
+
+    claims = auth.build_access_claims(user)
+
+    assert claims == {"sub": "testuser", "jti": claims["jti"]}
+    assert len(claims["jti"]) == 32
+
+
+def test_build_access_claims_stateless(user, monkeypatch):
+    monkeypatch.setattr(auth.settings, "JWT_STATELESS_CLAIMS", True)
+
+    claims = auth.build_access_claims(user)
+
+    assert claims["sub"] == "testuser"
+    assert claims["uid"] == 1
+    assert claims["role"] == "admin"
+    assert claims["tv"] == 3
+    assert claims["cv"] == auth.CLAIMS_VERSION
+
+
+@pytest.mark.asyncio
+async def test_get_user_from_claims(user, monkeypatch):
+    monkeypatch.setattr(auth.settings, "JWT_STATELESS_CLAIMS", True)
+    monkeypatch.setattr(auth.token_versions, "get", AsyncMock(return_value=3))
+    payload = auth.build_access_claims(user)
+
+    result = await auth.get_user_from_claims(payload, AsyncMock())
+
+    assert result.id == 1
+    assert result.username == "testuser"
+    assert result.role == UserRole.ADMIN
+
+
+@pytest.mark.asyncio
+async def test_get_user_from_claims_revoked(user, monkeypatch):
+    monkeypatch.setattr(auth.settings, "JWT_STATELESS_CLAIMS", True)
+    monkeypatch.setattr(auth.token_versions, "get", AsyncMock(return_value=4))
+    payload = auth.build_access_claims(user)
+
+    result = await auth.get_user_from_claims(payload, AsyncMock())
+
+    assert result is None
+
+
+def test_hash_configure_uses_fixed_rounds(monkeypatch):
+    monkeypatch.setattr(auth.Hash, "pwd_context", None)
+    monkeypatch.setattr(auth.settings, "BCRYPT_ROUNDS", 5)
+
+    context = auth.Hash.configure()
+    hashed = auth.Hash().get_password_hash("secret")
+
+    assert auth.Hash.pwd_context is context
+    assert hashed.startswith("$2b$05$")
+    assert auth.Hash().verify_password("secret", hashed)
+    assert not auth.Hash().verify_password("wrong", hashed)
+
+
+def test_hash_configure_requires_argon2_backend(monkeypatch):
+    monkeypatch.setattr(auth.Hash, "pwd_context", None)
+    monkeypatch.setattr(auth.passlib_hash.argon2, "has_backend", lambda: False)
+
+    with pytest.raises(RuntimeError):
+        auth.Hash.configure(scheme="argon2")
+    assert auth.Hash.pwd_context is None
+
+
+def test_calibrate_bcrypt_rounds(monkeypatch):
+    # Хешування з вартістю 10 "триває" 10 мс
+    ticks = iter([0.0, 0.01] * 3)
+    monkeypatch.setattr(auth.time, "perf_counter", lambda: next(ticks))
+
+    assert auth.Hash.calibrate_bcrypt_rounds(45) == 12
+    assert auth.Hash.calibrate_bcrypt_rounds(1) == 10
+    assert auth.Hash.calibrate_bcrypt_rounds(10**6) == 16
+
+
+@pytest.mark.asyncio
+async def test_needs_update_detects_only_outdated_hashes(monkeypatch):
+    monkeypatch.setattr(auth.Hash, "pwd_context", None)
+    auth.Hash.configure(bcrypt_rounds=5)
+    outdated = auth.passlib_hash.bcrypt.using(rounds=4).hash("secret")
+    current = auth.Hash().get_password_hash("secret")
+
+    assert await auth.Hash().verify_password_async("secret", outdated)
+    assert not await auth.Hash().verify_password_async("wrong", outdated)
+    assert auth.Hash().needs_update(outdated)
+    assert not auth.Hash().needs_update(current)
@@ -0,0 +1,87 @@
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+
+from src.services.upload_file import (
+    AvatarProcessor,
+    ImageTooLargeError,
+    resize_avatar,
+)
+
+
+def image_bytes(size, format="JPEG", mode="RGB", color="red") -> bytes:
+    output = io.BytesIO()
+    Image.new(mode, size, color).save(output, format=format)
+    return output.getvalue()
+
+
+def test_resize_avatar_crops_to_square_webp():
+    avatar = resize_avatar(image_bytes((1600, 900)), 250, 10_000_000, 80)
+
+    with Image.open(io.BytesIO(avatar)) as image:
+        assert (image.format, image.size, image.mode) == ("WEBP", (250, 250), "RGB")
+
+
+def test_resize_avatar_keeps_transparency():
+    data = image_bytes((400, 400), "PNG", "RGBA", (255, 0, 0, 128))
+
+    with Image.open(io.BytesIO(resize_avatar(data, 100, 10_000_000, 80))) as image:
+        assert image.mode == "RGBA"
+
+
+@pytest.mark.parametrize("size", [(1200, 1000), (3000, 3000)])
+def test_resize_avatar_rejects_too_many_pixels(size):
+    data = image_bytes(size, format="PNG")
+
+    with pytest.raises(ImageTooLargeError):
+        resize_avatar(data, 250, 1_000_000, 80)
+
+
+def test_resize_avatar_rejects_unsupported_data():
+    with pytest.raises(OSError):
+        resize_avatar(b"<svg></svg>" * 10, 250, 1_000_000, 80)
+    with pytest.raises(OSError):
+        resize_avatar(image_bytes((100, 100), format="BMP"), 250, 1_000_000, 80)
+
+
+@pytest.mark.asyncio
+async def test_processor_validates_upload():
+    processor = AvatarProcessor(
+        size=64, max_bytes=50_000, max_pixels=1_000_000, quality=80, workers=1
+    )
+
+    def upload(data: bytes) -> UploadFile:
+        return UploadFile(file=io.BytesIO(data), filename="avatar.png")
+
+    try:
+        avatar = await processor.process(upload(image_bytes((300, 200))))
+        with pytest.raises(HTTPException) as too_big:
+            await processor.process(upload(b"\0" * 60_000))
+        with pytest.raises(HTTPException) as not_image:
+            await processor.process(upload(b"not an image"))
+    finally:
+        processor.shutdown()
+
+    with Image.open(io.BytesIO(avatar)) as image:
+        assert image.size == (64, 64)
+    assert too_big.value.status_code == 413
+    assert not_image.value.status_code == 415
+
+
+def test_processor_pool_does_not_fork():
+    processor = AvatarProcessor(
+        size=64, max_bytes=50_000, max_pixels=1_000_000, quality=80, workers=1
+    )
+
+    processor.start()
+    executor = processor.executor
+    processor.start()
+
+    try:
+        assert processor.executor is executor
+        assert executor._mp_context.get_start_method() in ("forkserver", "spawn")
+    finally:
+        processor.shutdown()
+    assert processor._executor is None
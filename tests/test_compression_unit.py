@@ -0,0 +1,103 @@
+import threading
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response
+from fastapi.testclient import TestClient
+
+from src.middleware import compression
+from src.middleware.compression import CompressionMiddleware, negotiate_encoding
+
+calls = {"openapi": 0}
+
+
+def make_app() -> FastAPI:
+    app = FastAPI(openapi_url=None)
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/big")
+    async def big():
+        return [{"name": "Olena", "email": "olena@example.com"}] * 50
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/png")
+    async def png():
+        return Response(b"\x89PNG" * 100, media_type="image/png")
+
+    @app.get("/openapi.json")
+    async def openapi():
+        calls["openapi"] += 1
+        return PlainTextResponse("{}" * 500, media_type="application/json")
+
+    return app
+
+
+def test_negotiate_encoding_respects_quality():
+    supported = ["zstd", "br", "gzip"]
+
+    assert negotiate_encoding("gzip, deflate, br", supported) == "br"
+    assert negotiate_encoding("br;q=0.5, gzip", supported) == "gzip"
+    assert negotiate_encoding("*;q=0.1, zstd;q=0", supported) == "br"
+    assert negotiate_encoding("identity", supported) is None
+    assert negotiate_encoding("", supported) is None
+
+
+def test_compresses_only_large_compressible_responses():
+    client = TestClient(make_app())
+    headers = {"Accept-Encoding": "gzip"}
+
+    big = client.get("/big", headers=headers)
+    small = client.get("/small", headers=headers)
+    png = client.get("/png", headers=headers)
+
+    assert big.headers["content-encoding"] == "gzip"
+    assert big.headers["vary"] == "Accept-Encoding"
+    assert int(big.headers["content-length"]) < len(big.content)
+    assert big.json()[0]["name"] == "Olena"
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"] == "Accept-Encoding"
+    assert "content-encoding" not in png.headers
+
+
+def test_static_path_is_compressed_once():
+    client = TestClient(make_app())
+    calls["openapi"] = 0
+
+    responses = [
+        client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        for _ in range(3)
+    ]
+    plain = client.get("/openapi.json", headers={"Accept-Encoding": "identity"})
+
+    assert calls["openapi"] == 2
+    assert all(r.headers["content-encoding"] == "gzip" for r in responses)
+    assert responses[-1].content == b"{}" * 500
+    assert "content-encoding" not in plain.headers
+    assert plain.content == b"{}" * 500
+
+
+def test_zstd_compressor_is_not_shared_between_threads(monkeypatch):
+    created = []
+
+    class FakeCompressor:
+        def __init__(self, level):
+            created.append(self)
+
+        def compress(self, data: bytes) -> bytes:
+            return data
+
+    monkeypatch.setattr(
+        compression, "zstandard", SimpleNamespace(ZstdCompressor=FakeCompressor)
+    )
+    compress = compression.available_encodings()["zstd"]
+
+    compress(b"a")
+    compress(b"b")
+    thread = threading.Thread(target=compress, args=(b"c",))
+    thread.start()
+    thread.join()
+
+    assert len(created) == 2
@@ -0,0 +1,59 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from src.database.models import Contact, User
+from src.schemas import ContactBatchRequest
+from src.services.contacts import ContactService
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seeded_contacts", [{1: [1, 2, 3, 4], 2: [5]}], indirect=True)
+async def test_batch_returns_results_in_request_order(
+    db, seeded_contacts, make_contact_body
+):
+    user = await db.get(User, 1)
+    request = ContactBatchRequest(
+        operations=[
+            {"op": "update", "id": 2, "data": make_contact_body(2, name="Updated2")},
+            {"op": "get", "id": 1},
+            {"op": "delete", "id": 3},
+            {"op": "get", "id": 5},
+            {"op": "delete", "id": 99},
+            {
+                "op": "update",
+                "id": 4,
+                "data": make_contact_body(4, name="Updated4", email="c1@example.com"),
+            },
+        ]
+    )
+
+    results = await ContactService(db).batch(request.operations, user)
+
+    assert [(r.op.value, r.id, r.status) for r in results] == [
+        ("update", 2, 200),
+        ("get", 1, 200),
+        ("delete", 3, 200),
+        ("get", 5, 404),
+        ("delete", 99, 404),
+        ("update", 4, 409),
+    ]
+    assert results[0].contact.name == "Updated2"
+    assert results[1].contact.email == "c1@example.com"
+    names = dict((await db.execute(select(Contact.id, Contact.name))).all())
+    assert names[2] == "Updated2"
+    assert names[4] == "Name"
+    deleted = await db.scalar(select(Contact.deleted_at).where(Contact.id == 3))
+    assert deleted is not None
+
+
+def test_batch_request_rejects_duplicate_ids():
+    with pytest.raises(ValidationError):
+        ContactBatchRequest(
+            operations=[{"op": "get", "id": 1}, {"op": "delete", "id": 1}]
+        )
+
+
+def test_batch_request_requires_data_for_update():
+    with pytest.raises(ValidationError):
+        ContactBatchRequest(operations=[{"op": "update", "id": 1}])
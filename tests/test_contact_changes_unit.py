@@ -0,0 +1,96 @@
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql
+
+from src.database.models import Contact, User
+from src.services.contacts import (
+    ContactService,
+    decode_change_token,
+    encode_change_token,
+)
+
+
+def test_change_token_round_trip():
+    issued_at = datetime(2026, 1, 2, 3, 4, 5, 678)
+
+    token = encode_change_token(7, 42, issued_at)
+    complete = encode_change_token(7, None, issued_at)
+
+    assert "|" not in token
+    assert decode_change_token(token) == (7, 42, issued_at)
+    assert decode_change_token(complete) == (7, None, issued_at)
+
+
+@pytest.mark.asyncio
+# Контакт 5 іншого користувача не потрапляє до стрічки змін користувача 1
+@pytest.mark.parametrize("seeded_contacts", [{1: [1, 2, 3, 4], 2: [5]}], indirect=True)
+async def test_get_changes_paginates_and_returns_tombstones(db, seeded_contacts):
+    user = await db.get(User, 1)
+    service = ContactService(db)
+
+    first = await service.get_changes(None, 3, user)
+    rest = await service.get_changes(first.next_token, 3, user)
+    empty = await service.get_changes(rest.next_token, 3, user)
+    await service.remove_contact(2, user)
+    deleted = await service.get_changes(empty.next_token, 3, user)
+
+    assert [c.id for c in first.changes] == [1, 2, 3]
+    assert first.has_more is True
+    assert [c.id for c in rest.changes] == [4]
+    assert rest.has_more is False
+    assert empty.changes == []
+    assert [(c.id, c.deleted, c.contact) for c in deleted.changes] == [(2, True, None)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seeded_contacts", [{1: [1, 2, 3]}], indirect=True)
+async def test_get_changes_does_not_depend_on_timestamps(
+    db, seeded_contacts, make_contact_body
+):
+    user = await db.get(User, 1)
+    service = ContactService(db)
+    token = (await service.get_changes(None, 10, user)).next_token
+
+    # Транзакція, що почалася давно, фіксує рядок зі старим updated_at
+    await service.update_contact(3, make_contact_body(3, info="late"), user)
+    await db.execute(
+        update(Contact)
+        .where(Contact.id == 3)
+        .values(updated_at=datetime.utcnow() - timedelta(hours=1))
+    )
+    changes = await service.get_changes(token, 10, user)
+
+    assert [c.id for c in changes.changes] == [3]
+
+
+@pytest.mark.asyncio
+async def test_get_changes_rejects_invalid_and_expired_tokens(db):
+    user = await db.get(User, 1)
+    service = ContactService(db)
+    old = datetime.utcnow() - timedelta(days=365)
+    legacy = base64.urlsafe_b64encode(f"{datetime.utcnow().isoformat()}|0".encode())
+
+    with pytest.raises(HTTPException) as invalid:
+        await service.get_changes("not-a-token", 10, user)
+    with pytest.raises(HTTPException) as gone:
+        await service.get_changes(encode_change_token(0, None, old), 10, user)
+    with pytest.raises(HTTPException) as legacy_gone:
+        await service.get_changes(legacy.decode(), 10, user)
+
+    assert invalid.value.status_code == 400
+    assert gone.value.status_code == 410
+    assert legacy_gone.value.status_code == 410
+
+
+def test_contact_timestamps_are_utc_on_postgresql():
+    dialect = postgresql.dialect()
+
+    contact_update = str(update(Contact).values(name="x").compile(dialect=dialect))
+    user_insert = str(insert(User).values(username="x").compile(dialect=dialect))
+
+    assert "updated_at=timezone('utc', now())" in contact_update
+    assert "timezone" not in user_insert
@@ -0,0 +1,105 @@
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from src.database.models import User
+from src.schemas import ContactBatchItem
+from src.services.contacts import ContactService, normalize_phone
+
+
+@pytest.mark.parametrize(
+    "phone, expected",
+    [
+        ("+380 50 123-45-67", "380501234567"),
+        ("(050) 123 45 67", "380501234567"),
+        ("00380501234567", "380501234567"),
+        ("+1 (212) 555-0100", "12125550100"),
+        ("380501234567", "380501234567"),
+        ("n/a", None),
+    ],
+)
+def test_normalize_phone(phone, expected):
+    assert normalize_phone(phone) == expected
+
+
+def test_normalize_phone_uses_country_code():
+    assert normalize_phone("030 1234567", country_code="49") == "49301234567"
+
+
+@pytest.mark.asyncio
+async def test_create_contact_rejects_same_phone_in_other_format(db, make_contact_body):
+    user = await db.get(User, 1)
+    service = ContactService(db)
+
+    created = await service.create_contact(
+        make_contact_body(1, phone="+380 50 123 45 67"), user
+    )
+    with pytest.raises(HTTPException) as duplicate:
+        await service.create_contact(make_contact_body(2, phone="050-123-45-67"), user)
+
+    assert created.phone_normalized == "380501234567"
+    assert duplicate.value.status_code == 400
+
+
+def test_contact_model_rejects_phone_without_digits(make_contact_body):
+    with pytest.raises(ValidationError):
+        make_contact_body(1, phone="not a phone")
+
+
+@pytest.mark.asyncio
+async def test_phone_without_digits_is_not_a_duplicate(db, make_contact_body):
+    user = await db.get(User, 1)
+    service = ContactService(db)
+    # Старі рядки з номером без цифр мають NULL замість нормалізованого номера
+    body = make_contact_body(1).model_copy(update={"phone": "unknown"})
+    await service.repository.create_contact(body, user, normalize_phone(body.phone))
+
+    created = await service.create_contact(
+        make_contact_body(2).model_copy(update={"phone": "n/a-n/a"}), user
+    )
+
+    assert created.phone_normalized is None
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_filters_by_normalized_phone_prefix(db, make_contact_body):
+    user = await db.get(User, 1)
+    service = ContactService(db)
+    await service.create_contact(make_contact_body(1, phone="+380 50 123 45 67"), user)
+    await service.create_contact(make_contact_body(2, phone="+380 67 765 43 21"), user)
+
+    contacts = await service.get_contacts("", "", "", "050 12", 0, 10, user)
+
+    assert [c.email for c in contacts] == ["c1@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_updates_recompute_normalized_phone(db, make_contact_body):
+    user = await db.get(User, 1)
+    service = ContactService(db)
+    first = await service.create_contact(
+        make_contact_body(1, phone="+380501234567"), user
+    )
+    second = await service.create_contact(
+        make_contact_body(2, phone="+380671234567"), user
+    )
+
+    await service.update_contact(
+        first.id, make_contact_body(1, phone="0931112233"), user
+    )
+    await service.batch(
+        [
+            ContactBatchItem(
+                op="update", id=second.id, data=make_contact_body(2, phone="044 111 22")
+            )
+        ],
+        user,
+    )
+
+    phones = {
+        c.id: c.phone_normalized
+        for c in await service.repository.get_contacts_by_ids(
+            [first.id, second.id], user
+        )
+    }
+    assert phones == {first.id: "380931112233", second.id: "3804411122"}
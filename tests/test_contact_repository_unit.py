@@ -64,12 +64,38 @@ async def test_get_contacts(contact_repository, mock_session, user, contact):
         name="",
         surname="",
         email="",
+        phone="",
     )
 
     assert len(contacts) == 1
     assert contacts[0].name == "Evan"
 
 
+@pytest.mark.asyncio
+async def test_get_contacts_lean_reads(
+    contact_repository, mock_session, user, contact, monkeypatch
+):
+    monkeypatch.setattr("src.repository.contacts.settings.DB_LEAN_READS", True)
+    mock_result = MagicMock()
+    mock_result.all.return_value = [contact]
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    contacts = await contact_repository.get_contacts(
+        skip=0,
+        limit=10,
+        user=user,
+        name="",
+        surname="",
+        email="",
+        phone="",
+    )
+
+    stmt = mock_session.execute.await_args.args[0]
+    assert "contacts.user_id = :user_id_1" in str(stmt)
+    assert contacts[0].name == "Evan"
+    mock_result.scalars.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_get_contact_by_id(contact_repository, mock_session, user, contact):
     mock_result = MagicMock()
@@ -85,28 +111,38 @@ async def test_get_contact_by_id(contact_repository, mock_session, user, contact
 
 @pytest.mark.asyncio
 async def test_create_contact_successful(
-    contact_repository, mock_session, user, contact_body
+    contact_repository, mock_session, user, contact, contact_body
 ):
+    mock_result = MagicMock()
+    mock_result.scalar_one.side_effect = [5, contact]
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
     result = await contact_repository.create_contact(body=contact_body, user=user)
 
+    counter, stmt = [call.args[0] for call in mock_session.execute.await_args_list]
+    assert str(counter).startswith("UPDATE users SET contacts_count")
+    assert stmt.compile().params["user_id"] == user.id
+    assert stmt.compile().params["change_version"] == 5
     assert isinstance(result, Contact)
     assert result.name == "Evan"
-    mock_session.add.assert_called_once()
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(result)
+    mock_session.commit.assert_not_awaited()
+    mock_session.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_create_contact_failure(
-    contact_repository, mock_session, user, contact_body
+    contact_repository, mock_session, user, contact, contact_body
 ):
+    mock_result = MagicMock()
+    mock_result.scalar_one.return_value = contact
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
     result = await contact_repository.create_contact(body=contact_body, user=user)
 
     assert isinstance(result, Contact)
     assert result.name != "Evan2"
-    mock_session.add.assert_called_once()
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(result)
+    mock_session.commit.assert_not_awaited()
+    mock_session.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -114,6 +150,7 @@ async def test_update_contact(contact_repository, mock_session, user, contact):
     contact_data = ContactModel(**contact.__dict__)
     contact_data.name = "Evan2"
     mock_result = MagicMock()
+    mock_result.scalar_one.return_value = 5
     mock_result.scalar_one_or_none.return_value = contact
     mock_session.execute = AsyncMock(return_value=mock_result)
 
@@ -121,15 +158,19 @@ async def test_update_contact(contact_repository, mock_session, user, contact):
         contact_id=1, body=contact_data, user=user
     )
 
-    assert result is not None
-    assert result.name == "Evan2"
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(contact)
+    counter, stmt = [call.args[0] for call in mock_session.execute.await_args_list]
+    assert "contacts_version" in str(counter)
+    assert stmt.compile().params["name"] == "Evan2"
+    assert stmt.compile().params["change_version"] == 5
+    assert result is contact
+    mock_session.commit.assert_not_awaited()
+    mock_session.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_remove_contact(contact_repository, mock_session, user, contact):
     mock_result = MagicMock()
+    mock_result.scalar_one.return_value = 5
     mock_result.scalar_one_or_none.return_value = contact
     mock_session.execute = AsyncMock(return_value=mock_result)
 
@@ -137,8 +178,15 @@ async def test_remove_contact(contact_repository, mock_session, user, contact):
 
     assert result is not None
     assert result.name == "Evan"
-    mock_session.delete.assert_awaited_once_with(contact)
-    mock_session.commit.assert_awaited_once()
+    version, stmt, counter = [
+        call.args[0] for call in mock_session.execute.await_args_list
+    ]
+    assert "contacts_version" in str(version)
+    assert str(stmt).startswith("UPDATE")
+    assert stmt.compile().params["deleted_at"] is not None
+    assert stmt.compile().params["change_version"] == 5
+    assert str(counter).startswith("UPDATE users SET contacts_count")
+    mock_session.commit.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -168,4 +216,4 @@ async def test_is_contact_exists_failure(
         "qwerty@gmail.com", "111-22-33", user=user
     )
 
-    assert is_contact_exist is False
\ No newline at end of file
+    assert is_contact_exist is False
@@ -0,0 +1,81 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.database.models import User
+from src.repository.contacts import ContactRepository
+
+
+def person(n, name, surname, info):
+    return (
+        n,
+        {
+            "name": name,
+            "surname": surname,
+            "email": f"{name.lower()}{n}@example.com",
+            "phone": f"+38050111{n:04d}",
+            "info": info,
+        },
+    )
+
+
+SEEDED = pytest.mark.parametrize(
+    "seeded_contacts",
+    [
+        {
+            1: [
+                person(1, "Olena", "Shevchenko", "met at conference"),
+                person(2, "Ivan", "Koval", "Olena's brother"),
+                person(4, "Maria", "Tkachenko", "100% reliable"),
+            ],
+            2: [person(3, "Olena", "Bondar", None)],
+        }
+    ],
+    indirect=True,
+)
+
+
+@pytest.mark.asyncio
+@SEEDED
+async def test_search_ranks_name_matches_first(db, seeded_contacts):
+    repository = ContactRepository(db)
+    user = await db.get(User, 1)
+
+    contacts = await repository.search_contacts("olena", 0, 10, user)
+
+    assert [c.id for c in contacts] == [1, 2]
+
+
+@pytest.mark.asyncio
+@SEEDED
+async def test_search_matches_all_terms_phone_and_escapes_wildcards(
+    db, seeded_contacts
+):
+    repository = ContactRepository(db)
+    user = await db.get(User, 1)
+
+    assert [
+        c.id for c in await repository.search_contacts("ivan olena", 0, 10, user)
+    ] == [2]
+    assert [c.id for c in await repository.search_contacts("0004", 0, 10, user)] == [4]
+    assert [c.id for c in await repository.search_contacts("100%", 0, 10, user)] == [4]
+    assert await repository.search_contacts("_", 0, 10, user) == []
+    assert await repository.search_contacts("   ", 0, 10, user) == []
+
+
+@pytest.mark.asyncio
+async def test_search_uses_fulltext_index_on_postgresql(user):
+    session = MagicMock()
+    session.bind.dialect.name = "postgresql"
+    session.execute = AsyncMock(return_value=MagicMock())
+    repository = ContactRepository(session)
+
+    await repository.search_contacts("Olena +38 050", 0, 20, user)
+
+    stmt = session.execute.await_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    assert "contacts.search_vector @@" in sql
+    assert "ts_rank_cd(contacts.search_vector" in sql
+    assert "38050:*" in params.values()
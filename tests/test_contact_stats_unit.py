@@ -0,0 +1,95 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.database.models import User
+from src.schemas import ContactBatchItem
+from src.services.contacts import ContactService
+
+TEN_DAYS_AGO = datetime.utcnow() - timedelta(days=10)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seeded_contacts", [{1: [1, 2, 3, 4]}], indirect=True)
+async def test_contacts_count_follows_create_and_remove(db, seeded_contacts):
+    user = await db.get(User, 1)
+    service = ContactService(db)
+
+    await service.remove_contact(seeded_contacts[1].id, user)
+    await service.remove_contact(seeded_contacts[1].id, user)
+    await service.batch(
+        [
+            ContactBatchItem(op="delete", id=seeded_contacts[2].id),
+            ContactBatchItem(op="delete", id=999),
+        ],
+        user,
+    )
+
+    assert await service.count_contacts(user) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "seeded_contacts",
+    [
+        {
+            1: [
+                (1, {"birthday": date(1990, 1, 10)}),
+                (2, {"birthday": date(1990, 1, 10)}),
+                (3, {"birthday": date(1990, 5, 10), "created_at": TEN_DAYS_AGO}),
+            ]
+        }
+    ],
+    indirect=True,
+)
+async def test_get_stats_aggregates_and_refreshes_on_count_change(
+    db, seeded_contacts, make_contact_body
+):
+    user = await db.get(User, 1)
+    service = ContactService(db)
+    stats = await service.get_stats(user)
+    await service.create_contact(make_contact_body(4, birthday=date(1990, 12, 1)), user)
+    refreshed = await service.get_stats(user)
+
+    assert stats.total == 3
+    assert stats.by_birth_month[1] == 2
+    assert stats.by_birth_month[5] == 1
+    assert sum(stats.by_birth_month.values()) == 3
+    assert (stats.added_last_7_days, stats.added_last_30_days) == (2, 3)
+    assert refreshed.total == 4
+    assert refreshed.by_birth_month[12] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_stats_refreshes_after_create_delete_and_update(
+    db, make_contact_body
+):
+    user = await db.get(User, 1)
+    service = ContactService(db)
+    first = await service.create_contact(
+        make_contact_body(1, birthday=date(1990, 1, 1)), user
+    )
+    before = await service.get_stats(user)
+
+    # Кількість контактів не змінюється, але статистика має оновитися
+    second = await service.create_contact(
+        make_contact_body(2, birthday=date(1990, 7, 1)), user
+    )
+    await service.remove_contact(first.id, user)
+    swapped = await service.get_stats(user)
+    await service.batch(
+        [
+            ContactBatchItem(
+                op="update",
+                id=second.id,
+                data=make_contact_body(2, birthday=date(1990, 9, 1)),
+            )
+        ],
+        user,
+    )
+    updated = await service.get_stats(user)
+
+    assert before.total == swapped.total == updated.total == 1
+    assert before.by_birth_month[1] == 1
+    assert (swapped.by_birth_month[1], swapped.by_birth_month[7]) == (0, 1)
+    assert (updated.by_birth_month[7], updated.by_birth_month[9]) == (0, 1)
@@ -0,0 +1,94 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert
+
+from src.database.models import Contact, User
+from src.schemas import DuplicateScanStatus
+from src.services.duplicates import DuplicateScanner, find_duplicates
+
+
+def contact(id, name, surname, email, phone="", birthday=None):
+    return SimpleNamespace(
+        id=id,
+        name=name,
+        surname=surname,
+        email=email,
+        phone_normalized=phone,
+        birthday=birthday,
+    )
+
+
+def test_find_duplicates_groups_near_duplicates():
+    contacts = [
+        contact(1, "Olena", "Shevchenko", "olena.shevchenko@gmail.com"),
+        contact(2, "Shevchenko", "Olena", "OlenaShevchenko+work@gmail.com"),
+        contact(3, "Olena", "Shevchenko", "olenashevchenko@ukr.net", "380501234567"),
+        contact(4, "Olena S.", "Other", "other@example.com", "380501234567"),
+        contact(5, "Ivan", "Koval", "ivan@example.com", birthday=date(1990, 1, 1)),
+        contact(6, "Ivan", "Kovall", "koval.i@example.com", birthday=date(1990, 1, 1)),
+        contact(
+            7, "Ivan", "Koval", "ivan.koval@example.com", birthday=date(1985, 3, 3)
+        ),
+    ]
+
+    groups, comparisons = find_duplicates(contacts, min_score=0.6, max_block_size=50)
+
+    assert [group.contact_ids for group in groups] == [[1, 2, 3, 4], [5, 6]]
+    pairs = {(p.first_id, p.second_id): p for p in groups[0].pairs}
+    assert pairs[(1, 2)].reasons == ["email", "name"]
+    assert pairs[(3, 4)].reasons == ["phone"]
+    assert groups[1].pairs[0].reasons == ["name", "birthday"]
+    assert comparisons < len(contacts) * (len(contacts) - 1) // 2
+
+
+def test_find_duplicates_skips_oversized_blocks():
+    contacts = [
+        contact(n, "Ivan", "Koval", f"ivan{n}@example.com") for n in range(1, 6)
+    ]
+
+    groups, comparisons = find_duplicates(contacts, min_score=0.4, max_block_size=4)
+
+    assert groups == []
+    assert comparisons == 0
+
+
+@pytest_asyncio.fixture
+async def contacts(db, make_contact):
+    await db.execute(
+        insert(Contact),
+        [
+            make_contact(
+                n,
+                name="Anna",
+                surname="Lee",
+                email=email,
+                phone=phone,
+                phone_normalized="380000000",
+            )
+            for n, email, phone in [
+                (1, "anna@x.com", "+380000000"),
+                (2, "anna.lee@y.com", "0 000-000"),
+            ]
+        ],
+    )
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_scanner_caches_report(session_factory, contacts):
+    scanner = DuplicateScanner(0.6, 50, 60, session_factory=session_factory)
+    user = User(id=1)
+
+    assert await scanner.get_report(user) is None
+    started = await scanner.start_scan(user)
+    await scanner._tasks[user.id]
+    report = await scanner.get_report(user)
+    await scanner.cache.delete(scanner._key(user.id))
+
+    assert started.status == DuplicateScanStatus.RUNNING
+    assert report.status == DuplicateScanStatus.DONE
+    assert report.contacts_scanned == 2
+    assert [group.contact_ids for group in report.groups] == [[1, 2]]
@@ -1,7 +1,11 @@
+import time
 from unittest.mock import Mock, AsyncMock
 import pytest
-from sqlalchemy import select
+from passlib import hash as passlib_hash
+from sqlalchemy import select, update
 from src.database.models import User
+from src.conf.config import settings
+from src.services.auth import Hash, create_access_token, token_verifier
 from tests.conftest import TestingSessionLocal
 
 user_data = {
@@ -103,6 +107,149 @@ async def test_login(client):
     assert "token_type" in data
 
 
+def login(client) -> dict:
+    response = client.post(
+        "api/auth/login",
+        data={
+            "username": user_data.get("username"),
+            "password": user_data.get("password"),
+        },
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def refresh(client, refresh_token: str):
+    return client.post("api/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_refresh_rotates_and_detects_reuse(client):
+    first, second = login(client), login(client)
+
+    rotated = refresh(client, first["refresh_token"])
+    reused = refresh(client, first["refresh_token"])
+    after_reuse = refresh(client, rotated.json()["refresh_token"])
+    other_session = refresh(client, second["refresh_token"])
+
+    assert rotated.status_code == 200, rotated.text
+    assert rotated.json()["refresh_token"] != first["refresh_token"]
+    assert "access_token" in rotated.json()
+    assert reused.status_code == 401, reused.text
+    assert after_reuse.status_code == 401, after_reuse.text
+    assert other_session.status_code == 200, other_session.text
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_only_own_refresh_token(client, get_token):
+    tokens = login(client)
+
+    foreign = client.post(
+        "api/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    rotated = refresh(client, tokens["refresh_token"])
+    own = client.post(
+        "api/auth/logout",
+        json={"refresh_token": rotated.json()["refresh_token"]},
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    after_logout = refresh(client, rotated.json()["refresh_token"])
+    revoked_access = client.post(
+        "api/auth/logout",
+        json={"refresh_token": rotated.json()["refresh_token"]},
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+
+    assert foreign.status_code == 200, foreign.text
+    assert rotated.status_code == 200, rotated.text
+    assert own.status_code == 200, own.text
+    assert after_logout.status_code == 401, after_logout.text
+    assert revoked_access.status_code == 401, revoked_access.text
+
+
+def test_reset_password_link_has_own_lifetime(client, monkeypatch):
+    sent = Mock()
+    monkeypatch.setattr("src.api.auth.send_reset_password_email", sent)
+    monkeypatch.setattr(settings, "JWT_EXPIRATION_SECONDS", 60)
+
+    response = client.post(
+        "api/auth/reset_password",
+        json={"email": user_data["email"], "password": user_data["password"]},
+    )
+
+    assert response.status_code == 200, response.text
+    claims = token_verifier.decode(sent.call_args.kwargs["reset_token"])
+    lifetime = claims["exp"] - time.time()
+    assert settings.RESET_TOKEN_EXPIRATION_SECONDS - 60 < lifetime
+    assert lifetime <= settings.RESET_TOKEN_EXPIRATION_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_reset_password_revokes_refresh_tokens(client):
+    tokens = login(client)
+    reset_token = await create_access_token(
+        data={
+            "sub": user_data["email"],
+            "password": Hash().get_password_hash(user_data["password"]),
+        }
+    )
+
+    reset = client.get(f"api/auth/confirm_reset_password/{reset_token}")
+    after_reset = refresh(client, tokens["refresh_token"])
+
+    assert reset.status_code == 200, reset.text
+    assert after_reset.status_code == 401, after_reset.text
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_login_does_not_rehash(client):
+    outdated = passlib_hash.bcrypt.using(rounds=4).hash(user_data["password"])
+    by_username = User.username == user_data["username"]
+    async with TestingSessionLocal() as session:
+        await session.execute(
+            update(User)
+            .where(by_username)
+            .values(hashed_password=outdated, confirmed=False)
+        )
+        await session.commit()
+
+    response = client.post(
+        "api/auth/login",
+        data={"username": user_data["username"], "password": user_data["password"]},
+    )
+
+    async with TestingSessionLocal() as session:
+        stored = await session.scalar(select(User.hashed_password).where(by_username))
+        await session.execute(update(User).where(by_username).values(confirmed=True))
+        await session.commit()
+    assert response.status_code == 401, response.text
+    assert stored == outdated
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password_hash(client):
+    outdated = passlib_hash.bcrypt.using(rounds=4).hash(user_data["password"])
+    async with TestingSessionLocal() as session:
+        await session.execute(
+            update(User)
+            .where(User.username == user_data["username"])
+            .values(hashed_password=outdated)
+        )
+        await session.commit()
+
+    login(client)
+
+    async with TestingSessionLocal() as session:
+        stored = await session.scalar(
+            select(User.hashed_password).where(User.username == user_data["username"])
+        )
+    assert stored != outdated
+    assert Hash().verify_password(user_data["password"], stored)
+    assert not Hash().needs_update(stored)
+    login(client)
+
+
 def test_wrong_password_login(client):
     response = client.post(
         "api/auth/login",
@@ -263,4 +410,4 @@ async def test_confirm_reset_password_user_not_found(client, monkeypatch):
 
     mock_get_email_from_token.assert_called_once_with("token")
     mock_get_password_from_token.assert_called_once_with("token")
-    mock_user_service.get_user_by_email.assert_called_once_with("test_user@gmail.com") 
\ No newline at end of file
+    mock_user_service.get_user_by_email.assert_called_once_with("test_user@gmail.com")
\ No newline at end of file
@@ -0,0 +1,43 @@
+import pytest
+
+from src.api import metrics
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    monkeypatch.setattr(metrics.settings, "METRICS_TOKEN", "scrape-secret")
+    return "scrape-secret"
+
+
+def test_metrics_route_template(client, metrics_token):
+    client.get("/api/contacts/12345")
+    client.get("/api/no-such-route")
+
+    response = client.get(
+        "/metrics", headers={"Authorization": f"Bearer {metrics_token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/api/contacts/{contact_id}"' in response.text
+    assert 'route="unmatched"' in response.text
+    assert "/api/contacts/12345" not in response.text
+    assert "http_requests_in_progress" in response.text
+    assert 'cache_requests_total{cache="jwt",result="hit"}' in response.text
+    assert "password_hash_queue_depth" in response.text
+
+
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong"}])
+def test_metrics_requires_token(client, metrics_token, headers):
+    response = client.get("/metrics", headers=headers)
+
+    assert response.status_code == 401
+    assert "http_requests_in_progress" not in response.text
+
+
+def test_metrics_disabled_without_token(client, monkeypatch):
+    monkeypatch.setattr(metrics.settings, "METRICS_TOKEN", "")
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer "})
+
+    assert response.status_code == 404
@@ -104,7 +104,7 @@ async def test_get_contacts_no_filters(client, monkeypatch, auth_headers):
     assert response.status_code == 200
     assert len(response.json()) == len(contacts)
     assert response.json()[0]["email"] == contacts[0]["email"]
-    mock_get_contacts.assert_called_once_with("", "", "", 0, 100, user_data)
+    mock_get_contacts.assert_called_once_with("", "", "", "", 0, 100, user_data)
 
 
 @pytest.mark.asyncio
@@ -125,7 +125,7 @@ async def test_get_contacts_with_filters(client, monkeypatch, auth_headers):
     assert response.status_code == 200
     assert len(response.json()) == len(filtered_contacts)
     assert response.json()[0]["name"] == "Evan"
-    mock_get_contacts.assert_called_once_with("Evan", "Jedi", "", 0, 100, user_data)
+    mock_get_contacts.assert_called_once_with("Evan", "Jedi", "", "", 0, 100, user_data)
 
 
 @pytest.mark.asyncio
@@ -157,7 +157,7 @@ async def test_get_contacts_pagination(client, monkeypatch, auth_headers):
     assert response.status_code == 200
     assert len(response.json()) == len(paginated_contacts)
     assert response.json()[0]["id"] == 3
-    mock_get_contacts.assert_called_once_with("", "", "", 2, 1, user_data)
+    mock_get_contacts.assert_called_once_with("", "", "", "", 2, 1, user_data)
 
 
 @pytest.mark.asyncio
@@ -457,4 +457,4 @@ async def test_delete_contact_unauthenticated(client, monkeypatch):
     response = client.delete(f"/api/contacts/{contact_id}")
 
     assert response.status_code == 401
-    assert response.json()["detail"] == "Не автентифіковано"    
\ No newline at end of file
+    assert response.json()["detail"] == "Не автентифіковано"
@@ -0,0 +1,79 @@
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.services import openapi
+from src.services.openapi import dump_openapi_schema, load_openapi_schema
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    return app
+
+
+def test_prebuilt_schema_is_served_without_generation(tmp_path, monkeypatch):
+    path = tmp_path / "openapi.json"
+    dump_openapi_schema(make_app(), str(path))
+    app = make_app()
+
+    def fail():
+        raise AssertionError("schema must not be generated")
+
+    monkeypatch.setattr("fastapi.applications.get_openapi", fail)
+    loaded = load_openapi_schema(app, str(path))
+    response = TestClient(app).get("/openapi.json")
+
+    assert loaded is True
+    assert response.status_code == 200
+    assert "/items/{item_id}" in response.json()["paths"]
+    assert openapi.FINGERPRINT_KEY not in response.json()
+
+
+def test_stale_or_missing_schema_is_ignored(tmp_path):
+    path = tmp_path / "openapi.json"
+    dump_openapi_schema(make_app(), str(path))
+    app = make_app()
+
+    @app.get("/new")
+    async def new():
+        return {}
+
+    assert load_openapi_schema(app, str(path)) is False
+    assert load_openapi_schema(app, str(tmp_path / "missing.json")) is False
+    assert load_openapi_schema(app, "") is False
+    assert app.openapi_schema is None
+    assert "/new" in app.openapi()["paths"]
+
+
+def test_schema_is_stale_after_source_change(tmp_path, monkeypatch):
+    # Та сама множина шляхів, але змінено модель у коді проєкту
+    source = tmp_path / "src" / "schemas.py"
+    source.parent.mkdir()
+    source.write_text("class Item: name: str\n")
+    monkeypatch.setattr(openapi, "PROJECT_ROOT", tmp_path)
+    path = tmp_path / "openapi.json"
+    dump_openapi_schema(make_app(), str(path))
+
+    assert load_openapi_schema(make_app(), str(path)) is True
+    source.write_text("class Item: name: str; price: float\n")
+    assert load_openapi_schema(make_app(), str(path)) is False
+
+
+def test_heavy_clients_are_not_imported_at_startup():
+    # Окремий процес: інші тести могли вже імпортувати ці модулі
+    code = (
+        "import sys, main; "
+        "print('fastapi_mail' in sys.modules, 'cloudinary' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.split() == ["False", "False"]
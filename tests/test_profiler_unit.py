@@ -0,0 +1,87 @@
+import threading
+import time
+from src.conf.config import settings
+from src.middleware.profiling import ProfilingMiddleware
+from src.services.profiler import (
+    ContinuousProfiler,
+    ProfileBudget,
+    SamplingProfiler,
+)
+
+
+def busy_function(duration: float):
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        pass
+
+
+def test_sampling_profiler_records_target_thread():
+    profiler = SamplingProfiler(0.001, thread_id=threading.get_ident())
+
+    profiler.start()
+    busy_function(0.1)
+    profiler.stop()
+
+    assert profiler.samples > 0
+    assert "busy_function" in profiler.folded()
+    stack, count = profiler.folded().splitlines()[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert ";" in stack
+
+
+def test_sampling_profiler_respects_max_duration():
+    profiler = SamplingProfiler(0.001, max_duration=0.02)
+
+    profiler.start()
+    time.sleep(0.1)
+    samples = profiler.samples
+    time.sleep(0.05)
+    profiler.stop()
+
+    assert profiler.samples == samples
+
+
+def test_profile_budget():
+    budget = ProfileBudget(max_per_minute=2, max_concurrent=1)
+
+    assert budget.acquire()
+    assert not budget.acquire()
+    budget.release()
+    assert budget.acquire()
+    budget.release()
+    assert not budget.acquire()
+
+
+def test_continuous_profiler_writes_files(tmp_path):
+    profiler = ContinuousProfiler(0.001, str(tmp_path), flush_interval=0.02)
+
+    profiler.start()
+    busy_function(0.1)
+    profiler.stop()
+
+    files = list(tmp_path.glob("continuous-*.folded"))
+    assert files
+    assert "MainThread" in files[0].read_text()
+
+
+def test_profile_flag_is_ignored_for_non_admins(client):
+    response = client.get(
+        "/api/healthchecker?profile=1", headers={"Origin": "http://example.com"}
+    )
+
+    assert response.status_code != 401
+    assert "x-profile" not in response.headers
+    assert "access-control-allow-origin" in response.headers
+
+
+def test_profile_is_saved_for_admins(client, monkeypatch, tmp_path):
+    async def authorize(request):
+        return True
+
+    monkeypatch.setattr(ProfilingMiddleware, "_authorize", staticmethod(authorize))
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+
+    response = client.get("/api/healthchecker", headers={"X-Profile": "1"})
+
+    assert response.headers["x-profile"] == "1"
+    assert (tmp_path / f"{response.headers['x-profile-id']}.folded").exists()
@@ -0,0 +1,143 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import func, select, update
+
+from src.database.models import Contact, User, UserRole
+from src.repository.contacts import ContactRepository
+from src.repository.users import UserConflictError, UserRepository
+from src.schemas import ContactModel, UserCreate
+from src.services.purger import PURGE_LOCK_KEY, SoftDeletePurger
+
+OLD = datetime.utcnow() - timedelta(days=30)
+RECENT = datetime.utcnow()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "seeded_contacts",
+    [
+        {
+            1: [
+                1,
+                2,
+                3,
+                (4, {"deleted_at": OLD}),
+                (5, {"deleted_at": OLD}),
+                (6, {"deleted_at": RECENT}),
+            ],
+            2: range(7, 12),
+            3: [12, 13],
+        }
+    ],
+    indirect=True,
+)
+async def test_purge_once_deletes_expired_rows_in_batches(
+    db, seeded_contacts, session_factory
+):
+    # Користувач 2 видалений давно, 3 — щойно
+    await db.execute(update(User).where(User.id == 2).values(deleted_at=OLD))
+    await db.execute(update(User).where(User.id == 3).values(deleted_at=RECENT))
+    await db.commit()
+
+    purger = SoftDeletePurger(
+        interval=60,
+        retention=3600,
+        batch_size=2,
+        pause=0,
+        session_factory=session_factory,
+    )
+    deleted = await purger.purge_once()
+
+    assert deleted == 7
+    async with session_factory() as session:
+        users = (
+            (await session.execute(select(User.id).order_by(User.id))).scalars().all()
+        )
+        remaining = (
+            await session.execute(
+                select(Contact.user_id, func.count())
+                .group_by(Contact.user_id)
+                .order_by(Contact.user_id)
+            )
+        ).all()
+    assert users == [1, 3]
+    assert remaining == [(1, 4), (3, 2)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("acquired", [True, False])
+async def test_purge_once_runs_only_in_lock_holder(acquired):
+    db = MagicMock()
+    db.bind = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+    db.execute = AsyncMock(return_value=MagicMock(scalar=lambda: acquired))
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+
+    purger = SoftDeletePurger(
+        interval=60,
+        retention=3600,
+        batch_size=2,
+        pause=0,
+        session_factory=session_factory,
+    )
+    purger._purge = AsyncMock(return_value=3)
+
+    deleted = await purger.purge_once()
+
+    assert deleted == (3 if acquired else 0)
+    assert purger._purge.await_count == (1 if acquired else 0)
+    statement, params = db.execute.await_args.args
+    assert "pg_try_advisory_xact_lock" in str(statement)
+    assert params == {"key": PURGE_LOCK_KEY}
+
+
+@pytest.mark.asyncio
+async def test_soft_deleted_contact_frees_unique_email(session_factory):
+    body = ContactModel(
+        name="Evan",
+        surname="Jedi",
+        email="evan@example.com",
+        phone="111-222-3333",
+        birthday="2002-02-02",
+    )
+    async with session_factory() as db:
+        user = User(id=1, username="owner", email="owner@example.com")
+        db.add(user)
+        await db.flush()
+        repository = ContactRepository(db)
+
+        contact = await repository.create_contact(body, user)
+        removed = await repository.remove_contact(contact.id, user)
+        recreated = await repository.create_contact(body, user)
+
+        assert removed.deleted_at is not None
+        assert await repository.get_contact_by_id(contact.id, user) is None
+        assert recreated.id != contact.id
+        assert await repository.is_contact_exists(body.email, body.phone, user)
+
+
+@pytest.mark.asyncio
+async def test_soft_deleted_user_frees_email_and_username(session_factory):
+    body = UserCreate(
+        username="owner",
+        email="owner@example.com",
+        password="secret",
+        role=UserRole.USER,
+    )
+    async with session_factory() as db:
+        repository = UserRepository(db)
+        user = await repository.create_user(body)
+        await repository.soft_delete_user(user.id)
+
+        recreated = await repository.create_user(body)
+        with pytest.raises(UserConflictError):
+            await repository.create_user(body)
+
+        assert recreated.id != user.id
+        assert (await repository.get_user_by_email(body.email)).id == recreated.id
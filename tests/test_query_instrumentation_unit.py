@@ -0,0 +1,92 @@
+import logging
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.database import instrumentation
+from src.database.instrumentation import (
+    fingerprint,
+    instrument_engine,
+    query_log,
+    track_queries,
+)
+from src.middleware import queries as queries_middleware
+from src.middleware.queries import QueryStatsMiddleware
+
+
+@pytest.fixture
+def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+    query_log.clear()
+    return engine
+
+
+def test_fingerprint_ignores_values():
+    statement = "SELECT * FROM users WHERE email = :email"
+
+    assert fingerprint(statement, {"email": "a@b.com"}) == fingerprint(
+        statement, {"email": "c@d.com"}
+    )
+    assert fingerprint(statement, {"email": "a"}) != fingerprint(
+        statement, {"username": "a"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_track_queries_counts_per_request(engine):
+    with track_queries("/test") as queries:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+
+    assert queries.count == 2
+    assert len(queries.fingerprints) == 2
+    assert query_log.top()[0]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_track_queries_flags_n_plus_one(engine, monkeypatch, caplog):
+    monkeypatch.setattr(instrumentation.settings, "N_PLUS_ONE_THRESHOLD", 3)
+
+    with caplog.at_level(logging.WARNING, logger="sql"):
+        with track_queries("/contacts"):
+            async with engine.connect() as conn:
+                for i in range(3):
+                    await conn.execute(text("SELECT :id"), {"id": i})
+
+    assert "Possible N+1 on /contacts" in caplog.text
+    assert query_log.n_plus_one[-1]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_slow_query_logged_without_values(engine, monkeypatch, caplog):
+    monkeypatch.setattr(instrumentation.settings, "SLOW_QUERY_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger="sql"):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT :secret"), {"secret": "p4ssw0rd"})
+
+    assert "Slow query" in caplog.text
+    assert "p4ssw0rd" not in caplog.text
+    assert query_log.slow[-1]["parameters"] == ["str"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("env, exposed", [("development", True), ("production", False)])
+async def test_debug_headers_only_in_development(monkeypatch, env, exposed):
+    monkeypatch.setattr(queries_middleware.settings, "ENV", env)
+    app = QueryStatsMiddleware(
+        Starlette(routes=[Route("/", lambda request: PlainTextResponse("ok"))])
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get("/")
+
+    assert ("X-DB-Queries" in response.headers) is exposed
+    assert ("X-DB-Time" in response.headers) is exposed
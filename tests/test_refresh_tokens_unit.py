@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from src.database.models import RefreshToken
+from src.services.refresh_tokens import RefreshTokenService
+
+
+async def active_families(db) -> list:
+    stmt = (
+        select(RefreshToken.family_id)
+        .where(RefreshToken.revoked_at.is_(None))
+        .order_by(RefreshToken.id)
+    )
+    return (await db.execute(stmt)).scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_rotate_issues_new_token_in_same_family(db):
+    service = RefreshTokenService(db)
+    token = await service.issue(1)
+
+    user_id, rotated = await service.rotate(token)
+
+    families = (await db.execute(select(RefreshToken.family_id))).scalars().all()
+    assert user_id == 1
+    assert rotated != token
+    assert len(set(families)) == 1
+    assert await service.rotate(rotated) is not None
+
+
+@pytest.mark.asyncio
+async def test_reused_token_revokes_only_its_family(db):
+    service = RefreshTokenService(db)
+    stolen = await service.issue(1)
+    other_session = await service.issue(1)
+    _, rotated = await service.rotate(stolen)
+    other_family = await active_families(db)
+
+    assert await service.rotate(stolen) is None
+    assert await service.rotate(rotated) is None
+    assert await service.rotate("unknown") is None
+    assert await active_families(db) == other_family[:1]
+    assert await service.rotate(other_session) is not None
+
+
+async def expire(db, token: str) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.token_hash == RefreshTokenService._hash(token))
+        .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+    )
+
+
+@pytest.mark.asyncio
+async def test_expired_tokens_are_rejected_without_revoking_family(db):
+    service = RefreshTokenService(db)
+    expired = await service.issue(1)
+    rotated_away = await service.issue(1)
+    _, current = await service.rotate(rotated_away)
+    await expire(db, expired)
+    await expire(db, rotated_away)
+
+    assert await service.rotate(expired) is None
+    # Прострочений відкликаний токен не вважається повторним використанням
+    assert await service.rotate(rotated_away) is None
+    assert await service.rotate(current) is not None
+
+
+@pytest.mark.asyncio
+async def test_revoke_ignores_token_of_other_user(db):
+    service = RefreshTokenService(db)
+    token = await service.issue(1)
+
+    await service.revoke(token, user_id=2)
+    _, rotated = await service.rotate(token)
+    await service.revoke(rotated, user_id=1)
+
+    assert await service.rotate(rotated) is None
@@ -0,0 +1,124 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.models import User
+from src.repository.singleflight import SingleFlight
+from src.repository.users import UserRepository
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_coalesced():
+    flights = SingleFlight()
+    calls = 0
+
+    async def query():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flights.do("key", query) for _ in range(5)))
+
+    assert calls == 1
+    assert [result for result, _ in results] == ["result"] * 5
+    assert [shared for _, shared in results].count(True) == 4
+    assert flights.calls == 5
+    assert flights.coalesced == 4
+    assert flights.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_are_not_coalesced():
+    flights = SingleFlight()
+    query = AsyncMock(return_value="result")
+
+    await asyncio.gather(flights.do("a", query), flights.do("b", query))
+
+    assert query.await_count == 2
+    assert flights.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared():
+    flights = SingleFlight()
+
+    async def query():
+        await asyncio.sleep(0.01)
+        raise ValueError("db error")
+
+    results = await asyncio.gather(
+        flights.do("key", query), flights.do("key", query), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_follower_runs_query_when_leader_cancelled():
+    flights = SingleFlight()
+    started = asyncio.Event()
+
+    async def slow_query():
+        started.set()
+        await asyncio.sleep(1)
+
+    leader = asyncio.create_task(flights.do("key", slow_query))
+    await started.wait()
+    follower = asyncio.create_task(flights.do("key", AsyncMock(return_value="own")))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == ("own", False)
+
+
+@pytest.mark.asyncio
+async def test_user_repository_follower_gets_own_copy(monkeypatch):
+    monkeypatch.setattr(UserRepository, "flights", SingleFlight())
+    user = User(id=1, username="testuser", email="test@example.com", role="user")
+
+    async def execute(stmt):
+        await asyncio.sleep(0.01)
+        return MagicMock(scalar_one_or_none=MagicMock(return_value=user))
+
+    leader_session = AsyncMock(spec=AsyncSession)
+    leader_session.execute = execute
+    follower_session = AsyncMock(spec=AsyncSession)
+    follower_session.merge = AsyncMock(side_effect=lambda obj, load: obj)
+
+    leader_user, follower_user = await asyncio.gather(
+        UserRepository(leader_session).get_user_for_auth("testuser"),
+        UserRepository(follower_session).get_user_for_auth("testuser"),
+    )
+
+    assert leader_user is user
+    assert follower_user is not user
+    assert follower_user.username == "testuser"
+    follower_session.execute.assert_not_called()
+    follower_session.merge.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_user_repository_write_path_loaders_are_not_shared(monkeypatch):
+    monkeypatch.setattr(UserRepository, "flights", SingleFlight())
+    user = User(id=1, username="testuser", email="test@example.com", role="user")
+
+    async def execute(stmt):
+        await asyncio.sleep(0.01)
+        return MagicMock(scalar_one_or_none=MagicMock(return_value=user))
+
+    sessions = [AsyncMock(spec=AsyncSession) for _ in range(2)]
+    for session in sessions:
+        session.execute = AsyncMock(side_effect=execute)
+
+    await asyncio.gather(
+        *(UserRepository(session).get_user_by_id(1) for session in sessions),
+        *(
+            UserRepository(session).get_user_by_email(user.email)
+            for session in sessions
+        ),
+    )
+
+    assert [session.execute.await_count for session in sessions] == [2, 2]
+    assert UserRepository.flights.calls == 0
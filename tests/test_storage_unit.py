@@ -0,0 +1,61 @@
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api import users
+from src.conf.config import settings
+from src.services.storage import LocalStorage, get_storage
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(settings, "STORAGE_LOCAL_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "STORAGE_PUBLIC_URL", "")
+    get_storage.cache_clear()
+    yield get_storage("local")
+    get_storage.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_local_storage_saves_and_resolves_files(local_storage, tmp_path):
+    first = await local_storage.save("1.webp", b"first", "image/webp")
+    second = await local_storage.save("1.webp", b"second", "image/webp")
+
+    assert isinstance(local_storage, LocalStorage)
+    assert first.startswith("/api/users/avatars/1.webp?v=")
+    assert first != second
+    assert local_storage.path("1.webp").read_bytes() == b"second"
+    assert local_storage.path("2.webp") is None
+    assert local_storage.path("../1.webp") is None
+    assert [p.name for p in tmp_path.iterdir()] == ["1.webp"]
+    with pytest.raises(ValueError):
+        await local_storage.save("../escape.webp", b"x", "image/webp")
+
+
+def test_avatar_is_served_from_local_storage(local_storage):
+    app = FastAPI()
+    app.include_router(users.router, prefix="/api")
+    (local_storage.directory / "7.webp").write_bytes(b"RIFF....WEBP")
+    client = TestClient(app)
+
+    found = client.get("/api/users/avatars/7.webp")
+    missing = client.get("/api/users/avatars/8.webp")
+
+    assert found.status_code == 200
+    assert found.content == b"RIFF....WEBP"
+    assert found.headers["content-type"] == "image/webp"
+    assert missing.status_code == 404
+
+
+def test_get_storage_validates_backend(monkeypatch):
+    monkeypatch.setitem(sys.modules, "boto3", None)
+    get_storage.cache_clear()
+
+    with pytest.raises(ValueError):
+        get_storage("ftp")
+    with pytest.raises(RuntimeError):
+        get_storage("s3")
+    get_storage.cache_clear()
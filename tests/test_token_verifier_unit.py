@@ -0,0 +1,68 @@
+import time
+from unittest.mock import MagicMock
+import pytest
+from src.services.tokens import InvalidTokenError, JoseBackend, TokenVerifier
+
+
+@pytest.fixture
+def verifier():
+    return TokenVerifier(JoseBackend(), "secret", "HS256", max_size=2)
+
+
+def test_decode_valid_token(verifier):
+    token = verifier.encode({"sub": "testuser", "exp": time.time() + 60})
+
+    claims = verifier.decode(token)
+
+    assert claims["sub"] == "testuser"
+    assert verifier.misses == 1
+
+
+def test_decode_uses_cache(verifier):
+    token = verifier.encode({"sub": "testuser", "exp": time.time() + 60})
+    verifier.decode(token)
+    verifier.backend = MagicMock()
+
+    claims = verifier.decode(token)
+
+    assert claims["sub"] == "testuser"
+    assert verifier.hits == 1
+    verifier.backend.decode.assert_not_called()
+
+
+def test_decode_cache_honors_exp(verifier):
+    token = verifier.encode({"sub": "testuser", "exp": time.time() + 60})
+    verifier.decode(token)
+    key = next(iter(verifier._cache))
+    claims, _ = verifier._cache[key]
+    verifier._cache[key] = (claims, time.time() - 1)
+    verifier.backend = MagicMock()
+    verifier.backend.decode.side_effect = InvalidTokenError("Signature has expired")
+
+    with pytest.raises(InvalidTokenError):
+        verifier.decode(token)
+    verifier.backend.decode.assert_called_once()
+    assert len(verifier._cache) == 0
+
+
+def test_decode_cache_is_bounded(verifier):
+    tokens = [
+        verifier.encode({"sub": f"user{i}", "exp": time.time() + 60}) for i in range(3)
+    ]
+    for token in tokens:
+        verifier.decode(token)
+
+    assert len(verifier._cache) == 2
+
+
+def test_decode_invalid_token(verifier):
+    with pytest.raises(InvalidTokenError):
+        verifier.decode("invalid.token.value")
+
+
+def test_decode_without_exp_is_not_cached(verifier):
+    token = verifier.encode({"sub": "testuser"})
+
+    verifier.decode(token)
+
+    assert len(verifier._cache) == 0
@@ -1,8 +1,9 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.models import User
-from src.repository.users import UserRepository
+from src.repository.users import UserConflictError, UserRepository
 from src.schemas import UserCreate
 
 
@@ -80,7 +81,8 @@ async def test_get_user_by_email(user_repository, mock_session, user):
 @pytest.mark.asyncio
 async def test_create_user(user_repository, mock_session, user, user_body):
     mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = user
+    mock_result.scalar_one.return_value = user
+    mock_session.execute = AsyncMock(return_value=mock_result)
 
     result = await user_repository.create_user(
         user_body,
@@ -92,22 +94,33 @@ async def test_create_user(user_repository, mock_session, user, user_body):
     assert result.avatar == user.avatar
     assert result.role == user.role
 
-    mock_session.add.assert_called_once()
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(result)
+    mock_session.execute.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
+    mock_session.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_confirmed_email(user_repository, mock_session, user):
-    mock_session.execute = AsyncMock(
-        return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=user))
+async def test_create_user_conflict(user_repository, mock_session, user_body):
+    error = IntegrityError(
+        "INSERT", {}, Exception("UNIQUE constraint failed: users.email")
     )
-    user.confirmed = False
+    mock_session.execute = AsyncMock(side_effect=error)
 
+    with pytest.raises(UserConflictError) as exc_info:
+        await user_repository.create_user(user_body)
+
+    assert exc_info.value.field == "email"
+    mock_session.begin_nested.assert_called_once()
+    mock_session.rollback.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_confirmed_email(user_repository, mock_session, user):
     await user_repository.confirmed_email(user.email)
 
-    assert user.confirmed is True
-    mock_session.commit.assert_awaited_once()
+    stmt = mock_session.execute.await_args.args[0]
+    assert stmt.compile().params["confirmed"] is True
+    mock_session.commit.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -119,9 +132,11 @@ async def test_update_avatar_url(user_repository, mock_session, user):
 
     result = await user_repository.update_avatar_url(user.email, new_avatar_url)
 
-    assert result.avatar == new_avatar_url
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(result)
+    stmt = mock_session.execute.await_args.args[0]
+    assert stmt.compile().params["avatar"] == new_avatar_url
+    assert result is user
+    mock_session.commit.assert_not_awaited()
+    mock_session.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -133,9 +148,12 @@ async def test_reset_password(user_repository, mock_session, user):
 
     result = await user_repository.reset_password(user.id, new_password)
 
-    assert result.hashed_password == new_password
-    mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(result)
+    stmt = mock_session.execute.await_args.args[0]
+    assert stmt.compile().params["hashed_password"] == new_password
+    assert "token_version" in str(stmt)
+    assert result is user
+    mock_session.commit.assert_not_awaited()
+    mock_session.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -147,4 +165,4 @@ async def test_reset_password_user_not_found(user_repository, mock_session):
     result = await user_repository.reset_password(777, "new_password")
 
     assert result is None
-    mock_session.commit.assert_not_awaited() 
\ No newline at end of file
+    mock_session.commit.assert_not_awaited()
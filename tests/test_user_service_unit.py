@@ -0,0 +1,61 @@
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from src.database import db as database
+from src.services.token_versions import token_versions
+from src.services.users import UserService
+
+
+async def cached_version(user_id: int):
+    return await token_versions.cache.get(token_versions._key(user_id))
+
+
+@pytest.fixture
+def request_db(db, monkeypatch):
+    """
+    Генератор `get_db`, що працює з сесією тестової бази в пам'яті.
+    """
+
+    @contextlib.asynccontextmanager
+    async def session():
+        yield db
+
+    monkeypatch.setattr(database, "sessionmanager", SimpleNamespace(session=session))
+    return database.get_db()
+
+
+@pytest.mark.asyncio
+async def test_token_version_cache_is_invalidated_after_commit(request_db):
+    session = await request_db.__anext__()
+    await token_versions.set(1, 0)
+    service = UserService(session)
+
+    await service.reset_password(1, "hash")
+    before_commit = await cached_version(1)
+    with pytest.raises(StopAsyncIteration):
+        await request_db.__anext__()
+
+    assert before_commit == 0
+    assert await cached_version(1) is None
+    assert await token_versions.get(1, service.get_token_version) == 1
+
+
+@pytest.mark.asyncio
+async def test_token_version_cache_is_kept_on_rollback(request_db):
+    session = await request_db.__anext__()
+    await session.commit()
+    await token_versions.set(1, 0)
+    await token_versions.set(2, 0)
+    service = UserService(session)
+
+    await service.reset_password(1, "hash")
+    assert await service.delete_user(2) is True
+    with pytest.raises(HTTPException):
+        await request_db.athrow(HTTPException(status_code=400))
+
+    assert await cached_version(1) == 0
+    assert await cached_version(2) == 0
+    assert session.info == {}